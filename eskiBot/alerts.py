@@ -0,0 +1,261 @@
+"""
+Kullanıcı alarm kuralları - alert_rules tablosunun eşik indeksleri
+
+Kurallar (alan, yön) başına eşiğe göre sıralı dizilerde tutulur. Her snapshot'ta bir paritenin önceki
+ve şimdiki değeri arasında kalan eşikler iki ikili aramayla bulunur; kurallar tek tek taranmaz.
+Kural koşulu sağlanmaya başladığı anda (eşik geçildiğinde) bir kez tetiklenir.
+"""
+
+import numpy as np
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from config import Config
+from database import get_db_session, AlertRule, User
+from momentum import MOMENTUM_WINDOWS
+
+TICKER_FIELDS = {
+    'price': 'last',
+    'percentage': 'change_percentage',
+    'volume': 'quote_volume',
+}
+FIELDS = tuple(TICKER_FIELDS) + tuple(f"momentum_{name}" for name in MOMENTUM_WINDOWS)
+OPERATORS = ('>=', '<=')
+
+@dataclass(slots=True)
+class RuleEntry:
+    """Bellekteki alarm kuralı"""
+    id: int
+    username: str
+    symbol: Optional[str]  # None ise tüm coinler
+    field: str
+    operator: str
+    threshold: float
+    channel: Optional[str]  # Telegram chat ID
+
+class ThresholdIndex:
+    """Tek (alan, yön) için eşiğe göre sıralı kural dizisi"""
+    __slots__ = ('thresholds', 'rule_ids', '_threshold_list')
+
+    def __init__(self, rules: List[RuleEntry]):
+        thresholds = np.array([rule.threshold for rule in rules], dtype=np.float64)
+        order = np.argsort(thresholds, kind='stable')
+        self.thresholds = thresholds[order]
+        self.rule_ids = np.array([rule.id for rule in rules], dtype=np.int64)[order]
+        self._threshold_list = self.thresholds.tolist()  # Tek değerli aramalarda bisect numpy'dan hızlı
+
+    def crossed(self, operator: str, previous: np.ndarray, current: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Önceki ve şimdiki değer arasında kalan eşiklerin [başlangıç, bitiş) aralıkları - tüm pariteler için"""
+        if operator == '>=':
+            # previous < eşik <= current
+            return (self.thresholds.searchsorted(previous, side='right'),
+                    self.thresholds.searchsorted(current, side='right'))
+        # current <= eşik < previous
+        return (self.thresholds.searchsorted(current, side='left'),
+                self.thresholds.searchsorted(previous, side='left'))
+
+    def crossed_one(self, operator: str, previous: float, current: float) -> Tuple[int, int]:
+        """crossed() ile aynı, tek parite için"""
+        if operator == '>=':
+            return bisect_right(self._threshold_list, previous), bisect_right(self._threshold_list, current)
+        return bisect_left(self._threshold_list, current), bisect_left(self._threshold_list, previous)
+
+class AlertEngine:
+    def __init__(self):
+        self.rules: Dict[int, RuleEntry] = {}
+        self._global: Dict[Tuple[str, str], ThresholdIndex] = {}  # (alan, yön) -> tüm coinler için kurallar
+        self._by_pair: Dict[Tuple[str, str], Dict[str, ThresholdIndex]] = {}  # (alan, yön) -> parite -> kurallar
+        self._previous: Dict[str, Dict[str, float]] = {}  # alan -> parite -> son değer
+        self._fired_at: Dict[Tuple[int, str], float] = {}  # (kural, parite) -> monotonic tetiklenme zamanı
+        self._last_sync = None  # Monotonic saniye
+
+    def sync(self, now: float, force: bool = False):
+        """Aktif kuralları tablodan okuyup indeksleri yeniden kurar"""
+        if not force and self._last_sync is not None and now - self._last_sync < Config.ALERT_SYNC_INTERVAL:
+            return
+        self._last_sync = now
+
+        db = get_db_session()
+        try:
+            rows = (db.query(AlertRule.id, User.username, AlertRule.symbol, AlertRule.field, AlertRule.operator,
+                             AlertRule.threshold, AlertRule.channel)
+                    .join(User, User.id == AlertRule.user_id)
+                    .filter(AlertRule.is_active == True).all())
+        except Exception as e:
+            print(f"❌ Alarm kuralları okuma hatası: {e}")
+            return
+        finally:
+            db.close()
+
+        rules = [RuleEntry(row.id, row.username, row.symbol.upper() if row.symbol else None, row.field, row.operator,
+                           row.threshold, row.channel)
+                 for row in rows if row.field in FIELDS and row.operator in OPERATORS]
+        if len(rules) != len(self.rules) or any(rule.id not in self.rules for rule in rules):
+            print(f"🔔 Alarm kuralları: {len(rules)} aktif kural")
+        self.load(rules)
+
+    def load(self, rules: List[RuleEntry]):
+        """Kural listesinden indeksleri kurar"""
+        grouped: Dict[Tuple[str, str], Dict[Optional[str], List[RuleEntry]]] = {}
+        for rule in rules:
+            pair = f"{rule.symbol}_USDT" if rule.symbol else None
+            grouped.setdefault((rule.field, rule.operator), {}).setdefault(pair, []).append(rule)
+
+        self.rules = {rule.id: rule for rule in rules}
+        self._global = {key: ThresholdIndex(pairs.pop(None)) for key, pairs in grouped.items() if None in pairs}
+        self._by_pair = {key: {pair: ThresholdIndex(pair_rules) for pair, pair_rules in pairs.items()}
+                         for key, pairs in grouped.items() if pairs}
+        self._fired_at = {key: fired for key, fired in self._fired_at.items() if key[0] in self.rules}
+
+    def evaluate(self, tickers: List[Dict], now: float, momentum=None) -> List[Tuple[RuleEntry, Dict]]:
+        """Bu snapshot'ta eşiği geçen kuralları (kural, değer bilgisi) olarak döndürür"""
+        if not self.rules:
+            return []
+
+        pairs = [ticker['currency_pair'] for ticker in tickers]
+        fields = {field for field, _ in self._global} | {field for field, _ in self._by_pair}
+        values = {field: self._field_values(field, tickers, pairs, momentum) for field in fields}
+
+        matches = []
+        for field, current in values.items():
+            previous_map = self._previous.get(field, {})
+            previous = np.fromiter((previous_map.get(pair, np.nan) for pair in pairs), dtype=np.float64, count=len(pairs))
+            current_list = current.tolist()
+            previous_list = previous.tolist()
+            self._previous[field] = dict(zip(pairs, current_list))
+
+            with np.errstate(invalid='ignore'):
+                moved = np.isfinite(previous) & np.isfinite(current) & (previous != current)
+            moved_rows = np.flatnonzero(moved)
+            if not len(moved_rows):
+                continue
+
+            for operator in OPERATORS:
+                key = (field, operator)
+                index = self._global.get(key)
+                if index is not None:
+                    starts, ends = index.crossed(operator, previous[moved_rows], current[moved_rows])
+                    for position in np.flatnonzero(ends > starts):
+                        row = moved_rows[position]
+                        for rule_id in index.rule_ids[starts[position]:ends[position]].tolist():
+                            matches.append((rule_id, pairs[row], previous_list[row], current_list[row]))
+
+                pair_indexes = self._by_pair.get(key)
+                if pair_indexes:
+                    for row in moved_rows.tolist():
+                        index = pair_indexes.get(pairs[row])
+                        if index is None:
+                            continue
+                        start, end = index.crossed_one(operator, previous_list[row], current_list[row])
+                        if end > start:
+                            for rule_id in index.rule_ids[start:end].tolist():
+                                matches.append((rule_id, pairs[row], previous_list[row], current_list[row]))
+
+        fired = []
+        for rule_id, currency_pair, previous_value, value in matches:
+            last = self._fired_at.get((rule_id, currency_pair))
+            if last is not None and now - last < Config.ALERT_COOLDOWN:
+                continue
+            self._fired_at[(rule_id, currency_pair)] = now
+            fired.append((self.rules[rule_id], {
+                'currency_pair': currency_pair,
+                'symbol': currency_pair.replace('_USDT', ''),
+                'previous': previous_value,
+                'value': value,
+            }))
+        return fired
+
+    def _field_values(self, field: str, tickers: List[Dict], pairs: List[str], momentum) -> np.ndarray:
+        """Snapshot sırasıyla alan değerleri; eksikse NaN"""
+        ticker_key = TICKER_FIELDS.get(field)
+        if ticker_key is not None:
+            return np.fromiter((_to_float(ticker.get(ticker_key)) for ticker in tickers), dtype=np.float64, count=len(tickers))
+
+        window = field.split('_', 1)[1]
+        if momentum is None or window not in momentum.last_result:
+            return np.full(len(pairs), np.nan)
+        rows = momentum.buffer.pair_index
+        result = momentum.last_result[window]
+        return np.fromiter((result[rows[pair]] if pair in rows else np.nan for pair in pairs),
+                           dtype=np.float64, count=len(pairs))
+
+    def group_by_channel(self, fired: List[Tuple[RuleEntry, Dict]]) -> Dict[Tuple[str, Optional[str]], List[Tuple[RuleEntry, Dict]]]:
+        """Tetiklenen kuralları (kullanıcı, kanal) başına toplar - kanal başına tek mesaj"""
+        grouped = {}
+        for rule, match in fired:
+            grouped.setdefault((rule.username, rule.channel), []).append((rule, match))
+        return grouped
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _benchmark(rule_count: int = 10000, pair_count: int = 2000, global_share: float = 0.2, scans: int = 20):
+    """10k kural x 2k parite - sıralı indeks vs tüm kuralların doğrusal taranması"""
+    import time
+
+    rng = np.random.default_rng(11)
+    pairs = [f"C{i}_USDT" for i in range(pair_count)]
+    rules = []
+    for rule_id in range(rule_count):
+        field = rng.choice(['price', 'percentage', 'volume'])
+        threshold = {'price': rng.uniform(0.5, 2), 'percentage': rng.uniform(-30, 60),
+                     'volume': rng.uniform(1e4, 1e6)}[field]
+        symbol = None if rng.random() < global_share else f"C{rng.integers(pair_count)}"
+        rules.append(RuleEntry(rule_id, f"u{rule_id % 50}", symbol, field, rng.choice(OPERATORS), float(threshold), None))
+
+    engine = AlertEngine()
+    engine.load(rules)
+
+    price = rng.uniform(0.5, 2, pair_count)
+    change = rng.uniform(-20, 40, pair_count)
+    volume = rng.uniform(1e4, 1e6, pair_count)
+    snapshots = []
+    for _ in range(scans + 1):
+        price *= 1 + rng.normal(0, 0.01, pair_count)
+        change += rng.normal(0, 1, pair_count)
+        volume *= 1 + rng.normal(0, 0.01, pair_count)
+        snapshots.append([{'currency_pair': pair, 'last': str(p), 'change_percentage': str(c), 'quote_volume': str(v)}
+                          for pair, p, c, v in zip(pairs, price, change, volume)])
+
+    Config.ALERT_COOLDOWN = 0
+    engine.evaluate(snapshots[0], 0)
+    started = time.perf_counter()
+    fired = 0
+    for scan, tickers in enumerate(snapshots[1:], 1):
+        fired += len(engine.evaluate(tickers, scan))
+    indexed = (time.perf_counter() - started) / scans
+
+    # Doğrusal karşılaştırma: her kural için parite değerleri Python döngüsünde kontrol edilir
+    def linear(previous, tickers):
+        current = {ticker['currency_pair']: ticker for ticker in tickers}
+        count = 0
+        for rule in rules:
+            targets = [f"{rule.symbol}_USDT"] if rule.symbol else pairs
+            for pair in targets:
+                before = float(previous[pair][TICKER_FIELDS[rule.field]])
+                after = float(current[pair][TICKER_FIELDS[rule.field]])
+                if rule.operator == '>=' and before < rule.threshold <= after:
+                    count += 1
+                elif rule.operator == '<=' and after <= rule.threshold < before:
+                    count += 1
+        return count
+
+    started = time.perf_counter()
+    previous = {ticker['currency_pair']: ticker for ticker in snapshots[0]}
+    linear_fired = linear(previous, snapshots[1])
+    linear_time = time.perf_counter() - started
+
+    first = AlertEngine()
+    first.load(rules)
+    first.evaluate(snapshots[0], 0)
+    indexed_first = len(first.evaluate(snapshots[1], 1))
+
+    print(f"🔔 {rule_count} kural ({global_share:.0%} tüm coinler) x {pair_count} parite")
+    print(f"   indeksli  : {indexed * 1000:8.1f} ms / tarama, ortalama {fired / scans:.0f} tetik")
+    print(f"   doğrusal  : {linear_time * 1000:8.1f} ms / tarama (ilk tarama {linear_fired} tetik, indeksli {indexed_first})")
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Replay / Backtest motoru - Kaydedilmiş piyasa verisiyle gerçek SignalManager mantığını çalıştırır
+
+Kullanım:
+    python backtest.py records/
+    INITIAL_PUMP_THRESHOLD=40 python backtest.py records/market-20240101.rec
+"""
+
+import io
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+from typing import Dict, List, Optional
+from clock import SimulatedClock
+from config import Config
+from gateio_api import GateioAPI
+from market_recorder import MarketRecording
+from momentum import MomentumDetector
+from signal_manager import SignalManager
+
+class ReplayGateioAPI(GateioAPI):
+    """Kayıttan okuyan GateioAPI - ağ çağrısı yapmaz"""
+
+    def __init__(self, recording: MarketRecording, clock: SimulatedClock):
+        # GateioAPI.__init__ çağrılmaz: oturum ve recorder gerekmez
+        self.base_url = Config.GATEIO_BASE_URL
+        self.session = None
+        self.recorder = None
+        self.recording = recording
+        self.clock = clock
+        self.replay_all_tickers = False  # True ise eşik altı pariteler de döner
+        self.entry_mask = None  # Derlenmiş giriş koşulu maskesi, None ise INITIAL_PUMP_THRESHOLD
+
+        pair_count = len(recording.pairs)
+        self.last = np.zeros(pair_count, dtype=np.float64)
+        self.change = np.full(pair_count, -np.inf, dtype=np.float32)
+        self.volume = np.zeros(pair_count, dtype=np.float32)
+        self.present = np.zeros(pair_count, dtype=bool)
+        self.pair_index = {pair: i for i, pair in enumerate(recording.pairs)}
+        self._cursor = 0
+
+    def advance(self, snapshot_index: int):
+        """Durumu verilen snapshot'a kadar delta kayıtlarını uygulayarak ilerletir"""
+        offsets = self.recording.snapshot_offsets
+        start = offsets[self._cursor]
+        end = offsets[snapshot_index + 1]
+        if end > start:
+            rows = self.recording.tickers[start:end]
+            pairs = rows['pair']
+            # Aynı parite birden fazla kez geçerse son değer kazanır (numpy atama sırası)
+            self.last[pairs] = rows['last']
+            self.change[pairs] = rows['change']
+            self.volume[pairs] = rows['volume']
+            self.present[pairs] = True
+        self._cursor = snapshot_index + 1
+
+    def get_all_tickers(self) -> Optional[List[Dict]]:
+        # Ana tarama sadece giriş koşulunu sağlayanları işlediğinden diğerlerini dict'e çevirmeye gerek yok
+        if self.replay_all_tickers:
+            mask = self.present
+        elif self.entry_mask is not None:
+            mask = self.present & self.entry_mask({'percentage': self.change, 'volume': self.volume, 'price': self.last})
+        else:
+            mask = self.present & (self.change >= Config.RUNTIME.initial_pump_threshold)
+        return [self._ticker(i) for i in np.flatnonzero(mask)]
+
+    def get_ticker_detail(self, currency_pair: str) -> Optional[Dict]:
+        index = self.pair_index.get(currency_pair)
+        if index is None or not self.present[index]:
+            return None
+        return self._ticker(index)
+
+    def get_trades_history(self, currency_pair: str, limit: int = 100) -> Optional[List[Dict]]:
+        index = self.pair_index.get(currency_pair)
+        if index is None:
+            return []
+
+        start = self.recording.trade_offsets[index]
+        end = self.recording.trade_offsets[index + 1]
+        trades = self.recording.trades[start:end]
+        # Simüle saate kadar olan son `limit` trade, en yeni önce (Gate.io sırası)
+        stop = np.searchsorted(trades['time'], self.clock.time(), side='right')
+        trades = trades[max(0, stop - limit):stop][::-1]
+
+        return [{
+            'create_time': int(trade['time']),
+            'create_time_ms': trade['time'] * 1000,
+            'price': float(trade['price']),
+            'amount': float(trade['amount'])
+        } for trade in trades]
+
+    def get_volume_data(self, currency_pair: str) -> Optional[Dict]:
+        return None
+
+    def get_order_book(self, currency_pair: str, limit: int = 50) -> Optional[Dict]:
+        return None
+
+    def get_candles(self, symbol: str, interval: str = '15m', limit: int = 100) -> Optional[List[Dict]]:
+        return None
+
+    def get_candle_arrays(self, symbol: str, interval: str = '15m', limit: int = 100,
+                          closed_only: bool = False) -> Optional[Dict]:
+        return None
+
+    def get_cached_candle_arrays(self, symbol: str, interval: str) -> Optional[Dict]:
+        return None
+
+    def _ticker(self, index: int) -> Dict:
+        return {
+            'currency_pair': self.recording.pairs[index],
+            'last': float(self.last[index]),
+            'change_percentage': float(self.change[index]),
+            'quote_volume': float(self.volume[index])
+        }
+
+class ReplayMomentumDetector(MomentumDetector):
+    """Ring buffer'ı ticker dict'leri yerine replay dizilerinden doğrudan doldurur"""
+
+    def __init__(self, api: ReplayGateioAPI):
+        super().__init__()
+        self.api = api
+        # Buffer satırları kayıttaki parite sırasıyla aynı
+        for currency_pair in api.recording.pairs:
+            self.buffer._row(currency_pair)
+
+    def update(self, tickers: List[Dict], timestamp: float) -> List[str]:
+        rows = np.flatnonzero(self.api.present)
+        self.buffer.update_arrays(rows, self.api.last[rows].astype(np.float32), self.api.volume[rows], timestamp)
+        return self.evaluate()
+
+class ReplayTelegramBot:
+    """Mesaj göndermek yerine sinyalleri simüle zamanla kaydeder"""
+
+    def __init__(self, clock: SimulatedClock):
+        self.clock = clock
+        self.signals: List[Dict] = []
+
+    def send_signal(self, signal_data: Dict) -> bool:
+        self.signals.append(dict(signal_data, time=self.clock.time()))
+        return True
+
+    def send_test_message(self) -> bool:
+        return True
+
+class BacktestEngine:
+    def __init__(self, recording: MarketRecording):
+        self.recording = recording
+
+    def run(self, start: float = None, end: float = None, quiet: bool = True) -> List[Dict]:
+        """Snapshot'ları sırayla oynatır, gönderilen sinyalleri döndürür"""
+        times = self.recording.snapshot_times
+        first = np.searchsorted(times, start) if start is not None else 0
+        last = np.searchsorted(times, end, side='right') if end is not None else len(times)
+        if first >= last:
+            return []
+
+        clock = SimulatedClock(float(times[first]))
+        api = ReplayGateioAPI(self.recording, clock)
+        telegram = ReplayTelegramBot(clock)
+        manager = SignalManager(api, telegram_bot=telegram, clock=clock, leader_election=False)
+        manager.base_scan_interval = 0  # Her kayıtlı snapshot bir taramadır
+        manager.scan_cadence = None
+        if manager.momentum is not None:
+            manager.momentum = ReplayMomentumDetector(api)
+            if manager.cluster is not None:
+                manager.cluster.buffer = manager.momentum.buffer
+        manager.pusu = None  # Kayıtlarda mum verisi yok
+        manager.watchlist = None  # Canlı tabloya yazmamalı
+        manager.liquidity = None  # Kayıtlarda emir defteri yok
+        manager.alerts = None  # Kullanıcı kuralları canlı tablodan okunur
+        manager.settings = None  # Canlı ayar tablosu okunmaz - sweep parametreleri geçerli kalır
+        manager.signal_rules.settings = None
+        api.entry_mask = manager.signal_rules.current.entry_mask
+
+        output = io.StringIO() if quiet else None
+        with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+            if first > 0:
+                api.advance(first - 1)
+            for index in range(first, last):
+                clock.set(float(times[index]))
+                api.advance(index)
+                now = clock.monotonic()
+                manager._perform_main_scan(now)
+                manager._check_followed_coins(now)
+                manager._cleanup_dropped_coins()
+                if quiet:
+                    output.seek(0)
+                    output.truncate()
+
+        return telegram.signals
+
+def main():
+    parser = argparse.ArgumentParser(description='Kayıtlı veriyle sinyal backtest')
+    parser.add_argument('path', help='.rec dosyası veya kayıt klasörü')
+    parser.add_argument('--verbose', action='store_true', help='SignalManager çıktısını göster')
+    args = parser.parse_args()
+
+    load_started = time.time()
+    recording = MarketRecording.load(args.path)
+    print(f"📂 {recording.snapshot_count} snapshot, {len(recording.pairs)} parite, "
+          f"{len(recording.trades)} trade yüklendi ({time.time() - load_started:.1f}s)")
+    if recording.snapshot_count == 0:
+        return 1
+
+    run_started = time.time()
+    signals = BacktestEngine(recording).run(quiet=not args.verbose)
+    elapsed = time.time() - run_started
+    simulated = recording.snapshot_times[-1] - recording.snapshot_times[0]
+
+    for signal in signals:
+        print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(signal['time']))}  "
+              f"{signal['symbol']:<12} {signal['signal_type']:<8} %{signal['percentage']:.2f}")
+
+    print(f"🎯 {len(signals)} sinyal • {simulated / 3600:.1f} saatlik veri {elapsed:.1f}s'de oynatıldı "
+          f"({simulated / max(elapsed, 1e-9):.0f}x)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
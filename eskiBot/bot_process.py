@@ -0,0 +1,258 @@
+"""
+Ayrı süreç modu - Bot ve web arayüzü GIL paylaşmadan farklı süreçlerde çalışır
+
+Bot süreci her turun web görüntüsünü mmap dosyasına seqlock ile yazar. Web süreci kilit almadan okur:
+sürüm değişmedikçe aynı görüntü nesnesini döndürür, değişince gövdeyi tek kopyayla alır (takip listesi
+hazır JSON, deserialize yok). Sinyal, alarm ve durum olayları ile başlat/durdur komutları pipe üzerinden gider.
+"""
+
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from typing import Callable, Tuple
+from config import Config
+from web_snapshot import EMPTY_SNAPSHOT, WebSnapshot
+
+_SEQ = struct.Struct('<Q')  # Tek sayı: yazma sürüyor
+_LENGTHS = struct.Struct('<II')  # Meta ve gövde uzunluğu
+_DATA_OFFSET = _SEQ.size + _LENGTHS.size
+
+class SnapshotChannel:
+    """Tek yazar (bot süreci), çok okuyucu (web thread'leri)"""
+
+    def __init__(self, path: str, size: int = None, create: bool = False):
+        self.path = path
+        if create:
+            with open(path, 'wb') as handle:
+                handle.truncate(size or Config.IPC_SNAPSHOT_SIZE)
+        self._file = open(path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self.capacity = len(self._map) - _DATA_OFFSET
+        self._cached: Tuple[int, WebSnapshot] = (0, EMPTY_SNAPSHOT)  # Tek atamayla değişir
+
+        # Yarım kalmış yazmadan sonra çift sayıdan devam
+        seq = _SEQ.unpack_from(self._map, 0)[0]
+        self._seq = seq + (seq & 1)
+
+        # Sayaçlar
+        self.writes = 0
+        self.overflows = 0
+        self.retries = 0
+
+    def write(self, snapshot: WebSnapshot) -> bool:
+        """Bot sürecinde - alan yetmezse görüntü yayınlanmaz"""
+        meta = json.dumps({
+            'version': snapshot.version,
+            'last_update': snapshot.last_update,
+            'stats': snapshot.stats,
+            'tracked_count': snapshot.tracked_count,
+            'settings_version': snapshot.settings_version,
+        }, ensure_ascii=False).encode('utf-8')
+        body = snapshot.tracked_json
+        end = _DATA_OFFSET + len(meta) + len(body)
+        if end - _DATA_OFFSET > self.capacity:
+            self.overflows += 1
+            print(f"⚠️ Web görüntüsü {end - _DATA_OFFSET} bayt, alan {self.capacity} bayt - IPC_SNAPSHOT_SIZE artırılmalı")
+            return False
+
+        _SEQ.pack_into(self._map, 0, self._seq + 1)
+        _LENGTHS.pack_into(self._map, _SEQ.size, len(meta), len(body))
+        self._map[_DATA_OFFSET:_DATA_OFFSET + len(meta)] = meta
+        self._map[_DATA_OFFSET + len(meta):end] = body
+        self._seq += 2
+        _SEQ.pack_into(self._map, 0, self._seq)  # Uzunluklar ve veri yazıldıktan sonra
+        self.writes += 1
+        return True
+
+    def read(self) -> WebSnapshot:
+        """Web sürecinde - sürüm değişmediyse kopya yok"""
+        cached_seq, cached = self._cached
+        for _ in range(100):
+            seq = _SEQ.unpack_from(self._map, 0)[0]
+            if seq == cached_seq:
+                return cached
+            if seq & 1:
+                self.retries += 1
+                time.sleep(0)
+                continue
+            meta_length, body_length = _LENGTHS.unpack_from(self._map, _SEQ.size)
+            meta = self._map[_DATA_OFFSET:_DATA_OFFSET + meta_length]
+            body = self._map[_DATA_OFFSET + meta_length:_DATA_OFFSET + meta_length + body_length]
+            if _SEQ.unpack_from(self._map, 0)[0] != seq:
+                self.retries += 1  # Okurken yeni görüntü yazıldı
+                continue
+            try:
+                meta = json.loads(meta)
+            except ValueError:
+                return cached  # Bozuk dosya - son görüntü geçerli kalır
+            snapshot = WebSnapshot(
+                version=meta['version'],
+                last_update=meta['last_update'],
+                stats=meta['stats'],
+                tracked_count=meta['tracked_count'],
+                tracked_json=body,
+                settings_version=meta.get('settings_version'),
+            )
+            self._cached = (seq, snapshot)
+            return snapshot
+        return cached
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+def run_bot_process(conn, snapshot_path: str):
+    """Bot sürecinin girişi - komutları pipe'tan okur, taramayı ayrı thread'de yürütür"""
+    from signal_manager import SignalManager
+
+    # eventlet'li web süreci socketpair'i non-blocking açar; bayrak iki süreçte ortak, bu süreç düz thread'lerle çalışır
+    os.set_blocking(conn.fileno(), True)
+    channel = SnapshotChannel(snapshot_path)
+    send_lock = threading.Lock()  # Alarm thread'leri de gönderir
+
+    def send(*message):
+        with send_lock:
+            try:
+                conn.send(message)
+            except (BrokenPipeError, OSError):
+                pass  # Web süreci kapanıyor
+
+    manager = SignalManager()
+    manager.set_web_callback(lambda signal_data: send('signal', signal_data))
+    manager.set_alert_callback(lambda username, alerts: send('alert', username, alerts))
+    manager.set_snapshot_callback(channel.write)
+
+    def monitor():
+        send('status', 'running')
+        try:
+            manager.start_monitoring()
+        finally:
+            send('status', 'stopped')
+
+    scan_thread = None
+    while True:
+        try:
+            command = conn.recv()
+        except (EOFError, OSError):
+            break  # Web süreci kapandı
+        name = command[0]
+        if name == 'start':
+            if scan_thread is not None and scan_thread.is_alive():
+                if not manager.stop_requested:
+                    continue  # Zaten çalışıyor
+                scan_thread.join()  # Durdurulan döngü turunu bitirsin - iki döngü aynı anda çalışmaz
+            scan_thread = threading.Thread(target=monitor, name='scan', daemon=True)
+            scan_thread.start()
+        elif name == 'stop':
+            manager.stop()
+        elif name == 'shutdown':
+            break
+
+    manager.stop()
+    if scan_thread is not None:
+        scan_thread.join(timeout=10)
+    channel.close()
+
+class BotProcess:
+    """Web sürecindeki istemci - bot sürecini başlatır, komut gönderir, olayları dinler"""
+
+    def __init__(self, on_event: Callable[[str, tuple], None], snapshot_path: str = None):
+        self.snapshot_path = snapshot_path or Config.IPC_SNAPSHOT_PATH
+        self.channel = SnapshotChannel(self.snapshot_path, create=True)
+        self.on_event = on_event  # (olay adı, argümanlar) - dinleyici thread'inde çağrılır
+        context = multiprocessing.get_context('spawn')  # Web sürecinin thread'leri ve DB bağlantıları kopyalanmaz
+        self._conn, self._child_conn = context.Pipe()
+        self._process = context.Process(target=run_bot_process, args=(self._child_conn, self.snapshot_path),
+                                        name='signal-bot', daemon=True)
+        self._send_lock = threading.Lock()
+
+    @property
+    def pid(self):
+        return self._process.pid
+
+    def launch(self):
+        self._process.start()
+        self._child_conn.close()  # Bot süreci kapanınca recv EOF alsın
+        threading.Thread(target=self._listen, name='bot-events', daemon=True).start()
+        print(f"🧩 Bot süreci başlatıldı (pid {self._process.pid})")
+
+    def command(self, name: str) -> bool:
+        """'start', 'stop' veya 'shutdown' - süreç ölmüşse False"""
+        if not self._process.is_alive():
+            return False
+        with self._send_lock:
+            try:
+                self._conn.send((name,))
+            except (BrokenPipeError, OSError):
+                return False
+        return True
+
+    def snapshot(self) -> WebSnapshot:
+        return self.channel.read()
+
+    def _listen(self):
+        while True:
+            try:
+                if not self._conn.poll(0.5):
+                    if not self._process.is_alive():
+                        break
+                    continue
+                message = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            try:
+                self.on_event(message[0], message[1:])
+            except Exception as e:
+                print(f"❌ Bot olayı işlenemedi ({message[0]}): {e}")
+        print(f"🛑 Bot süreci sonlandı (çıkış kodu {self._process.exitcode})")
+        self.on_event('status', ('stopped',))
+
+def _benchmark(sizes=(10, 100, 1000), rounds: int = 500):
+    """Görüntü yazma ve okuma süresi - değişmiş ve değişmemiş görüntü için"""
+    import os
+    import tempfile
+    from datetime import datetime, timezone
+    from tracker_store import CoinTracker
+    from web_snapshot import SnapshotPublisher
+
+    path = os.path.join(tempfile.gettempdir(), 'signal_bot_snapshot_benchmark.mmap')
+    writer = SnapshotChannel(path, create=True)
+    reader = SnapshotChannel(path)
+    publisher = SnapshotPublisher(lambda value: datetime.fromtimestamp(value, tz=timezone.utc))
+    now = datetime.now(tz=timezone.utc)
+    print(f"{'coin':>6} {'bayt':>9} {'yazma (µs)':>11} {'okuma (µs)':>11} {'aynı sürüm (µs)':>16}")
+    for size in sizes:
+        trackers = [CoinTracker(symbol=f"C{i}", currency_pair=f"C{i}_USDT", base_price=1.0, current_price=1.1,
+                                initial_percentage=20.0, current_percentage=25.0, previous_signal_percentage=20.0,
+                                signal_count=1, last_signal_at=1_700_000_000.0 + i,
+                                last_scan_at=1_700_000_000.0 + i, is_following=False, volume_24h=5e5)
+                    for i in range(size)]
+        snapshot = publisher.publish(trackers, {'total_signals': size}, now)
+
+        write_time = read_time = 0.0
+        for _ in range(rounds):
+            started = time.perf_counter()
+            writer.write(snapshot)
+            write_time += time.perf_counter() - started
+            started = time.perf_counter()
+            received = reader.read()
+            read_time += time.perf_counter() - started
+        assert received.tracked_json == snapshot.tracked_json
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            reader.read()
+        unchanged_time = time.perf_counter() - started
+
+        print(f"{size:>6} {len(snapshot.tracked_json):>9} {write_time / rounds * 1e6:>11.1f} "
+              f"{read_time / rounds * 1e6:>11.1f} {unchanged_time / rounds * 1e6:>16.2f}")
+    reader.close()
+    writer.close()
+    os.remove(path)
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,226 @@
+"""
+Mum önbelleği - (parite, aralık) başına dizi tabanlı mum sütunları
+
+İlk yüklemeden sonra sadece yeni mumlar `from` ile çekilir; henüz kapanmamış son mum her
+istekte yenilenir. Toplam boyut bellek sınırını aşınca en uzun süre kullanılmayan seri atılır.
+"""
+
+import os
+import json
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from config import Config
+
+INTERVAL_SECONDS = {
+    '10s': 10,
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '30m': 1800,
+    '1h': 3600,
+    '4h': 14400,
+    '8h': 28800,
+    '1d': 86400,
+    '7d': 604800,
+}
+
+# Gate.io mum formatı: [timestamp, volume, close, high, low, open, ...] -> o, h, l, c, v sütunları
+_RAW_COLUMNS = [5, 3, 4, 2, 1]
+VALUE_COLUMNS = ('o', 'h', 'l', 'c', 'v')
+
+# Gate.io tek istekte en fazla 1000 mum döndürür
+MAX_FETCH_CANDLES = 1000
+
+class CandleSeries:
+    """Tek (parite, aralık) için zaman sıralı mum sütunları"""
+    __slots__ = ('times', 'values', 'closed_count')
+
+    def __init__(self, times: np.ndarray, values: np.ndarray, closed_count: int):
+        self.times = times  # int64 açılış zamanları
+        self.values = values  # float64 (n, 5): o, h, l, c, v
+        self.closed_count = closed_count  # Son çekimde kapanmış olan baştaki mum sayısı
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.values.nbytes
+
+    def columns(self, limit: int, closed_only: bool) -> Dict[str, np.ndarray]:
+        """Son `limit` mumun sütun görünümleri"""
+        end = self.closed_count if closed_only else len(self.times)
+        start = max(end - limit, 0)
+        result = {'t': self.times[start:end]}
+        for index, name in enumerate(VALUE_COLUMNS):
+            result[name] = self.values[start:end, index]
+        return result
+
+def parse_candle_rows(rows: List[List]) -> Tuple[np.ndarray, np.ndarray]:
+    """Ham API satırlarını tek adımda (times, values) dizilerine çevirir"""
+    rows = [row for row in rows if len(row) >= 6]
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty((0, len(VALUE_COLUMNS)), dtype=np.float64)
+    raw = np.array([row[:6] for row in rows], dtype=np.float64)
+    order = np.argsort(raw[:, 0], kind='stable')
+    raw = raw[order]
+    return raw[:, 0].astype(np.int64), np.ascontiguousarray(raw[:, _RAW_COLUMNS])
+
+class CandleCache:
+    def __init__(self, fetch_rows: Callable[[str, str, Dict], Optional[List[List]]],
+                 max_bytes: int = None, max_candles: int = None, snapshot_path: str = None):
+        self.fetch_rows = fetch_rows  # (currency_pair, interval, params) -> ham satırlar
+        self.max_bytes = max_bytes or Config.CANDLE_CACHE_MAX_MB * 1024 * 1024
+        self.max_candles = max_candles or Config.CANDLE_CACHE_MAX_CANDLES
+        self.snapshot_path = snapshot_path if snapshot_path is not None else Config.CANDLE_CACHE_FILE
+        self._series: 'OrderedDict[Tuple[str, str], CandleSeries]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._last_save = None
+
+        # Sayaçlar
+        self.hits = 0
+        self.incremental_fetches = 0
+        self.full_fetches = 0
+        self.evictions = 0
+
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            self.load(self.snapshot_path)
+
+    def get(self, currency_pair: str, interval: str, limit: int, now: float,
+            closed_only: bool = False) -> Optional[Dict[str, np.ndarray]]:
+        """Son `limit` mumu sütunlar halinde döndürür; gerekirse sadece eksik kısmı çeker"""
+        interval_seconds = INTERVAL_SECONDS[interval]
+        key = (currency_pair, interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is not None:
+                self._series.move_to_end(key)
+
+        available = series.closed_count if series is not None and closed_only else len(series or ())
+        if series is not None and available >= limit:
+            last_time = int(series.times[-1])
+            if closed_only and series.closed_count and now < series.times[series.closed_count - 1] + 2 * interval_seconds:
+                # Son kapanmış mumdan sonraki mum henüz kapanmadı - istek gerekmez
+                self.hits += 1
+                return series.columns(limit, closed_only)
+            if (now - last_time) / interval_seconds < MAX_FETCH_CANDLES:
+                # Açık mum dahil son kayıtlı mumdan itibaren çek
+                rows = self.fetch_rows(currency_pair, interval, {'from': last_time, 'to': int(now)})
+                if rows is None:
+                    return None
+                self.incremental_fetches += 1
+                return self._store(key, series, rows, now, interval_seconds).columns(limit, closed_only)
+
+        # İlk yükleme veya daha uzun geçmiş gerekiyor
+        fetch_limit = min(limit + 1 if closed_only else limit, MAX_FETCH_CANDLES)
+        rows = self.fetch_rows(currency_pair, interval, {'limit': fetch_limit})
+        if rows is None:
+            return None
+        self.full_fetches += 1
+        return self._store(key, None, rows, now, interval_seconds).columns(limit, closed_only)
+
+    def peek(self, currency_pair: str, interval: str) -> Optional[Dict[str, np.ndarray]]:
+        """Önbellekteki seriyi istek yapmadan döndürür; yoksa None"""
+        with self._lock:
+            series = self._series.get((currency_pair, interval))
+        return series.columns(len(series), closed_only=False) if series is not None else None
+
+    def _store(self, key: Tuple[str, str], series: Optional[CandleSeries], rows: List[List], now: float,
+               interval_seconds: int) -> CandleSeries:
+        """Yeni satırları seriye ekler; aynı zamanlı (açık) mumların eski hali yenisiyle değişir"""
+        times, values = parse_candle_rows(rows)
+        if series is not None and len(times):
+            keep = np.searchsorted(series.times, times[0], side='left')
+            times = np.concatenate([series.times[:keep], times])
+            values = np.concatenate([series.values[:keep], values])
+        elif series is not None:
+            times, values = series.times, series.values
+
+        if len(times) > self.max_candles:
+            times = times[-self.max_candles:].copy()
+            values = values[-self.max_candles:].copy()
+
+        closed_count = int(np.searchsorted(times, now - interval_seconds, side='right'))
+        updated = CandleSeries(times, values, closed_count)
+
+        with self._lock:
+            previous = self._series.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._series[key] = updated
+            self._bytes += updated.nbytes
+            self._evict()
+
+        self._maybe_save(now)
+        return updated
+
+    def _evict(self):
+        """Bellek sınırı aşıldıkça en eski kullanılan seriyi atar (kilit altında çağrılır)"""
+        while self._bytes > self.max_bytes and len(self._series) > 1:
+            _, series = self._series.popitem(last=False)
+            self._bytes -= series.nbytes
+            self.evictions += 1
+
+    def _maybe_save(self, now: float):
+        if not self.snapshot_path:
+            return
+        if self._last_save is None:
+            self._last_save = now
+            return
+        if now - self._last_save < Config.CANDLE_CACHE_SAVE_INTERVAL:
+            return
+        self._last_save = now
+        try:
+            self.save(self.snapshot_path)
+        except Exception as e:
+            print(f"❌ Mum önbelleği kaydetme hatası: {e}")
+
+    def save(self, path: str):
+        """Tüm serileri tek .npz dosyasına yazar (sıcak başlangıç için)"""
+        with self._lock:
+            items = list(self._series.items())
+
+        keys = [list(key) for key, _ in items]
+        lengths = [len(series) for _, series in items]
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        times = np.concatenate([series.times for _, series in items]) if items else np.empty(0, dtype=np.int64)
+        values = (np.concatenate([series.values for _, series in items]) if items
+                  else np.empty((0, len(VALUE_COLUMNS)), dtype=np.float64))
+        closed = np.array([series.closed_count for _, series in items], dtype=np.int64)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, keys=np.array(json.dumps(keys)), offsets=offsets, times=times, values=values, closed=closed)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str):
+        """save() ile yazılmış snapshot'ı yükler - LRU sırası dosyadaki sıradır"""
+        try:
+            with np.load(path) as data:
+                keys = json.loads(str(data['keys']))
+                offsets, times, values, closed = data['offsets'], data['times'], data['values'], data['closed']
+        except Exception as e:
+            print(f"❌ Mum önbelleği yükleme hatası: {e}")
+            return
+
+        with self._lock:
+            for index, (currency_pair, interval) in enumerate(keys):
+                start, end = offsets[index], offsets[index + 1]
+                series = CandleSeries(times[start:end].copy(), values[start:end].copy(), int(closed[index]))
+                self._series[(currency_pair, interval)] = series
+                self._bytes += series.nbytes
+            self._evict()
+        print(f"📂 Mum önbelleği yüklendi: {len(keys)} seri")
+
+    def stats(self) -> Dict:
+        return {
+            'series': len(self._series),
+            'memory_kb': self._bytes / 1024,
+            'hits': self.hits,
+            'incremental_fetches': self.incremental_fetches,
+            'full_fetches': self.full_fetches,
+            'evictions': self.evictions,
+        }
@@ -0,0 +1,38 @@
+"""
+Saat soyutlaması - Canlı çalışmada sistem saati, replay'de simüle saat
+"""
+
+import time
+
+class SystemClock:
+    """Gerçek sistem saati"""
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+class SimulatedClock:
+    """Replay için elle ilerletilen saat - sleep beklemez, sadece saati ileri alır"""
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._start = start
+
+    def set(self, timestamp: float):
+        """Saati verilen epoch zamanına ayarlar (geri gitmez)"""
+        if timestamp > self._now:
+            self._now = timestamp
+
+    def time(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._now - self._start
+
+    def sleep(self, seconds: float):
+        self._now += seconds
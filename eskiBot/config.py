@@ -3,6 +3,22 @@ Konfigürasyon dosyası - Bot ayarları
 """
 
 import os
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True, slots=True)
+class RuntimeSettings:
+    """Panelden yeniden başlatmadan değişen ayarlar - değişmez, her sürümde bütünüyle yenisi atanır"""
+    initial_pump_threshold: int
+    second_signal_threshold: int
+    next_signal_threshold: int
+    drop_threshold: int
+    low_volume_threshold: int
+    medium_volume_threshold: int
+    min_trade_amount: int
+    scan_interval: int
+    followup_interval: int
+    version: Optional[int] = None  # Uygulanan bot_settings sürümü (None = env değerleri)
 
 class Config:
     # Telegram Bot Ayarları
@@ -14,19 +30,120 @@ class Config:
     
     # Sinyal Ayarları
     SCAN_INTERVAL = int(os.getenv('SCAN_INTERVAL', 15))  # 15 saniye
+    SCAN_ADAPTIVE = int(os.getenv('SCAN_ADAPTIVE', 1))  # Aralık piyasa aktivitesine göre değişir (0 = sabit)
+    SCAN_MIN_INTERVAL = int(os.getenv('SCAN_MIN_INTERVAL', 5))  # Hareketli piyasada en kısa aralık - momentum buffer kapasitesi buna göre hesaplanır
+    SCAN_MAX_INTERVAL = int(os.getenv('SCAN_MAX_INTERVAL', 60))  # Sakin piyasa / API hatasında en uzun aralık
+    SCAN_HOT_PAIRS = int(os.getenv('SCAN_HOT_PAIRS', 10))  # Bu kadar parite eşik üstündeyse hızlan
+    SCAN_DISPERSION_HIGH = float(os.getenv('SCAN_DISPERSION_HIGH', 0.5))  # Taramalar arası getiri std (%) üstü hızlan
+    SCAN_DISPERSION_LOW = float(os.getenv('SCAN_DISPERSION_LOW', 0.05))  # Altı ve eşik üstü parite azsa yavaşla
+    SCAN_LATENCY_LIMIT = float(os.getenv('SCAN_LATENCY_LIMIT', 3))  # Ticker isteği bu süreyi aşarsa geri çekil
     INITIAL_PUMP_THRESHOLD = int(os.getenv('INITIAL_PUMP_THRESHOLD', 35))  # %35 artış için ilk sinyal
     SECOND_SIGNAL_THRESHOLD = int(os.getenv('SECOND_SIGNAL_THRESHOLD', 20))  # %20 ek artış için 2. sinyal
     NEXT_SIGNAL_THRESHOLD = int(os.getenv('NEXT_SIGNAL_THRESHOLD', 10))  # %10'luk artışlar için sonraki sinyaller
-    FOLLOWUP_INTERVAL = int(os.getenv('FOLLOWUP_INTERVAL', 45))  # 45 saniye takip aralığı
+    FOLLOWUP_INTERVAL = int(os.getenv('FOLLOWUP_INTERVAL', 45))  # 45 saniye takip aralığı (hız bilinmiyorsa)
+    FOLLOWUP_MIN_INTERVAL = int(os.getenv('FOLLOWUP_MIN_INTERVAL', 3))  # Tetiğe yakın coinler
+    FOLLOWUP_MAX_INTERVAL = int(os.getenv('FOLLOWUP_MAX_INTERVAL', 120))  # Tetiğe uzak coinler
+    FOLLOWUP_REQUESTS_PER_SECOND = float(os.getenv('FOLLOWUP_REQUESTS_PER_SECOND', 5))  # Global takip isteği bütçesi
     DROP_THRESHOLD = int(os.getenv('DROP_THRESHOLD', 25))  # %25'e düşünce takipten çıkar
+    SETTINGS_POLL_INTERVAL = int(os.getenv('SETTINGS_POLL_INTERVAL', 5))  # Panel ayar sürümünü yoklama aralığı
+    
+    # Momentum Ayarları - Son taramalardan hesaplanan kısa vadeli getiriler (0 = kapalı)
+    MOMENTUM_ENABLED = int(os.getenv('MOMENTUM_ENABLED', 0))
+    MOMENTUM_HISTORY_SIZE = int(os.getenv('MOMENTUM_HISTORY_SIZE', 0))  # Saklanan snapshot sayısı (0 = en uzun pencereden hesaplanır)
+    MOMENTUM_1M_THRESHOLD = int(os.getenv('MOMENTUM_1M_THRESHOLD', 10))  # 1 dakikada %10
+    MOMENTUM_5M_THRESHOLD = int(os.getenv('MOMENTUM_5M_THRESHOLD', 15))  # 5 dakikada %15
+    MOMENTUM_15M_THRESHOLD = int(os.getenv('MOMENTUM_15M_THRESHOLD', 20))  # 15 dakikada %20
+    MOMENTUM_1H_THRESHOLD = int(os.getenv('MOMENTUM_1H_THRESHOLD', 30))  # 1 saatte %30
+    MOMENTUM_MIN_VOLUME_ACCEL = float(os.getenv('MOMENTUM_MIN_VOLUME_ACCEL', 0))  # Hacim ivmesi şartı
+    MOMENTUM_COOLDOWN = int(os.getenv('MOMENTUM_COOLDOWN', 1800))  # Aynı coin için tekrar sinyal aralığı
+    
+    # Küme Pompası - Birlikte yükselen pariteler tek sinyalde (momentum buffer'ını kullanır, 0 = kapalı)
+    CLUSTER_ENABLED = int(os.getenv('CLUSTER_ENABLED', 0))
+    CLUSTER_WINDOW = int(os.getenv('CLUSTER_WINDOW', 900))  # Korelasyon penceresi (saniye)
+    CLUSTER_MIN_POINTS = int(os.getenv('CLUSTER_MIN_POINTS', 8))  # Pencerede gereken en az snapshot
+    CLUSTER_MIN_RETURN = float(os.getenv('CLUSTER_MIN_RETURN', 5))  # Pencere içi en az yükseliş (%)
+    CLUSTER_MIN_CORRELATION = float(os.getenv('CLUSTER_MIN_CORRELATION', 0.7))  # Çiftler arası korelasyon eşiği
+    CLUSTER_MIN_SIZE = int(os.getenv('CLUSTER_MIN_SIZE', 3))  # En az üye sayısı
+    CLUSTER_COOLDOWN = int(os.getenv('CLUSTER_COOLDOWN', 3600))  # Aynı üyeler için tekrar sinyal aralığı
+    
+    # Pusu Ayarları - Düşük volatilitede hacim toplayan coinler (0 = kapalı)
+    PUSU_ENABLED = int(os.getenv('PUSU_ENABLED', 0))
+    PUSU_INTERVAL = os.getenv('PUSU_INTERVAL', '15m')  # Mum aralığı
+    PUSU_CANDLE_COUNT = int(os.getenv('PUSU_CANDLE_COUNT', 96))  # 96 x 15dk = 24 saat
+    PUSU_RECENT_CANDLES = int(os.getenv('PUSU_RECENT_CANDLES', 16))  # Sıkışma penceresi (4 saat)
+    PUSU_MAX_VOLATILITY = float(os.getenv('PUSU_MAX_VOLATILITY', 4))  # 24s volatilite üst sınırı (%)
+    PUSU_MAX_COMPRESSION = float(os.getenv('PUSU_MAX_COMPRESSION', 0.3))  # Son aralık / 24s aralık
+    PUSU_MIN_VOLUME_RATIO = float(os.getenv('PUSU_MIN_VOLUME_RATIO', 1.5))  # Son hacim / 24s ortalama
+    PUSU_MIN_VOLUME = int(os.getenv('PUSU_MIN_VOLUME', 50000))  # Bu 24s hacmin altı taranmaz
+    PUSU_REQUESTS_PER_SECOND = float(os.getenv('PUSU_REQUESTS_PER_SECOND', 2))  # Mum isteği hız sınırı
+    PUSU_REFRESH_INTERVAL = int(os.getenv('PUSU_REFRESH_INTERVAL', 900))  # Parite başına yenileme aralığı
+    PUSU_COOLDOWN = int(os.getenv('PUSU_COOLDOWN', 14400))  # Aynı coin için tekrar sinyal aralığı
+    
+    # Kullanıcı Alarmları - alert_rules tablosundaki kurallar her snapshot'ta değerlendirilir (0 = kapalı)
+    ALERT_ENABLED = int(os.getenv('ALERT_ENABLED', 1))
+    ALERT_SYNC_INTERVAL = int(os.getenv('ALERT_SYNC_INTERVAL', 30))  # Tablodan yeniden okuma aralığı
+    ALERT_COOLDOWN = int(os.getenv('ALERT_COOLDOWN', 600))  # Aynı kural+parite için tekrar tetik aralığı
     
     # Hacim Kategorileri
     LOW_VOLUME_THRESHOLD = int(os.getenv('LOW_VOLUME_THRESHOLD', 100000))  # 100k altı düşük hacim
     MEDIUM_VOLUME_THRESHOLD = int(os.getenv('MEDIUM_VOLUME_THRESHOLD', 300000))  # 300k altı orta hacim
     
+    # Özel Takip Listesi - special_watchlist tablosundaki coinler (0 = kapalı)
+    SPECIAL_ENABLED = int(os.getenv('SPECIAL_ENABLED', 0))
+    SPECIAL_STEP_PERCENTAGE = float(os.getenv('SPECIAL_STEP_PERCENTAGE', 5))  # Son sinyalden bu kadar hareket
+    SPECIAL_SYNC_INTERVAL = int(os.getenv('SPECIAL_SYNC_INTERVAL', 30))  # Tablodan yeniden okuma aralığı
+    SPECIAL_FLUSH_INTERVAL = int(os.getenv('SPECIAL_FLUSH_INTERVAL', 10))  # Toplu geri yazma aralığı
+    
+    # Mum Önbelleği - (parite, aralık) başına, sadece yeni mumlar çekilir
+    CANDLE_CACHE_MAX_MB = int(os.getenv('CANDLE_CACHE_MAX_MB', 64))  # Aşılınca en eski kullanılan seri atılır
+    CANDLE_CACHE_MAX_CANDLES = int(os.getenv('CANDLE_CACHE_MAX_CANDLES', 1000))  # Seri başına mum sayısı
+    CANDLE_CACHE_FILE = os.getenv('CANDLE_CACHE_FILE', '')  # Boş değilse sıcak başlangıç için snapshot
+    CANDLE_CACHE_SAVE_INTERVAL = int(os.getenv('CANDLE_CACHE_SAVE_INTERVAL', 300))  # Snapshot yazma aralığı
+    
+    # Sinyal Zenginleştirme - Aynı taramadaki pump coinler için paralel istek sayısı
+    ENRICH_WORKERS = int(os.getenv('ENRICH_WORKERS', 8))
+    
+    # Likidite Kapısı - Sinyal adaylarının emir defterinden spread/kayma (0 = kapalı)
+    LIQUIDITY_ENABLED = int(os.getenv('LIQUIDITY_ENABLED', 0))
+    LIQUIDITY_MODE = os.getenv('LIQUIDITY_MODE', 'annotate')  # annotate: uyarı ekle, suppress: sinyali gönderme
+    LIQUIDITY_NOTIONAL = float(os.getenv('LIQUIDITY_NOTIONAL', 1000))  # Kayma hesabı için emir büyüklüğü (USDT)
+    LIQUIDITY_MAX_SPREAD = float(os.getenv('LIQUIDITY_MAX_SPREAD', 1))  # Spread üst sınırı (%)
+    LIQUIDITY_MAX_SLIPPAGE = float(os.getenv('LIQUIDITY_MAX_SLIPPAGE', 2))  # Alış/satış kayması üst sınırı (%)
+    LIQUIDITY_DEPTH_RANGE = float(os.getenv('LIQUIDITY_DEPTH_RANGE', 2))  # Orta fiyatın ±%'si içindeki derinlik
+    LIQUIDITY_BOOK_LIMIT = int(os.getenv('LIQUIDITY_BOOK_LIMIT', 50))  # Taraf başına çekilen seviye sayısı
+    LIQUIDITY_CACHE_TTL = float(os.getenv('LIQUIDITY_CACHE_TTL', 10))  # Parite başına derinlik önbelleği (saniye)
+    LIQUIDITY_TIMEOUT = float(os.getenv('LIQUIDITY_TIMEOUT', 0.8))  # Derinlik bekleme süresi (saniye)
+    LIQUIDITY_WORKERS = int(os.getenv('LIQUIDITY_WORKERS', 16))  # Paralel derinlik isteği sayısı
+    LIQUIDITY_REJECT_COOLDOWN = int(os.getenv('LIQUIDITY_REJECT_COOLDOWN', 300))  # Elenen parite tekrar denenmez
+    
+    # Telegram Ara Sinyalleri - edit: ilk mesaj güncellenir, reply: ilk mesaja yanıt, send: her sinyal yeni mesaj
+    TELEGRAM_FOLLOWUP_MODE = os.getenv('TELEGRAM_FOLLOWUP_MODE', 'send')
+    TELEGRAM_MAJOR_TIERS = [int(tier) for tier in os.getenv('TELEGRAM_MAJOR_TIERS', '5,10').split(',') if tier.strip()]  # Her zaman yeni mesaj
+    
+    # Sinyal İstatistikleri - dakika/saat/gün kovaları signal_stat_buckets tablosunda
+    STATS_FLUSH_INTERVAL = int(os.getenv('STATS_FLUSH_INTERVAL', 10))  # Biriken sayaçların DB'ye yazılma aralığı
+    STATS_MINUTE_RETENTION = int(os.getenv('STATS_MINUTE_RETENTION', 48))  # Dakika kovaları (saat)
+    STATS_HOUR_RETENTION = int(os.getenv('STATS_HOUR_RETENTION', 90))  # Saat kovaları (gün), gün kovaları silinmez
+    
     # Trade History Ayarları
     MIN_TRADE_AMOUNT = int(os.getenv('MIN_TRADE_AMOUNT', 100))  # Minimum 100 dolar alım
     
+    # Lider Seçimi - Aynı anda birden fazla instance çalışırsa sadece lider tarar
+    LEADER_ELECTION = os.getenv('LEADER_ELECTION', 'off')  # db, file, off - db modu takip durumunu her TRACKER_SYNC_INTERVAL'da yazar
+    LEADER_LEASE_TTL = int(os.getenv('LEADER_LEASE_TTL', 10))  # Lease süresi (saniye)
+    LEADER_RENEW_INTERVAL = int(os.getenv('LEADER_RENEW_INTERVAL', 3))  # Lease yenileme aralığı
+    LEADER_LOCK_FILE = os.getenv('LEADER_LOCK_FILE', '/tmp/signal_bot.lock')  # file modu için
+    TRACKER_SYNC_INTERVAL = int(os.getenv('TRACKER_SYNC_INTERVAL', 5))  # Takip durumunu DB'ye yazma aralığı
+    
+    # Süreç Modu - process: bot ayrı süreçte çalışır, web görüntüleri paylaşımlı bellekten okur
+    BOT_PROCESS_MODE = os.getenv('BOT_PROCESS_MODE', 'thread')  # thread, process
+    IPC_SNAPSHOT_PATH = os.getenv('IPC_SNAPSHOT_PATH', '/tmp/signal_bot_snapshot.mmap')  # process modu için
+    IPC_SNAPSHOT_SIZE = int(os.getenv('IPC_SNAPSHOT_SIZE', 4 * 1024 * 1024))  # Görüntü alanı (bayt)
+    WEB_ASYNC_MODE = os.getenv('WEB_ASYNC_MODE', 'eventlet')  # eventlet: G/Ç yeşillendirilir, threading: gerçek thread'ler
+    
+    # Piyasa Kaydı - Boş değilse ticker/trade verileri replay için bu klasöre yazılır
+    RECORD_DIR = os.getenv('RECORD_DIR', '')
+    
     # Bot 7/24 çalışır - çalışma saati kısıtlaması yok
     
     # Blacklist - Bu coinler taranmayacak
@@ -35,3 +152,17 @@ class Config:
         '3S', '3L', '5S', '5L',  # Leverage tokenler
         'BEAR', 'BULL'  # Leverage tokenler
     ]
+    
+    # Çalışma zamanı ayarları - yukarıdaki env değerleriyle başlar, SettingsService tek atamayla değiştirir.
+    # Okuyucular Config.RUNTIME'ı kullanır; birden fazla alan okuyan kod referansı bir kez yerel değişkene alır.
+    RUNTIME = RuntimeSettings(
+        initial_pump_threshold=INITIAL_PUMP_THRESHOLD,
+        second_signal_threshold=SECOND_SIGNAL_THRESHOLD,
+        next_signal_threshold=NEXT_SIGNAL_THRESHOLD,
+        drop_threshold=DROP_THRESHOLD,
+        low_volume_threshold=LOW_VOLUME_THRESHOLD,
+        medium_volume_threshold=MEDIUM_VOLUME_THRESHOLD,
+        min_trade_amount=MIN_TRADE_AMOUNT,
+        scan_interval=SCAN_INTERVAL,
+        followup_interval=FOLLOWUP_INTERVAL,
+    )
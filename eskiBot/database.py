@@ -2,7 +2,7 @@
 SQLite Database Models and Connection
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -89,6 +89,34 @@ class SpecialWatchlist(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class AlertRule(Base):
+    __tablename__ = "alert_rules"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False, index=True)
+    symbol = Column(String(20), index=True)  # NULL ise tüm coinler
+    field = Column(String(20), nullable=False)  # price, percentage, volume, momentum_1m, momentum_5m, ...
+    operator = Column(String(2), nullable=False)  # >= (yukarı geçiş), <= (aşağı geçiş)
+    threshold = Column(Float, nullable=False)
+    channel = Column(String(100))  # Telegram chat ID, NULL ise sadece web
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SignalStatBucket(Base):
+    __tablename__ = "signal_stat_buckets"
+    __table_args__ = (
+        UniqueConstraint('granularity', 'bucket_start', 'dimension', 'key'),
+        Index('ix_signal_stat_buckets_lookup', 'granularity', 'dimension', 'bucket_start'),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    granularity = Column(String(10), nullable=False)  # minute, hour, day
+    bucket_start = Column(DateTime, nullable=False)  # UTC; gün kovaları Türkiye gece yarısından başlar
+    dimension = Column(String(10), nullable=False)  # total, type, category, symbol
+    key = Column(String(50), nullable=False)
+    count = Column(Integer, default=0, nullable=False)
+
 class TradeHistory(Base):
     __tablename__ = "trade_history"
     
@@ -99,6 +127,16 @@ class TradeHistory(Base):
     trade_percentage = Column(Float, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class BotLease(Base):
+    __tablename__ = "bot_leases"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(50), unique=True, index=True, nullable=False)
+    holder = Column(String(100))  # Lease sahibi instance
+    expires_at = Column(Float, default=0)  # Epoch saniye
+    term = Column(Integer, default=0)  # Her lider değişiminde artar
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class BotLog(Base):
     __tablename__ = "bot_logs"
     
@@ -0,0 +1,156 @@
+"""
+Emit köprüsü - Bot ve yardımcı thread'lerin socket olaylarını sunucunun kendi görevinden gönderir
+
+Çağıran sadece kuyruğa ekler ve devam eder; gönderim `socketio.start_background_task` ile açılan tek görevde
+yapılır. Böylece eventlet modunda hub dışı thread'lerden emit edilmez, threading modunda da borsa veya
+Telegram isteği yapan thread yavaş istemcileri beklemez. Kuyrukta bekleme süreleri gecikme istatistiğine yazılır.
+"""
+
+import queue
+import threading
+import time
+import numpy as np
+from collections import deque
+from typing import Dict, Optional
+
+class EmitBridge:
+    def __init__(self, socketio, window: int = 1000):
+        self.socketio = socketio
+        self._queue = queue.Queue()  # eventlet modunda monkey_patch ile yeşil kuyruk
+        self._latencies = deque(maxlen=window)  # Kuyruğa ekleme -> emit bitişi (saniye)
+        self._started = False
+        self._start_lock = threading.Lock()
+
+        # Sayaçlar
+        self.sent = 0
+        self.failed = 0
+
+    def start(self):
+        """Gönderim görevini başlatır - sunucu başlarken ana thread'den çağrılır, tekrar çağrılırsa bir şey yapmaz"""
+        with self._start_lock:
+            if not self._started:
+                self._started = True
+                self.socketio.start_background_task(self._run)
+
+    def emit(self, event: str, data, to: Optional[str] = None):
+        """Her thread'den çağrılabilir, beklemez - start() çağrılana kadar olaylar kuyrukta bekler"""
+        self._queue.put_nowait((time.perf_counter(), event, data, to))
+
+    def _run(self):
+        while True:
+            queued_at, event, data, to = self._queue.get()
+            try:
+                self.socketio.emit(event, data, to=to)
+                self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"❌ Socket emit hatası ({event}): {e}")
+            self._latencies.append(time.perf_counter() - queued_at)
+
+    def stats(self) -> Dict:
+        latencies = np.array(self._latencies) * 1000
+        stats = {
+            'sent': self.sent,
+            'failed': self.failed,
+            'pending': self._queue.qsize(),
+        }
+        if len(latencies):
+            stats['p50_ms'] = round(float(np.percentile(latencies, 50)), 2)
+            stats['p99_ms'] = round(float(np.percentile(latencies, 99)), 2)
+            stats['max_ms'] = round(float(latencies.max()), 2)
+        return stats
+
+def _benchmark(async_mode: str = 'threading', events: int = 300, interval: float = 0.005, io_latency: float = 0.2,
+               web_workers: int = 4):
+    """Sinyal hazır -> istemciye ulaşma süresi; boşta ve borsa/Telegram G/Ç'si ile web yükü altında.
+    eventlet modu monkey_patch gerektirir - `python emit_bridge.py eventlet` ile ayrı süreçte çalıştırılır."""
+    import requests
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from flask import Flask, jsonify
+    from flask_socketio import SocketIO
+
+    class SlowAPI(BaseHTTPRequestHandler):
+        # Borsa/Telegram yerine io_latency gecikmeyle yanıt veren yerel sunucu
+        def do_GET(self):
+            time.sleep(io_latency)
+            self.send_response(200)
+            self.send_header('Content-Length', '2')
+            self.end_headers()
+            self.wfile.write(b'{}')
+
+        def log_message(self, *args):
+            pass
+
+    api = ThreadingHTTPServer(('127.0.0.1', 0), SlowAPI)
+    threading.Thread(target=api.serve_forever, daemon=True).start()
+    api_url = f"http://127.0.0.1:{api.server_address[1]}/"
+
+    def run(load: bool) -> np.ndarray:
+        app = Flask(__name__)
+        socketio = SocketIO(app, async_mode=async_mode)
+        bridge = EmitBridge(socketio)
+        bridge.start()
+        stop = threading.Event()
+
+        @app.route('/payload')
+        def payload():
+            return jsonify({'rows': [{'symbol': f"C{i}", 'value': i * 1.5} for i in range(200)]})
+
+        def web_load():
+            client = app.test_client()
+            while not stop.is_set():
+                client.get('/payload')
+                time.sleep(0)  # eventlet modunda G/Ç'siz döngü hub'a sıra vermez
+
+        def blocking_io():
+            # Bot thread'leri gibi: bloklayan requests çağrısı, bekleme ve sonucu işleme
+            session = requests.Session()
+            while not stop.is_set():
+                session.get(api_url, timeout=5)
+                time.sleep(io_latency)
+                np.sort(np.random.default_rng().random(200_000))
+
+        socket_client = socketio.test_client(app)
+        socket_client.get_received()
+        if load:
+            for target, count in ((web_load, web_workers), (blocking_io, 4)):
+                for _ in range(count):
+                    threading.Thread(target=target, daemon=True).start()
+
+        def producer():
+            for index in range(events):
+                bridge.emit('new_signal', {'index': index, 'ready_at': time.perf_counter()})
+                time.sleep(interval)
+
+        threading.Thread(target=producer, daemon=True).start()
+        latencies = []
+        deadline = time.perf_counter() + events * interval + 30
+        while len(latencies) < events and time.perf_counter() < deadline:
+            for packet in socket_client.get_received():
+                latencies.append(time.perf_counter() - packet['args'][0]['ready_at'])
+            time.sleep(0.0005)
+        stop.set()
+        socket_client.disconnect()
+        return np.array(latencies) * 1000
+
+    print(f"📡 {async_mode}: {events} olay, {interval * 1000:.0f} ms aralık, G/Ç {io_latency * 1000:.0f} ms, "
+          f"{web_workers} web thread'i")
+    print(f"{'durum':>8} {'p50 (ms)':>9} {'p99 (ms)':>9} {'max (ms)':>9} {'ulaşan':>7}")
+    for label, load in (('boşta', False), ('yük', True)):
+        latencies = run(load)
+        print(f"{label:>8} {np.percentile(latencies, 50):>9.2f} {np.percentile(latencies, 99):>9.2f} "
+              f"{latencies.max():>9.2f} {len(latencies):>7}")
+    api.shutdown()
+
+if __name__ == "__main__":
+    # python emit_bridge.py [threading|eventlet] - mod verilmezse ikisi de ayrı süreçlerde çalışır
+    import sys
+    if len(sys.argv) > 1:
+        if sys.argv[1] == 'eventlet':
+            import eventlet
+            eventlet.monkey_patch()
+        _benchmark(sys.argv[1])
+    else:
+        import subprocess
+        for mode in ('threading', 'eventlet'):
+            subprocess.run([sys.executable, __file__, mode], check=True)
@@ -0,0 +1,64 @@
+"""
+Uyarlanır takip zamanlaması - Tetik eşiğine yakın coinler sık, uzak olanlar seyrek kontrol edilir
+
+Bir sonraki kontrol, en yakın tetiğe (sonraki sinyal eşiği veya düşüş eşiği) kalan mesafenin
+son değişim hızına bölünmesiyle tahmin edilir. Tüm takip istekleri ortak bir hız bütçesini paylaşır.
+"""
+
+from typing import Callable, List
+from config import Config
+from tracker_store import CoinTracker
+
+class FollowupScheduler:
+    def __init__(self, next_threshold: Callable[[CoinTracker], float]):
+        self.next_threshold = next_threshold  # tracker -> bir sonraki sinyal yüzdesi
+        self.rate = Config.FOLLOWUP_REQUESTS_PER_SECOND
+        self.capacity = max(self.rate * 2, 1)
+        self._tokens = self.capacity
+        self._refilled_at = None  # Monotonic saniye
+
+        # Sayaçlar
+        self.checks = 0
+        self.deferred = 0
+
+    def observe(self, tracker: CoinTracker, change_percentage: float, now: float):
+        """Yeni ölçümle değişim hızını (yüzde puan / saniye) üstel ortalamayla günceller"""
+        if tracker.observed_at > 0 and now > tracker.observed_at:
+            speed = abs(change_percentage - tracker.observed_percentage) / (now - tracker.observed_at)
+            tracker.velocity = speed if tracker.velocity <= 0 else 0.5 * speed + 0.5 * tracker.velocity
+        tracker.observed_percentage = change_percentage
+        tracker.observed_at = now
+
+    def next_delay(self, tracker: CoinTracker, change_percentage: float) -> float:
+        """En yakın tetiğe tahmini süreye göre bir sonraki kontrol gecikmesi"""
+        settings = Config.RUNTIME
+        distance = min(self.next_threshold(tracker) - change_percentage, change_percentage - settings.drop_threshold)
+        distance = max(distance, 0.0)
+
+        if tracker.velocity > 0:
+            # Tetiğe varış süresinin yarısında tekrar bak
+            tracker.urgency = distance / tracker.velocity
+            delay = tracker.urgency / 2
+        else:
+            # Hız henüz bilinmiyor - sıralama için puan başına FOLLOWUP_INTERVAL saniye varsayılır
+            tracker.urgency = distance * settings.followup_interval
+            delay = settings.followup_interval
+
+        return min(max(delay, Config.FOLLOWUP_MIN_INTERVAL), Config.FOLLOWUP_MAX_INTERVAL)
+
+    def order(self, trackers: List[CoinTracker]) -> List[CoinTracker]:
+        """Vadesi gelenleri tetiğe en yakın olan önce sıralar"""
+        return sorted(trackers, key=lambda tracker: tracker.urgency)
+
+    def try_acquire(self, now: float) -> bool:
+        """Token bucket - global takip isteği bütçesi"""
+        if self._refilled_at is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+        if self._tokens < 1:
+            self.deferred += 1
+            return False
+        self._tokens -= 1
+        self.checks += 1
+        return True
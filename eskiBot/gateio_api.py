@@ -4,14 +4,19 @@ Gate.io API entegrasyonu
 
 import requests
 import json
+import time
 from typing import Dict, List, Optional
 from datetime import datetime
 from config import Config
+from market_recorder import create_recorder
+from candle_cache import CandleCache, VALUE_COLUMNS
 
 class GateioAPI:
-    def __init__(self):
+    def __init__(self, recorder=None):
         self.base_url = Config.GATEIO_BASE_URL
         self.session = requests.Session()
+        self.recorder = recorder or create_recorder(Config.RECORD_DIR)  # Replay için kayıt
+        self.candle_cache = CandleCache(self._fetch_candle_rows)
         
     def get_all_tickers(self) -> Optional[List[Dict]]:
         """Tüm coinlerin fiyat bilgilerini çeker"""
@@ -37,6 +42,9 @@ class GateioAPI:
                     continue
                     
                 filtered_tickers.append(ticker)
+            
+            if self.recorder:
+                self.recorder.record_tickers(filtered_tickers, time.time())
                 
             return filtered_tickers
             
@@ -76,7 +84,11 @@ class GateioAPI:
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
-            return response.json()
+            trades = response.json()
+            if self.recorder:
+                self.recorder.record_trades(currency_pair, trades, time.time())
+            
+            return trades
             
         except requests.exceptions.RequestException as e:
             print(f"Trade history hatası ({currency_pair}): {e}")
@@ -85,6 +97,26 @@ class GateioAPI:
             print(f"Beklenmeyen hata ({currency_pair}): {e}")
             return None
     
+    def get_order_book(self, currency_pair: str, limit: int = 50) -> Optional[Dict]:
+        """Emir defteri derinliğini çeker - bids/asks: [[fiyat, miktar], ...]"""
+        try:
+            url = f"{self.base_url}/spot/order_book"
+            params = {
+                "currency_pair": currency_pair,
+                "limit": limit
+            }
+            response = self.session.get(url, params=params, timeout=5)
+            response.raise_for_status()
+            
+            return response.json()
+            
+        except requests.exceptions.RequestException as e:
+            print(f"Order book hatası ({currency_pair}): {e}")
+            return None
+        except Exception as e:
+            print(f"Beklenmeyen hata ({currency_pair}): {e}")
+            return None
+    
     def get_volume_data(self, currency_pair: str) -> Optional[Dict]:
         """Hacim ve fiyat değişim bilgilerini çeker"""
         try:
@@ -146,49 +178,52 @@ class GateioAPI:
     
     def get_volume_category(self, volume: float) -> str:
         """Hacim kategorisini belirler"""
-        if volume < Config.LOW_VOLUME_THRESHOLD:
+        settings = Config.RUNTIME
+        if volume < settings.low_volume_threshold:
             return "--- Düşük Hacim ---"
-        elif volume < Config.MEDIUM_VOLUME_THRESHOLD:
+        elif volume < settings.medium_volume_threshold:
             return "--- Orta Hacim ---"
         else:
             return "--- Yüksek Hacim ---"
     
     def get_candles(self, symbol: str, interval: str = '15m', limit: int = 100) -> Optional[List[Dict]]:
-        """Belirli bir coin için mum verilerini çeker"""
+        """Belirli bir coin için mum verilerini çeker - önbellekten, sadece yeni mumlar istenir"""
+        columns = self.get_candle_arrays(symbol, interval, limit)
+        if columns is None:
+            return None
+        
+        times = columns['t'].tolist()
+        values = {name: columns[name].tolist() for name in VALUE_COLUMNS}
+        return [{
+            't': times[i],
+            'v': values['v'][i],
+            'c': values['c'][i],
+            'h': values['h'][i],
+            'l': values['l'][i],
+            'o': values['o'][i]
+        } for i in range(len(times))]
+    
+    def get_candle_arrays(self, symbol: str, interval: str = '15m', limit: int = 100,
+                          closed_only: bool = False) -> Optional[Dict]:
+        """Mumları t/o/h/l/c/v numpy sütunları olarak döndürür; closed_only ile açık son mum hariç"""
         try:
-            currency_pair = f"{symbol}_USDT"
-            url = f"{self.base_url}/spot/candlesticks"
-            
-            params = {
-                'currency_pair': currency_pair,
-                'interval': interval,
-                'limit': limit
-            }
-            
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Gate.io mum formatı: [timestamp, volume, close, high, low, open]
-            candles = []
-            for candle_data in data:
-                if len(candle_data) >= 6:
-                    candle = {
-                        't': int(candle_data[0]),  # timestamp
-                        'v': float(candle_data[1]),  # volume
-                        'c': float(candle_data[2]),  # close
-                        'h': float(candle_data[3]),  # high
-                        'l': float(candle_data[4]),  # low
-                        'o': float(candle_data[5])   # open
-                    }
-                    candles.append(candle)
-            
-            return candles
-            
+            return self.candle_cache.get(f"{symbol}_USDT", interval, limit, time.time(), closed_only)
         except requests.exceptions.RequestException as e:
             print(f"Candles API hatası ({symbol}): {e}")
             return None
         except Exception as e:
             print(f"Candles beklenmeyen hata ({symbol}): {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def get_cached_candle_arrays(self, symbol: str, interval: str) -> Optional[Dict]:
+        """Önbellekte varsa mum sütunlarını istek yapmadan döndürür"""
+        return self.candle_cache.peek(f"{symbol}_USDT", interval)
+    
+    def _fetch_candle_rows(self, currency_pair: str, interval: str, params: Dict) -> List[List]:
+        """Ham mum satırlarını çeker - params ya limit ya da from/to içerir"""
+        url = f"{self.base_url}/spot/candlesticks"
+        
+        # Gate.io mum formatı: [timestamp, volume, close, high, low, open]
+        response = self.session.get(url, params=dict(params, currency_pair=currency_pair, interval=interval), timeout=10)
+        response.raise_for_status()
+        return response.json()
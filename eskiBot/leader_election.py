@@ -0,0 +1,179 @@
+"""
+Lider seçimi - Birden fazla instance çalıştığında sadece birinin taramasını sağlar
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import Optional
+from sqlalchemy import update, or_
+from sqlalchemy.exc import IntegrityError
+from config import Config
+from database import engine, Base, BotLease, get_db_session
+
+class LeaderElection:
+    def __init__(self, name: str = 'scanner', backend: str = None, instance_id: str = None):
+        self.name = name
+        self.backend = backend or Config.LEADER_ELECTION
+        self.instance_id = instance_id or os.getenv('RAILWAY_REPLICA_ID') or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_ttl = Config.LEADER_LEASE_TTL
+        self.is_leader = False
+        self.term = 0
+        self._lock_file = None
+        self._lease_deadline = 0.0  # Monotonic - bu andan sonra lease başkasına geçmiş olabilir
+        self._acquire_lock = threading.Lock()  # Döngü ve yenileme thread'i aynı anda yazmasın
+        self._renewal_stop = threading.Event()
+        self._renewal_thread = None
+
+        if self.backend == 'db':
+            Base.metadata.create_all(bind=engine)
+            self._ensure_lease_row()
+
+    def try_acquire(self) -> bool:
+        """Lease'i alır veya yeniler, lider olup olmadığını döndürür"""
+        with self._acquire_lock:
+            started = time.monotonic()  # Lease süresi isteğin başından sayılır
+            try:
+                if self.backend == 'file':
+                    self.is_leader = self._try_file_lock()
+                elif self.backend == 'db':
+                    self.is_leader = self._try_db_lease()
+                else:
+                    self.is_leader = True
+            except Exception as e:
+                print(f"❌ Lider seçimi hatası: {e}")
+                self.is_leader = False
+
+            if not self.is_leader:
+                self._lease_deadline = 0.0
+            elif self.backend == 'db':
+                self._lease_deadline = started + self.lease_ttl
+            else:
+                self._lease_deadline = float('inf')  # Dosya kilidi süreç yaşadıkça geçerli
+            return self.is_leader
+
+    def holds_lease(self) -> bool:
+        """Lider ve lease süresi dolmamış - sinyal göndermeden ve DB'ye yazmadan önce kontrol edilir"""
+        return self.is_leader and time.monotonic() < self._lease_deadline
+
+    def start_renewal(self, interval: float = None):
+        """Lider iken lease'i ayrı thread'de yeniler - uzun tarama turları lease'i düşürmez"""
+        if self._renewal_thread is not None and self._renewal_thread.is_alive():
+            return
+        interval = interval or Config.LEADER_RENEW_INTERVAL
+        self._renewal_stop.clear()
+
+        def renew():
+            while not self._renewal_stop.wait(interval):
+                if self.is_leader and not self.try_acquire():
+                    print(f"⚠️ Lease yenilenemedi ({self.instance_id})")
+
+        self._renewal_thread = threading.Thread(target=renew, name='lease-renewal', daemon=True)
+        self._renewal_thread.start()
+
+    def stop_renewal(self):
+        self._renewal_stop.set()
+        if self._renewal_thread is not None:
+            self._renewal_thread.join(timeout=5)
+            self._renewal_thread = None
+
+    def release(self):
+        """Lease'i bırakır - standby instance hemen devralabilir"""
+        self.stop_renewal()
+        if not self.is_leader:
+            return
+
+        try:
+            if self.backend == 'file' and self._lock_file:
+                import fcntl
+                fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                self._lock_file.close()
+                self._lock_file = None
+            elif self.backend == 'db':
+                db = get_db_session()
+                try:
+                    db.execute(
+                        update(BotLease)
+                        .where(BotLease.name == self.name, BotLease.holder == self.instance_id)
+                        .values(expires_at=0)
+                    )
+                    db.commit()
+                finally:
+                    db.close()
+        except Exception as e:
+            print(f"❌ Lease bırakma hatası: {e}")
+        finally:
+            self.is_leader = False
+            self._lease_deadline = 0.0
+
+    def _ensure_lease_row(self):
+        """Lease satırı yoksa oluşturur"""
+        db = get_db_session()
+        try:
+            if db.query(BotLease).filter(BotLease.name == self.name).first() is None:
+                db.add(BotLease(name=self.name, holder=None, expires_at=0, term=0))
+                db.commit()
+        except IntegrityError:
+            # Başka bir instance aynı anda oluşturdu
+            db.rollback()
+        finally:
+            db.close()
+
+    def _try_db_lease(self) -> bool:
+        """Koşullu UPDATE ile lease alır - sadece sahibi veya süresi dolmuşsa başarılı olur"""
+        now = time.time()
+        db = get_db_session()
+        try:
+            # Kendi lease'imizi yenile
+            result = db.execute(
+                update(BotLease)
+                .where(BotLease.name == self.name, BotLease.holder == self.instance_id, BotLease.expires_at >= now)
+                .values(expires_at=now + self.lease_ttl)
+            )
+
+            if result.rowcount == 0:
+                # Süresi dolmuş lease'i devral, term'i artır
+                result = db.execute(
+                    update(BotLease)
+                    .where(BotLease.name == self.name, or_(BotLease.expires_at < now, BotLease.holder.is_(None)))
+                    .values(holder=self.instance_id, expires_at=now + self.lease_ttl, term=BotLease.term + 1)
+                )
+
+            db.commit()
+
+            if result.rowcount != 1:
+                return False
+
+            lease = db.query(BotLease).filter(BotLease.name == self.name).first()
+            self.term = lease.term if lease else self.term
+            return True
+
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _try_file_lock(self) -> bool:
+        """Yerel dosya kilidi - tek makinede DB'siz alternatif"""
+        if self._lock_file:
+            return True
+
+        import fcntl
+        lock_file = open(Config.LEADER_LOCK_FILE, 'a+')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._lock_file = lock_file
+        self.term += 1
+        return True
+
+def create_leader_election() -> Optional[LeaderElection]:
+    """Config'e göre lider seçimi oluşturur, kapalıysa None döndürür"""
+    if Config.LEADER_ELECTION == 'off':
+        return None
+    return LeaderElection()
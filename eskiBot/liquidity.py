@@ -0,0 +1,179 @@
+"""
+Likidite kapısı - Sinyal adaylarının emir defteri derinliğinden spread ve kayma hesaplar
+
+Derinlik istekleri aday listesi için aynı anda başlatılır ve parite başına kısa süre önbelleklenir;
+zenginleştirme sırasında sonuç beklenir, zaman aşımında sinyal likidite bilgisi olmadan devam eder.
+"""
+
+import threading
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Dict, List, Optional, Tuple
+from config import Config
+
+def parse_levels(levels: List[List]) -> np.ndarray:
+    """[[fiyat, miktar], ...] -> (n, 2) float dizi"""
+    rows = [level[:2] for level in levels or [] if len(level) >= 2]
+    if not rows:
+        return np.empty((0, 2), dtype=np.float64)
+    return np.array(rows, dtype=np.float64)
+
+def _walk_slippage(levels: np.ndarray, notional: float, mid: float) -> Optional[float]:
+    """`notional` USDT'lik piyasa emrinin ortalama dolum fiyatının orta fiyattan sapması (%); derinlik yetmezse None"""
+    prices, amounts = levels[:, 0], levels[:, 1]
+    cumulative = np.cumsum(prices * amounts)
+    if not len(cumulative) or cumulative[-1] < notional:
+        return None
+    index = int(np.searchsorted(cumulative, notional, side='left'))
+    filled = cumulative[index - 1] if index else 0.0
+    base_amount = amounts[:index].sum() + (notional - filled) / prices[index]
+    return float(abs(notional / base_amount / mid - 1) * 100)
+
+def compute_liquidity(bids: np.ndarray, asks: np.ndarray, notional: float = None,
+                      depth_range: float = None) -> Optional[Dict]:
+    """Spread, alış/satış kayması ve orta fiyata yakın derinlik (USDT)"""
+    notional = notional or Config.LIQUIDITY_NOTIONAL
+    depth_range = depth_range if depth_range is not None else Config.LIQUIDITY_DEPTH_RANGE
+    if not len(bids) or not len(asks):
+        return None
+
+    best_bid, best_ask = float(bids[0, 0]), float(asks[0, 0])
+    mid = (best_bid + best_ask) / 2
+    if mid <= 0:
+        return None
+
+    bid_depth = bids[bids[:, 0] >= mid * (1 - depth_range / 100)]
+    ask_depth = asks[asks[:, 0] <= mid * (1 + depth_range / 100)]
+    spread = float((best_ask - best_bid) / mid * 100)
+    buy_slippage = _walk_slippage(asks, notional, mid)
+    sell_slippage = _walk_slippage(bids, notional, mid)
+
+    reasons = []
+    if spread > Config.LIQUIDITY_MAX_SPREAD:
+        reasons.append(f"spread %{spread:.2f}")
+    for side, slippage in (('alış', buy_slippage), ('satış', sell_slippage)):
+        if slippage is None:
+            reasons.append(f"{side} derinliği yetersiz")
+        elif slippage > Config.LIQUIDITY_MAX_SLIPPAGE:
+            reasons.append(f"{side} kayması %{slippage:.2f}")
+
+    return {
+        'notional': notional,
+        'spread': spread,
+        'buy_slippage': buy_slippage,
+        'sell_slippage': sell_slippage,
+        'bid_depth': float((bid_depth[:, 0] * bid_depth[:, 1]).sum()),
+        'ask_depth': float((ask_depth[:, 0] * ask_depth[:, 1]).sum()),
+        'tradeable': not reasons,
+        'reasons': reasons,
+    }
+
+class LiquidityGate:
+    def __init__(self, gateio_api, clock, max_workers: int = None):
+        self.gateio_api = gateio_api
+        self.clock = clock
+        self.ttl = Config.LIQUIDITY_CACHE_TTL
+        self.timeout = Config.LIQUIDITY_TIMEOUT
+        self.suppress = Config.LIQUIDITY_MODE == 'suppress'
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or Config.LIQUIDITY_WORKERS,
+                                            thread_name_prefix='liquidity')
+        self._books: Dict[str, Tuple[float, Future]] = {}  # parite -> (istek zamanı, derinlik future)
+        self._lock = threading.Lock()
+
+        # Sayaçlar
+        self.fetches = 0
+        self.hits = 0
+        self.timeouts = 0
+
+    def prefetch(self, currency_pairs: List[str]):
+        """Önbellekte taze derinliği olmayan tüm pariteler için istekleri aynı anda başlatır"""
+        for currency_pair in currency_pairs:
+            self._book_future(currency_pair)
+
+    def assess(self, currency_pair: str) -> Optional[Dict]:
+        """Paritenin likidite metrikleri - derinlik zamanında gelmezse None"""
+        try:
+            book = self._book_future(currency_pair).result(timeout=self.timeout)
+        except TimeoutError:
+            self.timeouts += 1
+            print(f"⏳ {currency_pair} emir defteri zaman aşımı")
+            return None
+        except Exception as e:
+            print(f"❌ {currency_pair} emir defteri hatası: {e}")
+            return None
+        if book is None:
+            return None
+        return compute_liquidity(parse_levels(book.get('bids')), parse_levels(book.get('asks')))
+
+    def _book_future(self, currency_pair: str) -> Future:
+        now = self.clock.monotonic()
+        with self._lock:
+            cached = self._books.get(currency_pair)
+            if cached is not None and now - cached[0] < self.ttl:
+                self.hits += 1
+                return cached[1]
+            future = self._executor.submit(self.gateio_api.get_order_book, currency_pair, Config.LIQUIDITY_BOOK_LIMIT)
+            self._books[currency_pair] = (now, future)
+            self.fetches += 1
+            # Süresi dolanları temizle
+            if len(self._books) > 256:
+                self._books = {pair: entry for pair, entry in self._books.items() if now - entry[0] < self.ttl}
+            return future
+
+    def stats(self) -> Dict:
+        return {
+            'fetches': self.fetches,
+            'hits': self.hits,
+            'timeouts': self.timeouts,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+def _benchmark(fetch_latency: float = 0.3, sizes=(1, 5, 10, 20, 40)):
+    """Aday sayısı arttıkça sıralı vs paralel derinlik kontrolü süresi"""
+    import time
+    from clock import SystemClock
+
+    rng = np.random.default_rng(5)
+
+    class SlowAPI:
+        def get_order_book(self, currency_pair: str, limit: int) -> Dict:
+            time.sleep(fetch_latency)
+            price = 1.0
+            return {
+                'bids': [[str(price * (1 - 0.001 * i)), str(rng.uniform(50, 500))] for i in range(1, limit + 1)],
+                'asks': [[str(price * (1 + 0.001 * i)), str(rng.uniform(50, 500))] for i in range(1, limit + 1)],
+            }
+
+    api = SlowAPI()
+    print(f"💧 Derinlik isteği {fetch_latency * 1000:.0f} ms, {Config.LIQUIDITY_WORKERS} worker, "
+          f"zaman aşımı {Config.LIQUIDITY_TIMEOUT * 1000:.0f} ms")
+    print(f"{'aday':>6} {'sıralı (s)':>12} {'paralel (s)':>12} {'yanıt':>6}")
+    for size in sizes:
+        pairs = [f"C{i}_USDT" for i in range(size)]
+
+        started = time.perf_counter()
+        for pair in pairs:
+            book = api.get_order_book(pair, Config.LIQUIDITY_BOOK_LIMIT)
+            compute_liquidity(parse_levels(book['bids']), parse_levels(book['asks']))
+        sequential = time.perf_counter() - started
+
+        gate = LiquidityGate(api, SystemClock())
+        started = time.perf_counter()
+        gate.prefetch(pairs)
+        answered = sum(gate.assess(pair) is not None for pair in pairs)
+        parallel = time.perf_counter() - started
+        gate.shutdown()
+
+        print(f"{size:>6} {sequential:>12.2f} {parallel:>12.2f} {answered:>6}")
+
+    bids = np.column_stack([1 - 0.001 * np.arange(1, 101), rng.uniform(50, 500, 100)])
+    asks = np.column_stack([1 + 0.001 * np.arange(1, 101), rng.uniform(50, 500, 100)])
+    started = time.perf_counter()
+    for _ in range(1000):
+        compute_liquidity(bids, asks)
+    print(f"   metrik hesabı: {(time.perf_counter() - started):.3f} ms / aday")
+
+if __name__ == "__main__":
+    _benchmark()
@@ -4,15 +4,22 @@ Gate.io Sinyal Botu - Entegre Versiyon
 Bot ve web arayüzü aynı anda çalışır
 """
 
+from config import Config
+
+# eventlet modunda web sunucusu ve aynı süreçteki bot thread'i yeşillendirilir - diğer importlardan önce.
+# Sadece giriş noktasında: process modunda spawn edilen bot süreci bu dosyayı __mp_main__ olarak import eder,
+# monkey_patch yapmaz ve web uygulamasını yüklemez
+if __name__ == '__main__' and Config.WEB_ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
 import threading
 import time
-from signal_manager import SignalManager
-from gateio_api import GateioAPI
-from config import Config
-from web_app import web_data, start_web_server
 
 def main():
     """Ana fonksiyon - bot ve web'i başlatır"""
+    from web_app import web_data, create_signal_manager, launch_bot_process, start_web_server
+    
     print("=" * 60)
     print("🚀 GATE.IO SİNYAL BOTU - ENTEGRE VERSİYON")
     print("=" * 60)
@@ -23,20 +30,19 @@ def main():
     print("=" * 60)
     
     try:
-        # Gate.io API başlat
-        gateio = GateioAPI()
-        
-        # Signal Manager başlat
-        signal_manager = SignalManager(gateio)
-        
-        # Web veri yöneticisine signal manager'ı bağla
-        web_data['signal_manager'] = signal_manager
-        
         print("🤖 Signal bot başlatılıyor...")
         
-        # Bot'u ayrı thread'de başlat
-        bot_thread = threading.Thread(target=signal_manager.start_monitoring, daemon=True)
-        bot_thread.start()
+        if Config.BOT_PROCESS_MODE == 'process':
+            # Bot ayrı süreçte - tarama ve web istekleri GIL için yarışmaz
+            launch_bot_process().command('start')
+        else:
+            # Web uygulaması aynı signal manager'ın görüntüsünü ve callback'lerini kullanır
+            signal_manager = create_signal_manager()
+            web_data['bot_status'] = 'running'
+            
+            # Bot'u ayrı thread'de başlat
+            bot_thread = threading.Thread(target=signal_manager.start_monitoring, daemon=True)
+            bot_thread.start()
         
         print("🌐 Web sunucusu başlatılıyor...")
         
@@ -0,0 +1,257 @@
+"""
+Piyasa kaydedici - Ticker ve trade verilerini replay için append-only dosyalara yazar
+
+Dosya formatı (günlük, market-YYYYMMDD.rec):
+    Her kayıt: başlık <BdI (tür, epoch zaman, adet) + veri
+    SYMBOL:  adet = isim uzunluğu, veri = UTF-8 parite adı (dosya içinde sıradaki id'yi alır)
+    TICKERS: adet = kayıt sayısı, veri = TICKER_DTYPE dizisi (sadece değişen pariteler)
+    TRADES:  adet = kayıt sayısı, veri = TRADE_DTYPE dizisi (sadece yeni trade'ler)
+"""
+
+import os
+import glob
+import json
+import struct
+import threading
+import numpy as np
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+KIND_SYMBOL = 1
+KIND_TICKERS = 2
+KIND_TRADES = 3
+
+HEADER = struct.Struct('<BdI')
+TICKER_DTYPE = np.dtype([('pair', '<u2'), ('last', '<f8'), ('change', '<f4'), ('volume', '<f4')])
+TRADE_DTYPE = np.dtype([('pair', '<u2'), ('time', '<f8'), ('price', '<f8'), ('amount', '<f8')])
+
+class MarketRecorder:
+    def __init__(self, record_dir: str):
+        self.record_dir = record_dir
+        os.makedirs(record_dir, exist_ok=True)
+        self._file = None
+        self._file_day = None
+        self._pair_ids: Dict[str, int] = {}
+        self._last_values: Dict[int, tuple] = {}
+        self._last_trade_ids: Dict[str, int] = {}  # Parite adıyla - id'ler dosyaya özel, gün değişiminde yeniden başlar
+        self._lock = threading.Lock()  # Trade'ler paralel zenginleştirme thread'lerinden gelir
+
+    def record_tickers(self, tickers: List[Dict], timestamp: float):
+        """Ticker snapshot'ını yazar - bir önceki snapshot'tan farklı olanları kaydeder"""
+        try:
+            with self._lock:
+                self._roll_file(timestamp)
+
+                rows = []
+                for ticker in tickers:
+                    pair_id = self._pair_id(ticker['currency_pair'], timestamp)
+                    values = (ticker.get('last'), ticker.get('change_percentage'), ticker.get('quote_volume'))
+                    if self._last_values.get(pair_id) == values:
+                        continue
+                    self._last_values[pair_id] = values
+                    rows.append((pair_id, float(values[0] or 0), float(values[1] or 0), float(values[2] or 0)))
+
+                self._write(KIND_TICKERS, timestamp, np.array(rows, dtype=TICKER_DTYPE))
+
+        except Exception as e:
+            print(f"❌ Ticker kayıt hatası: {e}")
+
+    def record_trades(self, currency_pair: str, trades: List[Dict], timestamp: float):
+        """Trade geçmişini yazar - daha önce kaydedilen trade'leri atlar"""
+        try:
+            with self._lock:
+                self._roll_file(timestamp)
+                pair_id = self._pair_id(currency_pair, timestamp)
+                last_id = self._last_trade_ids.get(currency_pair, 0)
+
+                rows = []
+                for trade in trades:
+                    trade_id = int(trade.get('id', 0))
+                    if trade_id <= last_id:
+                        continue
+                    trade_time = float(trade.get('create_time_ms', 0)) / 1000 or float(trade.get('create_time', 0))
+                    rows.append((pair_id, trade_time, float(trade.get('price', 0)), float(trade.get('amount', 0))))
+                    self._last_trade_ids[currency_pair] = max(self._last_trade_ids.get(currency_pair, 0), trade_id)
+
+                if rows:
+                    rows.sort(key=lambda row: row[1])
+                    self._write(KIND_TRADES, timestamp, np.array(rows, dtype=TRADE_DTYPE))
+
+        except Exception as e:
+            print(f"❌ Trade kayıt hatası ({currency_pair}): {e}")
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _roll_file(self, timestamp: float):
+        """Gün değiştiyse yeni dosyaya geçer - her dosya kendi sembol tablosunu taşır"""
+        day = datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y%m%d')
+        if day == self._file_day:
+            return
+
+        self.close()
+        path = os.path.join(self.record_dir, f"market-{day}.rec")
+        # Var olan dosyaya devam ediliyorsa sembol tablosu bilinmediğinden yeni parça açılır
+        if os.path.exists(path):
+            part = 1
+            while os.path.exists(os.path.join(self.record_dir, f"market-{day}-{part}.rec")):
+                part += 1
+            path = os.path.join(self.record_dir, f"market-{day}-{part}.rec")
+
+        self._file = open(path, 'ab')
+        self._file_day = day
+        self._pair_ids = {}
+        self._last_values = {}
+
+    def _pair_id(self, currency_pair: str, timestamp: float) -> int:
+        pair_id = self._pair_ids.get(currency_pair)
+        if pair_id is None:
+            pair_id = len(self._pair_ids)
+            self._pair_ids[currency_pair] = pair_id
+            name = currency_pair.encode('utf-8')
+            self._file.write(HEADER.pack(KIND_SYMBOL, timestamp, len(name)) + name)
+        return pair_id
+
+    def _write(self, kind: int, timestamp: float, rows: np.ndarray):
+        self._file.write(HEADER.pack(kind, timestamp, len(rows)) + rows.tobytes())
+        self._file.flush()
+
+class MarketRecording:
+    """Kayıt dosyalarını sütun dizilerine yükler"""
+
+    def __init__(self, pairs: List[str], snapshot_times: np.ndarray, snapshot_offsets: np.ndarray,
+                 tickers: np.ndarray, trades: np.ndarray):
+        self.pairs = pairs
+        self.snapshot_times = snapshot_times  # Her snapshot'ın epoch zamanı
+        self.snapshot_offsets = snapshot_offsets  # tickers içindeki başlangıç indeksleri (n+1)
+        self.tickers = tickers  # Global parite id'li delta kayıtları
+        self.trades = trades  # (pair, time) sıralı
+
+        # Parite bazında trade aralıkları
+        self.trade_offsets = np.searchsorted(trades['pair'], np.arange(len(pairs) + 1), side='left')
+
+    @property
+    def snapshot_count(self) -> int:
+        return len(self.snapshot_times)
+
+    @classmethod
+    def load(cls, path: str) -> 'MarketRecording':
+        """Bir dosyayı veya klasördeki tüm .rec dosyalarını zaman sırasıyla yükler"""
+        files = sorted(glob.glob(os.path.join(path, '*.rec'))) if os.path.isdir(path) else [path]
+
+        pairs: List[str] = []
+        global_ids: Dict[str, int] = {}
+        snapshot_times = []
+        ticker_chunks = []
+        trade_chunks = []
+
+        for file_path in files:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+
+            local_ids: List[int] = []
+            pos = 0
+            while pos + HEADER.size <= len(data):
+                kind, timestamp, count = HEADER.unpack_from(data, pos)
+                pos += HEADER.size
+
+                if kind == KIND_SYMBOL:
+                    if pos + count > len(data):
+                        break
+                    name = data[pos:pos + count].decode('utf-8')
+                    pos += count
+                    if name not in global_ids:
+                        global_ids[name] = len(pairs)
+                        pairs.append(name)
+                    local_ids.append(global_ids[name])
+                    continue
+
+                dtype = TICKER_DTYPE if kind == KIND_TICKERS else TRADE_DTYPE
+                size = count * dtype.itemsize
+                if pos + size > len(data):
+                    break  # Yarım kalmış son kayıt
+                rows = np.frombuffer(data, dtype=dtype, count=count, offset=pos).copy()
+                pos += size
+                rows['pair'] = np.asarray(local_ids, dtype=np.uint16)[rows['pair']] if count else rows['pair']
+
+                if kind == KIND_TICKERS:
+                    snapshot_times.append(timestamp)
+                    ticker_chunks.append(rows)
+                else:
+                    trade_chunks.append(rows)
+
+        lengths = np.array([len(chunk) for chunk in ticker_chunks], dtype=np.int64)
+        snapshot_offsets = np.zeros(len(ticker_chunks) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=snapshot_offsets[1:])
+
+        tickers = np.concatenate(ticker_chunks) if ticker_chunks else np.zeros(0, dtype=TICKER_DTYPE)
+        trades = np.concatenate(trade_chunks) if trade_chunks else np.zeros(0, dtype=TRADE_DTYPE)
+        trades = trades[np.lexsort((trades['time'], trades['pair']))]
+
+        return cls(pairs, np.array(snapshot_times, dtype=np.float64), snapshot_offsets, tickers, trades)
+
+    def save_arrays(self, cache_dir: str):
+        """Sütunları .npy olarak yazar - süreçler arasında memory-map ile paylaşım için"""
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, 'pairs.json'), 'w') as f:
+            json.dump(self.pairs, f)
+        for name in ('snapshot_times', 'snapshot_offsets', 'tickers', 'trades'):
+            np.save(os.path.join(cache_dir, f"{name}.npy"), getattr(self, name))
+
+    @classmethod
+    def load_arrays(cls, cache_dir: str, mmap: bool = True) -> 'MarketRecording':
+        """save_arrays çıktısını kopyalamadan (mmap) açar"""
+        mode = 'r' if mmap else None
+        with open(os.path.join(cache_dir, 'pairs.json')) as f:
+            pairs = json.load(f)
+        arrays = [np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode=mode)
+                  for name in ('snapshot_times', 'snapshot_offsets', 'tickers', 'trades')]
+        return cls(pairs, *arrays)
+
+    def price_series(self):
+        """Parite bazında zaman sıralı fiyat serisi: (offsets, times, prices)"""
+        counts = np.diff(self.snapshot_offsets)
+        times = np.repeat(self.snapshot_times, counts)
+        pairs = self.tickers['pair']
+        order = np.lexsort((times, pairs))
+        offsets = np.searchsorted(pairs[order], np.arange(len(self.pairs) + 1), side='left')
+        return offsets, times[order], self.tickers['last'][order]
+
+def create_recorder(record_dir: Optional[str]) -> Optional[MarketRecorder]:
+    """Kayıt klasörü verilmişse recorder oluşturur"""
+    return MarketRecorder(record_dir) if record_dir else None
+
+def _check_day_roll() -> bool:
+    """İki UTC gününe yazılan ticker ve trade'ler tekrar yüklendiğinde eksiksiz olmalı"""
+    import tempfile
+
+    day_one = datetime(2024, 1, 1, 23, 59, 50, tzinfo=timezone.utc).timestamp()
+    day_two = day_one + 20
+    with tempfile.TemporaryDirectory(prefix='market_recorder_') as directory:
+        recorder = MarketRecorder(directory)
+        recorder.record_tickers([{'currency_pair': 'A_USDT', 'last': '1', 'change_percentage': '2', 'quote_volume': '3'}],
+                                day_one)
+        recorder.record_trades('A_USDT', [{'id': 900000, 'create_time': day_one, 'price': '1', 'amount': '2'}], day_one)
+        recorder.record_tickers([{'currency_pair': 'B_USDT', 'last': '4', 'change_percentage': '5', 'quote_volume': '6'},
+                                 {'currency_pair': 'A_USDT', 'last': '1', 'change_percentage': '2', 'quote_volume': '3'}],
+                                day_two)
+        recorder.record_trades('B_USDT', [{'id': 5, 'create_time': day_two, 'price': '4', 'amount': '1'}], day_two)
+        # Aynı trade yeni günde tekrar gelirse yazılmamalı
+        recorder.record_trades('A_USDT', [{'id': 900000, 'create_time': day_one, 'price': '1', 'amount': '2'}], day_two)
+        recorder.close()
+
+        recording = MarketRecording.load(directory)
+        files = len(glob.glob(os.path.join(directory, '*.rec')))
+    trades = {(recording.pairs[row['pair']], float(row['price'])) for row in recording.trades}
+    passed = (files == 2 and recording.snapshot_count == 2 and len(recording.trades) == 2
+              and trades == {('A_USDT', 1.0), ('B_USDT', 4.0)})
+    print(f"{'✅' if passed else '❌'} gün değişimi: {files} dosya, {recording.snapshot_count} snapshot, "
+          f"trade'ler {sorted(trades)}")
+    return passed
+
+if __name__ == "__main__":
+    # python market_recorder.py - gün değişiminde kayıt kontrolü, hata varsa çıkış kodu 1
+    import sys
+    sys.exit(0 if _check_day_roll() else 1)
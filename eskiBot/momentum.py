@@ -0,0 +1,162 @@
+"""
+Çoklu zaman dilimi momentum - Son tarama snapshot'larını tutan 2 boyutlu ring buffer
+
+Satırlar parite, sütunlar snapshot'tır. Her taramada tüm pariteler için 1dk/5dk/15dk/1s getiri
+ve hacim ivmesi tek vektörel adımda hesaplanır. Sütunlar en az `resolution` aralıkla açılır; daha sık
+gelen taramalar son sütunu günceller, böylece buffer tarama hızından bağımsız olarak en uzun pencereyi kapsar.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+from config import Config
+from scan_cadence import fastest_scan_interval
+
+MOMENTUM_WINDOWS = {
+    '1m': 60,
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+}
+SAMPLE_SLACK = 0.8  # Tarama zamanlamasındaki sapma payı - aralığın %80'i geçtiyse yeni sütun
+
+def history_capacity(resolution: float) -> int:
+    """En uzun momentum ve küme penceresini `resolution` aralıklı sütunlarla kapsayan kapasite"""
+    horizon = max(max(MOMENTUM_WINDOWS.values()), Config.CLUSTER_WINDOW)
+    return int(np.ceil(horizon / (resolution * SAMPLE_SLACK))) + 2
+
+class TickerRingBuffer:
+    def __init__(self, capacity: int = None, initial_pairs: int = 2048, resolution: float = None):
+        self.resolution = resolution or fastest_scan_interval()  # Sütunlar arası en kısa süre (saniye)
+        required = history_capacity(self.resolution)
+        self.capacity = capacity or Config.MOMENTUM_HISTORY_SIZE or required
+        if self.capacity < required:
+            print(f"⚠️ Momentum buffer'ı {self.capacity} sütun, {self.resolution:.0f}s aralıkta en uzun pencere için "
+                  f"{required} gerekli - 1s momentum ve küme getirileri eksik kalabilir")
+        self.pairs: List[str] = []
+        self.pair_index: Dict[str, int] = {}
+        self.prices = np.full((initial_pairs, self.capacity), np.nan, dtype=np.float32)
+        self.volumes = np.full((initial_pairs, self.capacity), np.nan, dtype=np.float32)
+        self.times = np.full(self.capacity, np.nan, dtype=np.float64)
+        self.head = -1  # En son yazılan sütun
+        self._opened_at = None  # head sütununun açıldığı snapshot zamanı
+
+    def update(self, tickers: List[Dict], timestamp: float):
+        """Yeni ticker snapshot'ını bir sonraki sütuna yazar"""
+        rows = np.fromiter((self._row(ticker['currency_pair']) for ticker in tickers), dtype=np.int64, count=len(tickers))
+        prices = np.fromiter((float(ticker.get('last') or 0) for ticker in tickers), dtype=np.float32, count=len(tickers))
+        volumes = np.fromiter((float(ticker.get('quote_volume') or 0) for ticker in tickers), dtype=np.float32, count=len(tickers))
+        self.update_arrays(rows, prices, volumes, timestamp)
+
+    def update_arrays(self, rows: np.ndarray, prices: np.ndarray, volumes: np.ndarray, timestamp: float):
+        """Satır indeksleri hazır olan snapshot'ı yazar - `resolution` dolmadıysa son sütunun üzerine"""
+        if self.head < 0 or timestamp - self._opened_at >= self.resolution * SAMPLE_SLACK:
+            self.head = (self.head + 1) % self.capacity
+            self.prices[:, self.head] = np.nan
+            self.volumes[:, self.head] = np.nan
+            self._opened_at = timestamp
+        prices = np.where(prices > 0, prices, np.nan)
+        self.prices[rows, self.head] = prices
+        self.volumes[rows, self.head] = volumes
+        self.times[self.head] = timestamp
+
+    def compute(self) -> Dict[str, np.ndarray]:
+        """Tüm pariteler için getiri (%) ve hacim ivmesi dizileri; veri yoksa NaN"""
+        count = len(self.pairs)
+        result = {}
+        if self.head < 0:
+            empty = np.full(count, np.nan, dtype=np.float32)
+            return {**{name: empty for name in MOMENTUM_WINDOWS}, 'volume_accel': empty}
+
+        current_prices = self.prices[:count, self.head]
+        current_volumes = self.volumes[:count, self.head]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for name, window in MOMENTUM_WINDOWS.items():
+                column = self._column_at(self.times[self.head] - window)
+                if column is None:
+                    result[name] = np.full(count, np.nan, dtype=np.float32)
+                else:
+                    result[name] = (current_prices / self.prices[:count, column] - 1) * 100
+
+            # 24 saatlik kayan hacmin kısa ve uzun penceredeki artış hızı oranı
+            short_column = self._column_at(self.times[self.head] - MOMENTUM_WINDOWS['5m'])
+            long_column = self._column_at(self.times[self.head] - MOMENTUM_WINDOWS['1h'])
+            if short_column is None or long_column is None:
+                result['volume_accel'] = np.full(count, np.nan, dtype=np.float32)
+            else:
+                short_span = self.times[self.head] - self.times[short_column]
+                long_span = self.times[self.head] - self.times[long_column]
+                short_rate = (current_volumes - self.volumes[:count, short_column]) / short_span
+                long_rate = (current_volumes - self.volumes[:count, long_column]) / long_span
+                result['volume_accel'] = np.where(long_rate > 0, short_rate / long_rate, np.nan)
+
+        return result
+
+    def momentum_for(self, result: Dict[str, np.ndarray], currency_pair: str) -> Optional[Dict[str, float]]:
+        """compute() çıktısından tek paritenin değerlerini döndürür"""
+        row = self.pair_index.get(currency_pair)
+        if row is None:
+            return None
+        return {name: float(values[row]) for name, values in result.items() if not np.isnan(values[row])}
+
+    def _column_at(self, target_time: float) -> Optional[int]:
+        """target_time'da veya öncesindeki en yeni snapshot sütunu"""
+        with np.errstate(invalid='ignore'):
+            candidates = np.where(self.times <= target_time, self.times, -np.inf)
+        column = int(np.argmax(candidates))
+        if candidates[column] == -np.inf:
+            return None
+        return column
+
+    def _row(self, currency_pair: str) -> int:
+        row = self.pair_index.get(currency_pair)
+        if row is None:
+            row = len(self.pairs)
+            if row >= self.prices.shape[0]:
+                self._grow()
+            self.pair_index[currency_pair] = row
+            self.pairs.append(currency_pair)
+        return row
+
+    def _grow(self):
+        """Satır kapasitesini iki katına çıkarır"""
+        extra = self.prices.shape[0]
+        filler = np.full((extra, self.capacity), np.nan, dtype=np.float32)
+        self.prices = np.vstack([self.prices, filler])
+        self.volumes = np.vstack([self.volumes, filler])
+
+class MomentumDetector:
+    """Ring buffer üzerinden eşikleri aşan pariteleri bulur"""
+
+    def __init__(self, buffer: TickerRingBuffer = None):
+        self.buffer = buffer or TickerRingBuffer()
+        self.last_result: Dict[str, np.ndarray] = {}
+        self.thresholds = {
+            '1m': Config.MOMENTUM_1M_THRESHOLD,
+            '5m': Config.MOMENTUM_5M_THRESHOLD,
+            '15m': Config.MOMENTUM_15M_THRESHOLD,
+            '1h': Config.MOMENTUM_1H_THRESHOLD,
+        }
+
+    def update(self, tickers: List[Dict], timestamp: float) -> List[str]:
+        """Snapshot'ı ekler ve herhangi bir pencerede eşiği aşan pariteleri döndürür"""
+        self.buffer.update(tickers, timestamp)
+        return self.evaluate()
+
+    def evaluate(self) -> List[str]:
+        """Buffer'daki son snapshot için eşikleri vektörel olarak uygular"""
+        self.last_result = self.buffer.compute()
+
+        count = len(self.buffer.pairs)
+        hot = np.zeros(count, dtype=bool)
+        with np.errstate(invalid='ignore'):
+            for name, threshold in self.thresholds.items():
+                if threshold > 0:
+                    hot |= self.last_result[name] >= threshold
+            if Config.MOMENTUM_MIN_VOLUME_ACCEL > 0:
+                hot &= self.last_result['volume_accel'] >= Config.MOMENTUM_MIN_VOLUME_ACCEL
+
+        return [self.buffer.pairs[row] for row in np.flatnonzero(hot)]
+
+    def momentum_for(self, currency_pair: str) -> Optional[Dict[str, float]]:
+        return self.buffer.momentum_for(self.last_result, currency_pair)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Parametre taraması - Eşik kombinasyonlarını kayıtlı veri üzerinde paralel backtest eder
+
+Kullanım:
+    python param_sweep.py records/ --initial 30:50:5 --second 15,20,25 --next 5,10 --drop 20,25
+"""
+
+import os
+import sys
+import csv
+import time
+import argparse
+import itertools
+import tempfile
+import numpy as np
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+from config import Config
+from market_recorder import MarketRecording
+
+SWEEP_PARAMS = {
+    'initial': 'initial_pump_threshold',
+    'second': 'second_signal_threshold',
+    'next': 'next_signal_threshold',
+    'drop': 'drop_threshold',
+}
+
+# Worker süreç başına memory-map edilmiş veri
+_worker_data = {}
+
+def _init_worker(cache_dir: str):
+    """Worker başlangıcı - veriyi kopyalamadan mmap ile açar"""
+    _worker_data['recording'] = MarketRecording.load_arrays(cache_dir)
+    _worker_data['price_offsets'] = np.load(os.path.join(cache_dir, 'price_offsets.npy'), mmap_mode='r')
+    _worker_data['price_times'] = np.load(os.path.join(cache_dir, 'price_times.npy'), mmap_mode='r')
+    _worker_data['price_values'] = np.load(os.path.join(cache_dir, 'price_values.npy'), mmap_mode='r')
+
+def _price_at(pair_index: int, timestamp: float) -> float:
+    """Paritenin verilen zamandaki (veya öncesindeki son) fiyatı"""
+    offsets = _worker_data['price_offsets']
+    start, end = offsets[pair_index], offsets[pair_index + 1]
+    position = np.searchsorted(_worker_data['price_times'][start:end], timestamp, side='right') - 1
+    if position < 0:
+        return 0.0
+    return float(_worker_data['price_values'][start + position])
+
+def _run_config(params: Dict, horizon: float, false_positive_threshold: float) -> Dict:
+    """Tek bir parametre kombinasyonunu oynatır ve metrikleri döndürür"""
+    from backtest import BacktestEngine
+
+    Config.RUNTIME = replace(Config.RUNTIME, **{SWEEP_PARAMS[name]: value for name, value in params.items()})
+
+    recording = _worker_data['recording']
+    pair_index = {pair: i for i, pair in enumerate(recording.pairs)}
+    end_time = float(recording.snapshot_times[-1])
+
+    started = time.time()
+    signals = BacktestEngine(recording).run()
+
+    returns = []
+    for signal in signals:
+        if signal['signal_type'] != 'new' or signal['time'] + horizon > end_time:
+            continue
+        index = pair_index.get(f"{signal['symbol']}_USDT")
+        future_price = _price_at(index, signal['time'] + horizon) if index is not None else 0.0
+        if signal['price'] > 0 and future_price > 0:
+            returns.append((future_price / signal['price'] - 1) * 100)
+
+    returns = np.array(returns)
+    evaluated = len(returns)
+    return dict(
+        params,
+        signals=len(signals),
+        new_signals=sum(1 for signal in signals if signal['signal_type'] == 'new'),
+        evaluated=evaluated,
+        mean_return=float(returns.mean()) if evaluated else 0.0,
+        median_return=float(np.median(returns)) if evaluated else 0.0,
+        hit_rate=float((returns > 0).mean() * 100) if evaluated else 0.0,
+        false_positives=int((returns < false_positive_threshold).sum()),
+        seconds=time.time() - started
+    )
+
+def prepare_cache(path: str, cache_dir: str) -> MarketRecording:
+    """Kayıtları bir kez yükleyip mmap edilebilir .npy dosyalarına yazar"""
+    recording = MarketRecording.load(path)
+    recording.save_arrays(cache_dir)
+    offsets, times, prices = recording.price_series()
+    np.save(os.path.join(cache_dir, 'price_offsets.npy'), offsets)
+    np.save(os.path.join(cache_dir, 'price_times.npy'), times)
+    np.save(os.path.join(cache_dir, 'price_values.npy'), prices)
+    return recording
+
+def parse_values(text: str) -> List[float]:
+    """'30,35,40' veya 'başlangıç:bitiş:adım' formatını listeye çevirir"""
+    if ':' in text:
+        start, stop, step = (float(part) for part in text.split(':'))
+        return [round(value, 6) for value in np.arange(start, stop + step / 2, step)]
+    return [float(part) for part in text.split(',')]
+
+def build_grid(args) -> List[Dict]:
+    names = [name for name in SWEEP_PARAMS if getattr(args, name)]
+    values = [parse_values(getattr(args, name)) for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+def run_sweep(cache_dir: str, grid: List[Dict], workers: int, horizon: float,
+              false_positive_threshold: float) -> List[Dict]:
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cache_dir,)) as pool:
+        futures = [pool.submit(_run_config, params, horizon, false_positive_threshold) for params in grid]
+        return [future.result() for future in futures]
+
+def print_table(results: List[Dict], columns: List[str], limit: int):
+    widths = {column: max(len(column), 10) for column in columns}
+    print("  ".join(column.rjust(widths[column]) for column in columns))
+    for row in results[:limit]:
+        cells = []
+        for column in columns:
+            value = row[column]
+            text = f"{value:.2f}" if isinstance(value, float) else str(value)
+            cells.append(text.rjust(widths[column]))
+        print("  ".join(cells))
+
+def main():
+    parser = argparse.ArgumentParser(description='Eşik parametre taraması')
+    parser.add_argument('path', help='.rec dosyası veya kayıt klasörü')
+    for name, config_name in SWEEP_PARAMS.items():
+        parser.add_argument(f'--{name}', help=f"{config_name} değerleri (örn. 30,35 veya 30:50:5)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--horizon', type=float, default=3600, help='İleri getiri ufku (saniye)')
+    parser.add_argument('--fp-threshold', type=float, default=0.0, help='Bu getirinin altı yanlış pozitif sayılır')
+    parser.add_argument('--sort', default='mean_return',
+                        choices=['mean_return', 'median_return', 'hit_rate', 'false_positives', 'new_signals'])
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--csv', help='Tüm sonuçları CSV olarak yaz')
+    args = parser.parse_args()
+
+    grid = build_grid(args)
+    if not grid:
+        print("❌ En az bir parametre aralığı verilmeli (--initial, --second, --next, --drop)")
+        return 1
+
+    with tempfile.TemporaryDirectory(prefix='sweep-') as cache_dir:
+        started = time.time()
+        recording = prepare_cache(args.path, cache_dir)
+        print(f"📂 {recording.snapshot_count} snapshot hazırlandı ({time.time() - started:.1f}s)")
+
+        started = time.time()
+        results = run_sweep(cache_dir, grid, args.workers, args.horizon, args.fp_threshold)
+        print(f"⚙️ {len(grid)} kombinasyon {args.workers} worker ile {time.time() - started:.1f}s'de tamamlandı")
+
+    results.sort(key=lambda row: row[args.sort], reverse=args.sort != 'false_positives')
+
+    columns = list(grid[0].keys()) + ['signals', 'new_signals', 'mean_return', 'median_return',
+                                      'hit_rate', 'false_positives']
+    print_table(results, columns, args.top)
+
+    if args.csv:
+        with open(args.csv, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"💾 Sonuçlar yazıldı: {args.csv}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
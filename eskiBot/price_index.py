@@ -0,0 +1,86 @@
+"""
+Fiyat indeksi - Tek parite için zaman sıralı fiyat/hacim noktaları
+
+Sinyal anında zaten çekilmiş trade'ler ve önbellekteki mumlardan kurulur; her trade satırının
+öncesi/sonrası fiyatı ve kümülatif hacmi ikili arama ile bulunur, ek API isteği yapılmaz.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+# Trade'lerden eski fiyatlar için bakılan önbellek aralıkları (en ince önce)
+CANDLE_INTERVALS = ('1m', '5m', '15m')
+
+class PriceIndex:
+    def __init__(self, times: np.ndarray, prices: np.ndarray, values: np.ndarray):
+        order = np.argsort(times, kind='stable')
+        self.times = times[order]
+        self.prices = prices[order]
+        # _suffix_volume[i]: i. noktadan (dahil) sonraki toplam işlem hacmi, sonda 0
+        self._suffix_volume = np.concatenate([np.cumsum(values[order][::-1])[::-1], [0.0]])
+
+    @classmethod
+    def build(cls, trades: List[Dict], candles: Optional[Dict[str, np.ndarray]] = None,
+              interval_seconds: int = 0) -> 'PriceIndex':
+        """Trade listesinden ve (varsa) trade'lerden önceki mum kapanışlarından indeks kurar"""
+        times, prices, values = [], [], []
+        for trade in trades:
+            try:
+                price = float(trade.get('price', 0))
+                amount = float(trade.get('amount', 0))
+                trade_time = float(trade.get('create_time_ms') or 0) / 1000 or float(trade.get('create_time', 0))
+            except (TypeError, ValueError):
+                continue
+            times.append(trade_time)
+            prices.append(price)
+            values.append(price * amount)
+
+        times = np.array(times, dtype=np.float64)
+        prices = np.array(prices, dtype=np.float64)
+        values = np.array(values, dtype=np.float64)
+
+        if candles is not None and len(candles['t']):
+            # Mum kapanışları sadece trade'lerin kapsamadığı eski kısmı doldurur
+            close_times = candles['t'].astype(np.float64) + interval_seconds
+            oldest = times.min() if len(times) else np.inf
+            older = close_times < oldest
+            times = np.concatenate([close_times[older], times])
+            prices = np.concatenate([candles['c'][older], prices])
+            values = np.concatenate([np.zeros(int(older.sum())), values])
+
+        return cls(times, prices, values)
+
+    def price_before(self, timestamp: float) -> Optional[float]:
+        """timestamp'ten önceki son fiyat"""
+        position = np.searchsorted(self.times, timestamp, side='left') - 1
+        return float(self.prices[position]) if position >= 0 else None
+
+    def price_at(self, timestamp: float) -> Optional[float]:
+        """timestamp'teki (aynı andaki işlemler dahil) son fiyat"""
+        position = np.searchsorted(self.times, timestamp, side='right') - 1
+        return float(self.prices[position]) if position >= 0 else None
+
+    def volume_after(self, timestamp: float) -> float:
+        """timestamp'ten sonra gerçekleşen toplam işlem hacmi"""
+        return float(self._suffix_volume[np.searchsorted(self.times, timestamp, side='right')])
+
+    def trade_changes(self, timestamp: float, open_24h: float) -> Dict[str, float]:
+        """Trade öncesi/sonrası 24s açılışa göre değişim (%) ve indekslenen trade penceresinde
+        o trade dahil gerçekleşen kümülatif işlem hacmi payı (%)"""
+        after_price = self.price_at(timestamp)
+        before_price = self.price_before(timestamp) or after_price
+        before_change = (before_price / open_24h - 1) * 100 if open_24h > 0 and before_price else 0.0
+        after_change = (after_price / open_24h - 1) * 100 if open_24h > 0 and after_price else 0.0
+
+        # Pay 24s hacme değil pencere toplamına göre - pencere sadece son trade'leri kapsar, 24s hacme
+        # oranlanınca her satır ~%100 çıkar
+        window_volume = float(self._suffix_volume[0])
+        volume_share = 0.0
+        if window_volume > 0:
+            volume_share = (window_volume - self.volume_after(timestamp)) / window_volume * 100
+
+        return {
+            'before_change': before_change,
+            'after_change': after_change,
+            'volume_change': volume_share,
+        }
@@ -0,0 +1,215 @@
+"""
+Pusu sinyali - Düşük volatilite ve daralan fiyat aralığında hacim toplanan coinleri bulur
+
+Mumlar arka planda sınırlı hızla yenilenir ve parite x mum dizilerinde tutulur;
+volatilite ve sıkışma tüm pariteler için tek vektörel adımda hesaplanır.
+"""
+
+import threading
+import numpy as np
+from typing import Dict, List, Optional
+from config import Config
+from clock import SystemClock
+from candle_cache import INTERVAL_SECONDS
+
+class CandleMatrix:
+    """Parite başına son N kapanmış mumun close/high/low/volume sütunları"""
+
+    def __init__(self, candle_count: int, initial_pairs: int = 1024):
+        self.candle_count = candle_count
+        self.pairs: List[str] = []
+        self.pair_index: Dict[str, int] = {}
+        self.closes = np.full((initial_pairs, candle_count), np.nan, dtype=np.float64)
+        self.highs = np.full((initial_pairs, candle_count), np.nan, dtype=np.float64)
+        self.lows = np.full((initial_pairs, candle_count), np.nan, dtype=np.float64)
+        self.volumes = np.full((initial_pairs, candle_count), np.nan, dtype=np.float64)
+
+    def write(self, currency_pair: str, columns: Dict[str, np.ndarray]):
+        """Eski→yeni sıralı mum sütunlarını satıra sağa yaslı yazar; eksik baştaki sütunlar NaN kalır"""
+        row = self._row(currency_pair)
+        for name, key in (('closes', 'c'), ('highs', 'h'), ('lows', 'l'), ('volumes', 'v')):
+            column = columns[key][-self.candle_count:]
+            start = self.candle_count - len(column)
+            values = getattr(self, name)
+            values[row, :start] = np.nan
+            values[row, start:] = column
+
+    def _row(self, currency_pair: str) -> int:
+        row = self.pair_index.get(currency_pair)
+        if row is None:
+            row = len(self.pairs)
+            if row >= self.closes.shape[0]:
+                self._grow()
+            self.pair_index[currency_pair] = row
+            self.pairs.append(currency_pair)
+        return row
+
+    def _grow(self):
+        """Satır kapasitesini iki katına çıkarır"""
+        for name in ('closes', 'highs', 'lows', 'volumes'):
+            values = getattr(self, name)
+            setattr(self, name, np.vstack([values, np.full_like(values, np.nan)]))
+
+def compute_pusu_metrics(closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray,
+                         recent: int) -> Dict[str, np.ndarray]:
+    """Her satır için 24s volatilite (%), 24s aralık (%), sıkışma ve hacim oranı; eksik veri NaN"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        complete = ~np.isnan(closes).any(axis=1)
+        log_returns = np.diff(np.log(closes), axis=1)
+        # Mum getirilerinin standart sapması pencere uzunluğuna ölçeklenir
+        volatility = log_returns.std(axis=1) * np.sqrt(log_returns.shape[1]) * 100
+
+        window_high = highs.max(axis=1)
+        window_low = lows.min(axis=1)
+        window_range = window_high - window_low
+        recent_range = highs[:, -recent:].max(axis=1) - lows[:, -recent:].min(axis=1)
+
+        metrics = {
+            'volatility_24h': volatility,
+            'range_24h': window_range / window_low * 100,
+            'compression': np.where(window_range > 0, recent_range / window_range, np.nan),
+            'volume_ratio': volumes[:, -recent:].mean(axis=1) / volumes.mean(axis=1),
+        }
+    for values in metrics.values():
+        values[~complete] = np.nan
+    return metrics
+
+class PusuDetector:
+    def __init__(self, gateio_api, clock=None):
+        self.gateio_api = gateio_api
+        self.clock = clock or SystemClock()
+        self.interval = Config.PUSU_INTERVAL
+        self.interval_seconds = INTERVAL_SECONDS[self.interval]
+        self.recent_candles = Config.PUSU_RECENT_CANDLES
+        self.candles = CandleMatrix(Config.PUSU_CANDLE_COUNT)
+        self.volumes_24h: Dict[str, float] = {}  # Aday evreni: parite -> 24s hacim
+        self.refreshed_at: Dict[str, float] = {}  # Parite -> son mum yenileme (monotonic)
+        self._lock = threading.Lock()  # Mum matrisi
+        self._universe_lock = threading.Lock()  # volumes_24h ve refreshed_at - tarama ve yenileme thread'i
+        self._stop = threading.Event()
+        self._thread = None
+
+    def update_volumes(self, tickers: List[Dict]):
+        """Ana taramadaki (değişen) ticker'lardan aday evrenini günceller"""
+        volumes = {}
+        for ticker in tickers:
+            try:
+                volumes[ticker['currency_pair']] = float(ticker.get('quote_volume') or 0)
+            except (KeyError, ValueError):
+                continue
+        with self._universe_lock:
+            self.volumes_24h.update(volumes)
+
+    def start(self):
+        """Mum yenileme thread'ini başlatır"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop = threading.Event()  # Her thread'in kendi olayı - eski thread yeniden başlatmada canlanmaz
+        self._thread = threading.Thread(target=self._refresh_loop, args=(self._stop,), name='pusu-candles', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Thread'i durdurur ve süren isteğin bitmesini bekler"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=15)
+            self._thread = None
+
+    def _refresh_loop(self, stop: threading.Event):
+        """Saniyede en fazla PUSU_REQUESTS_PER_SECOND istekle en bayat pariteyi yeniler"""
+        delay = 1 / Config.PUSU_REQUESTS_PER_SECOND
+        while not stop.is_set():
+            try:
+                if not self.refresh_next():
+                    stop.wait(5)  # Yenilenecek parite yok
+                    continue
+            except Exception as e:
+                print(f"❌ Pusu mum yenileme hatası: {e}")
+            stop.wait(delay)
+
+    def refresh_next(self) -> bool:
+        """Yenileme vadesi gelmiş en bayat pariteyi çeker; parite yoksa False"""
+        currency_pair = self._next_stale_pair()
+        if currency_pair is None:
+            return False
+
+        with self._universe_lock:
+            self.refreshed_at[currency_pair] = self.clock.monotonic()
+        # Son mum henüz kapanmadı - hacmi ve aralığı eksik olduğu için kullanılmaz
+        columns = self.gateio_api.get_candle_arrays(currency_pair.replace('_USDT', ''), self.interval,
+                                                    Config.PUSU_CANDLE_COUNT, closed_only=True)
+        if columns is None or len(columns['t']) == 0:
+            return True
+
+        with self._lock:
+            self.candles.write(currency_pair, columns)
+        return True
+
+    def _next_stale_pair(self) -> Optional[str]:
+        now = self.clock.monotonic()
+        stale_before = now - Config.PUSU_REFRESH_INTERVAL
+        best_pair, best_time = None, None
+        with self._universe_lock:
+            for currency_pair, volume in self.volumes_24h.items():
+                if volume < Config.PUSU_MIN_VOLUME:
+                    continue
+                refreshed = self.refreshed_at.get(currency_pair, -np.inf)
+                if refreshed > stale_before:
+                    continue
+                if best_time is None or refreshed < best_time:
+                    best_pair, best_time = currency_pair, refreshed
+        return best_pair
+
+    def evaluate(self) -> List[Dict]:
+        """Pusu şartlarını sağlayan pariteleri en sıkışık olan önce döndürür"""
+        with self._lock:
+            count = len(self.candles.pairs)
+            if count == 0:
+                return []
+            pairs = list(self.candles.pairs)
+            metrics = compute_pusu_metrics(self.candles.closes[:count], self.candles.highs[:count],
+                                           self.candles.lows[:count], self.candles.volumes[:count],
+                                           self.recent_candles)
+
+        with np.errstate(invalid='ignore'):
+            matches = ((metrics['volatility_24h'] <= Config.PUSU_MAX_VOLATILITY)
+                       & (metrics['compression'] <= Config.PUSU_MAX_COMPRESSION)
+                       & (metrics['volume_ratio'] >= Config.PUSU_MIN_VOLUME_RATIO))
+
+        rows = np.flatnonzero(matches)
+        rows = rows[np.argsort(metrics['compression'][rows])]
+        return [{
+            'currency_pair': pairs[row],
+            'volatility_24h': float(metrics['volatility_24h'][row]),
+            'range_24h': float(metrics['range_24h'][row]),
+            'compression': float(metrics['compression'][row]),
+            'volume_ratio': float(metrics['volume_ratio'][row]),
+        } for row in rows if self.volumes_24h.get(pairs[row], 0) >= Config.PUSU_MIN_VOLUME]
+
+def _benchmark(pair_count: int = 3000, candle_count: int = 96, passes: int = 20):
+    """Parite başına döngü vs vektörel metrik hesabı"""
+    import time
+
+    rng = np.random.default_rng(7)
+    closes = 1 + np.cumsum(rng.normal(0, 0.005, (pair_count, candle_count)), axis=1)
+    highs = closes * (1 + rng.uniform(0, 0.003, closes.shape))
+    lows = closes * (1 - rng.uniform(0, 0.003, closes.shape))
+    volumes = rng.uniform(100, 1000, closes.shape)
+
+    started = time.perf_counter()
+    for _ in range(passes):
+        for row in range(pair_count):
+            compute_pusu_metrics(closes[row:row + 1], highs[row:row + 1], lows[row:row + 1], volumes[row:row + 1], 16)
+    per_pair = (time.perf_counter() - started) / passes
+
+    started = time.perf_counter()
+    for _ in range(passes):
+        compute_pusu_metrics(closes, highs, lows, volumes, 16)
+    vectorized = (time.perf_counter() - started) / passes
+
+    print(f"📊 {pair_count} parite x {candle_count} mum")
+    print(f"   parite başına : {per_pair * 1000:8.1f} ms")
+    print(f"   vektörel      : {vectorized * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,60 @@
+"""
+Uyarlanır tarama aralığı - Piyasa hareketliyken kısalır, sakinken uzar, API sorunlarında geri çekilir
+
+Her değişiklik sebebiyle birlikte loglanır; aralık her zaman SCAN_MIN_INTERVAL..SCAN_MAX_INTERVAL içindedir.
+Momentum/küme ring buffer'ı sütun aralığını ve kapasitesini `fastest_scan_interval()` ile belirler.
+"""
+
+from config import Config
+
+def fastest_scan_interval() -> float:
+    """Taramaların gelebileceği en kısa aralık - geçmiş tutan bileşenler kapasitelerini buna göre ayarlar"""
+    if Config.SCAN_ADAPTIVE:
+        return max(1, min(Config.SCAN_MIN_INTERVAL, Config.RUNTIME.scan_interval))
+    return max(1, Config.RUNTIME.scan_interval)
+
+class ScanCadence:
+    def __init__(self):
+        self.base_interval = Config.RUNTIME.scan_interval
+        self.min_interval = Config.SCAN_MIN_INTERVAL
+        self.max_interval = Config.SCAN_MAX_INTERVAL
+        self.interval = float(self._clamp(self.base_interval))
+        self.reason = 'başlangıç'
+        self.average_latency = None  # Ticker isteği süresinin üstel ortalaması (saniye)
+        self.consecutive_errors = 0
+
+    def record_scan(self, hot_pairs: int, dispersion: float, latency: float):
+        """Başarılı taramadan sonra aralığı piyasa aktivitesi ve istek süresine göre ayarlar"""
+        self.consecutive_errors = 0
+        previous_latency = self.average_latency
+        self.average_latency = latency if previous_latency is None else 0.8 * previous_latency + 0.2 * latency
+
+        if latency >= Config.SCAN_LATENCY_LIMIT or (previous_latency and latency > max(3 * previous_latency, 1)):
+            self._set(self.interval * 1.5, f"API gecikmesi {latency:.1f}s")
+        elif hot_pairs >= Config.SCAN_HOT_PAIRS:
+            self._set(self.interval * 0.7, f"{hot_pairs} parite eşik üstünde")
+        elif dispersion >= Config.SCAN_DISPERSION_HIGH:
+            self._set(self.interval * 0.7, f"fiyat dağılımı yüksek (%{dispersion:.2f})")
+        elif hot_pairs < Config.SCAN_HOT_PAIRS / 2 and dispersion <= Config.SCAN_DISPERSION_LOW:
+            self._set(self.interval * 1.25, f"piyasa sakin (%{dispersion:.2f})")
+        elif self.interval != self.base_interval:
+            # Normal aktivite - varsayılan aralığa yaklaş
+            target = self.interval + (self.base_interval - self.interval) * 0.5
+            if abs(target - self.base_interval) < 1:
+                target = self.base_interval
+            self._set(target, "normal aktivite")
+
+    def record_error(self):
+        """Ticker isteği başarısız - art arda hatalarda aralık katlanarak uzar"""
+        self.consecutive_errors += 1
+        self._set(self.interval * 2, f"API hatası ({self.consecutive_errors}. kez)")
+
+    def _set(self, interval: float, reason: str):
+        interval = self._clamp(interval)
+        if round(interval) != round(self.interval):
+            print(f"⏱️ Tarama aralığı {self.interval:.0f}s → {interval:.0f}s ({reason})")
+        self.interval = interval
+        self.reason = reason
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.min_interval), self.max_interval)
@@ -0,0 +1,111 @@
+"""
+Çalışma zamanı ayarları - bot_settings sürümü değişince Config.RUNTIME tek atamayla yeni değişmez nesneyle değiştirilir
+"""
+
+from dataclasses import fields, replace
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from config import Config, RuntimeSettings
+from database import get_db_session, BotSetting
+
+VERSION_KEY = 'settings_version'
+
+# BotSetting anahtarı -> tip - yeniden başlatmadan uygulanabilenler (RuntimeSettings alanları)
+RUNTIME_SETTINGS = {field.name: field.type for field in fields(RuntimeSettings) if field.name != 'version'}
+
+def parse_runtime_value(key: str, value: str):
+    """Panelden gelen metni Config tipine çevirir - geçersizse ValueError"""
+    kind = RUNTIME_SETTINGS[key]
+    parsed = kind(float(value)) if kind is int else kind(value)
+    if parsed < 0:
+        raise ValueError(f"{key} negatif olamaz")
+    return parsed
+
+def bump_version(db) -> int:
+    """Ayar kaydıyla aynı transaction'da sürümü artırır (commit çağırana ait)"""
+    row = db.query(BotSetting).filter(BotSetting.setting_key == VERSION_KEY).first()
+    if row is None:
+        row = BotSetting(setting_key=VERSION_KEY, setting_value='0', description='Ayar sürümü (panel her kayıtta artırır)')
+        db.add(row)
+    version = int(row.setting_value or 0) + 1
+    row.setting_value = str(version)
+    row.updated_at = datetime.utcnow()
+    return version
+
+class SettingsService:
+    def __init__(self):
+        self.version: Optional[int] = None  # Son okunan sürüm
+        self._values: Dict[str, Optional[str]] = {}  # anahtar -> metin, sürüm değişince bütünüyle değişir
+        self._listeners: List[Callable[[Dict[str, Tuple]], None]] = []
+        self._last_poll = None  # Monotonic saniye
+
+    def subscribe(self, listener: Callable[[Dict[str, Tuple]], None]):
+        """Ayar değişince {anahtar: (eski, yeni)} ile çağrılır - tarama thread'inde"""
+        self._listeners.append(listener)
+
+    def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        """Önbellekten okur; ilk erişimde tablodan okunur (yoksa da önbelleklenir)"""
+        values = self._values
+        if key not in values:
+            db = get_db_session()
+            try:
+                row = db.query(BotSetting.setting_value).filter(BotSetting.setting_key == key).first()
+            except Exception as e:
+                print(f"❌ Ayar okuma hatası ({key}): {e}")
+                return default
+            finally:
+                db.close()
+            values = dict(values)
+            values[key] = row.setting_value if row else None
+            self._values = values
+        value = values[key]
+        return default if value is None else value
+
+    def poll(self, now: float, force: bool = False) -> bool:
+        """Sürüm satırını yoklar; değiştiyse ayarları uygular"""
+        if not force and self._last_poll is not None and now - self._last_poll < Config.SETTINGS_POLL_INTERVAL:
+            return False
+        self._last_poll = now
+
+        db = get_db_session()
+        try:
+            row = db.query(BotSetting.setting_value).filter(BotSetting.setting_key == VERSION_KEY).first()
+            version = int(row.setting_value) if row else 0
+            if version == self.version:
+                return False
+            values = dict(db.query(BotSetting.setting_key, BotSetting.setting_value).all())
+        except Exception as e:
+            print(f"❌ Ayar sürümü okuma hatası: {e}")
+            return False
+        finally:
+            db.close()
+
+        # Sürüm satırı yoksa tablo panelden düzenlenmemiştir - env değerleri geçerli kalır
+        changed = self._apply(values if row else {}, version)
+        self._values = values
+        self.version = version
+        if changed:
+            print(f"⚙️ Ayarlar v{version} uygulandı: "
+                  + ", ".join(f"{key} {old} → {new}" for key, (old, new) in changed.items()))
+        for listener in self._listeners:
+            try:
+                listener(changed)
+            except Exception as e:
+                print(f"❌ Ayar dinleyici hatası: {e}")
+        return True
+
+    def _apply(self, values: Dict[str, str], version: int) -> Dict[str, Tuple]:
+        """Geçerli değerlerden yeni RuntimeSettings kurar ve tek atamayla yayınlar - okuyucular ya eski ya yeni seti görür"""
+        parsed = {}
+        for key in RUNTIME_SETTINGS:
+            if values.get(key) is None:
+                continue
+            try:
+                parsed[key] = parse_runtime_value(key, values[key])
+            except ValueError as e:
+                print(f"❌ Geçersiz ayar {key}={values[key]!r}: {e}")
+
+        current = Config.RUNTIME
+        changed = {key: (getattr(current, key), value) for key, value in parsed.items() if getattr(current, key) != value}
+        Config.RUNTIME = replace(current, version=version, **parsed)
+        return changed
@@ -57,6 +57,9 @@ def setup_initial_data():
             ('second_signal_threshold', '20', 'İkinci sinyal için ek artış yüzdesi'),
             ('next_signal_threshold', '10', 'Sonraki sinyaller için artış yüzdesi'),
             ('drop_threshold', '25', 'Takipten çıkarma eşiği'),
+            # Boş bırakılır - yazılana kadar giriş koşulu ve merdiven yukarıdaki eşiklerden (Config) türetilir
+            ('signal_entry_condition', '', 'İlk sinyal koşulu (percentage, volume, price; and/or/not) - boşsa initial_pump_threshold'),
+            ('signal_ladder', '', 'Sinyal merdiveni (ör. second +20; level +10; below 100 add 10; below 200 round 25; round 50) - boşsa Config eşikleri'),
             ('low_volume_threshold', '100000', 'Düşük hacim eşiği'),
             ('medium_volume_threshold', '300000', 'Orta hacim eşiği'),
             ('min_trade_amount', '100', 'Minimum işlem miktarı'),
@@ -0,0 +1,94 @@
+"""
+Sinyal zenginleştirme - Aynı taramada çıkan pump coinlerin trade/nakit/hacim bilgilerini paralel hazırlar
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from config import Config
+
+class SignalEnricher:
+    def __init__(self, build_signal: Callable[[Dict], Dict], max_workers: int = None,
+                 on_error: Optional[Callable[[Dict], None]] = None):
+        self.build_signal = build_signal
+        self.on_error = on_error  # Hazırlanamayan coin - bir sonraki taramada tekrar denenmesi için
+        self.max_workers = max_workers or Config.ENRICH_WORKERS
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='enrich')
+
+    def enrich_burst(self, coins: List[Dict]) -> Iterator[Tuple[Dict, Dict]]:
+        """Tüm coinleri aynı anda hazırlamaya başlar, sonuçları verilen öncelik sırasıyla döndürür
+
+        Bir coin, kendisi ve ondan öncelikli olanların hepsi hazır olduğu anda döner;
+        yavaş bir coin sadece kendisinden sonrakileri bekletir.
+        """
+        if len(coins) == 1:
+            # Tek coin havuza gönderilmeden bu thread'de hazırlanır
+            try:
+                signal_data = self.build_signal(coins[0])
+            except Exception as e:
+                self._failed(coins[0], e)
+                return
+            yield coins[0], signal_data
+            return
+
+        futures = [(coin, self._executor.submit(self.build_signal, coin)) for coin in coins]
+        for coin, future in futures:
+            try:
+                signal_data = future.result()
+            except Exception as e:
+                self._failed(coin, e)
+                continue
+            yield coin, signal_data
+
+    def _failed(self, coin: Dict, error: Exception):
+        """Hata taramanın geri kalanını durdurmaz"""
+        print(f"❌ {coin.get('symbol')} zenginleştirme hatası: {error}")
+        if self.on_error is not None:
+            self.on_error(coin)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+def _benchmark(fetch_latency: float = 0.3, sizes=(1, 2, 5, 10, 20, 40)) -> bool:
+    """Burst gecikmesi: coin sayısı arttıkça sıralı vs paralel hazırlama süresi
+
+    Paralel süre alt-doğrusal büyümeli - en büyük burst sıralı sürenin %25'inden kısa sürmezse False döner.
+    """
+    import time
+
+    def build_signal(coin: Dict) -> Dict:
+        time.sleep(fetch_latency)  # Trade history isteği
+        return dict(coin, trades_history=[], cash_5min=0.0)
+
+    enricher = SignalEnricher(build_signal)
+    print(f"⏱️ İstek gecikmesi {fetch_latency * 1000:.0f} ms, {enricher.max_workers} worker")
+    print(f"{'coin':>6} {'sıralı (s)':>12} {'paralel (s)':>12} {'coin başı (ms)':>15}")
+    results = {}
+    for size in sizes:
+        coins = [{'symbol': f"C{i}", 'percentage': 100 - i} for i in range(size)]
+
+        started = time.perf_counter()
+        for coin in coins:
+            build_signal(coin)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in enricher.enrich_burst(coins):
+            pass
+        parallel = time.perf_counter() - started
+
+        results[size] = (sequential, parallel)
+        print(f"{size:>6} {sequential:>12.2f} {parallel:>12.2f} {parallel / size * 1000:>15.0f}")
+    enricher.shutdown()
+
+    largest = max(sizes)
+    sequential, parallel = results[largest]
+    per_coin = [results[size][1] / size for size in sorted(sizes)]
+    passed = parallel < 0.25 * sequential and per_coin[-1] < per_coin[0]
+    print(f"{'✅' if passed else '❌'} {largest} coin: paralel {parallel:.2f}s, sıralının %{parallel / sequential * 100:.0f}'i "
+          f"(sınır %25); coin başı {per_coin[0] * 1000:.0f} → {per_coin[-1] * 1000:.0f} ms")
+    return passed
+
+if __name__ == "__main__":
+    # python signal_enricher.py - burst gecikmesi alt-doğrusal değilse çıkış kodu 1
+    import sys
+    sys.exit(0 if _benchmark() else 1)
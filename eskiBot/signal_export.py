@@ -0,0 +1,200 @@
+"""
+Sinyal geçmişi dışa aktarma - CSV ve Parquet akışı
+
+Satırlar sunucu tarafı imleçle parça parça okunur (yield_per) ve her parça yazılır yazılmaz yanıta verilir;
+bellek kullanımı satır sayısından bağımsız, parça boyutuyla sınırlıdır. Parquet için pyarrow isteğe bağlıdır.
+"""
+
+import csv
+import io
+from itertools import islice
+from datetime import datetime
+from typing import Iterator, Optional
+from database import Signal
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export kapalı, CSV çalışır
+    pa = None
+    pq = None
+
+EXPORT_CHUNK_SIZE = 5000  # Parça başına satır - aynı zamanda Parquet row group boyutu
+
+# trades_history büyük JSON metni - dışa aktarmada yer almaz
+EXPORT_COLUMNS = (
+    Signal.id, Signal.created_at, Signal.symbol, Signal.currency_pair, Signal.signal_type, Signal.price,
+    Signal.percentage, Signal.initial_percentage, Signal.volume_24h, Signal.volume_category, Signal.cash_5min,
+    Signal.volatility_24h,
+)
+COLUMN_NAMES = [column.key for column in EXPORT_COLUMNS]
+
+def parquet_available() -> bool:
+    return pa is not None
+
+def build_query(db, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                symbol: Optional[str] = None, signal_type: Optional[str] = None):
+    """Filtreli, created_at sıralı sorgu - `end` hariç"""
+    query = db.query(*EXPORT_COLUMNS)
+    if start is not None:
+        query = query.filter(Signal.created_at >= start)
+    if end is not None:
+        query = query.filter(Signal.created_at < end)
+    if symbol:
+        query = query.filter(Signal.symbol == symbol.upper())
+    if signal_type:
+        query = query.filter(Signal.signal_type == signal_type)
+    return query.order_by(Signal.created_at, Signal.id)
+
+def _chunks(query, chunk_size: int) -> Iterator[list]:
+    """yield_per sunucu tarafı imleç açar (stream_results) - parça parça satır listeleri"""
+    rows = iter(query.yield_per(chunk_size))
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_csv(query, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Başlık + her parça için bir CSV bloğu"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMN_NAMES)
+    for rows in _chunks(query, chunk_size):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+class _ChunkSink:
+    """ParquetWriter için sadece ekleme yapılan dosya - yazılanlar her row group sonrası boşaltılır"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts.clear()
+        return data
+
+def iter_parquet(query, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Her parça bir row group - footer en sonda"""
+    if pa is None:
+        raise RuntimeError("Parquet export için pyarrow kurulmalı")
+
+    schema = pa.schema([
+        ('id', pa.int64()), ('created_at', pa.timestamp('us')), ('symbol', pa.string()),
+        ('currency_pair', pa.string()), ('signal_type', pa.string()), ('price', pa.float64()),
+        ('percentage', pa.float64()), ('initial_percentage', pa.float64()), ('volume_24h', pa.float64()),
+        ('volume_category', pa.string()), ('cash_5min', pa.float64()), ('volatility_24h', pa.float64()),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for rows in _chunks(query, chunk_size):
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def _benchmark(rows: int = 5_000_000, naive_rows: int = 200_000, max_peak_mb: float = 32) -> bool:
+    """5M satırlık geçici SQLite tablosunu CSV olarak akıtır; tepe Python belleği tracemalloc ile ölçülür
+
+    Akış tepe belleği satır sayısından bağımsız olmalı - `max_peak_mb` aşılırsa False döner.
+    """
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix='signal_export_') as directory:
+        return _run_benchmark(f"{directory}/signals.db", rows, naive_rows, max_peak_mb)
+
+def _run_benchmark(path: str, rows: int, naive_rows: int, max_peak_mb: float) -> bool:
+    import time
+    import tracemalloc
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import sessionmaker
+    from database import Base
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine, tables=[Signal.__table__])
+    Session = sessionmaker(bind=engine)
+
+    started = time.perf_counter()
+    base_time = datetime(2024, 1, 1).timestamp()
+    types = ('new', 'second', 'third', 'momentum', 'pusu')
+    with engine.begin() as connection:
+        for offset in range(0, rows, 100_000):
+            connection.execute(insert(Signal.__table__), [{
+                'symbol': f"C{index % 500}", 'currency_pair': f"C{index % 500}_USDT",
+                'signal_type': types[index % len(types)], 'price': 1.0 + index * 1e-6, 'percentage': 35.5,
+                'initial_percentage': 35.0, 'volume_24h': 5e5, 'volume_category': 'medium',
+                'trades_history': '[]', 'cash_5min': 1200.0, 'volatility_24h': 0.0,
+                'created_at': datetime.utcfromtimestamp(base_time + index),
+            } for index in range(offset, min(offset + 100_000, rows))])
+    print(f"🗄️ {rows} satır hazırlandı ({time.perf_counter() - started:.1f}s)")
+
+    peaks = {}
+
+    def measure(label: str, produce) -> None:
+        db = Session()
+        tracemalloc.start()
+        started = time.perf_counter()
+        total_bytes = produce(db)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        db.close()
+        peaks[label] = peak / 1e6
+        print(f"{label:>28} {total_bytes / 1e6:>9.1f} MB {elapsed:>8.1f}s {peak / 1e6:>10.1f} MB")
+
+    print(f"{'yöntem':>28} {'çıktı':>12} {'süre':>9} {'tepe bellek':>13}")
+    for count in sorted({naive_rows, rows}):
+        measure(f"akış CSV ({count})",
+                lambda db: sum(len(part) for part in iter_csv(build_query(db).limit(count))))
+
+    def naive(db) -> int:
+        # Karşılaştırma: tüm satırları belleğe alıp tek seferde yazmak
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMN_NAMES)
+        writer.writerows(build_query(db).limit(naive_rows).all())
+        return len(buffer.getvalue().encode('utf-8'))
+    measure(f"hepsi bellekte ({naive_rows})", naive)
+
+    if pa is not None:
+        measure(f"akış Parquet ({rows})", lambda db: sum(len(part) for part in iter_parquet(build_query(db))))
+    engine.dispose()
+
+    streaming = {label: peak for label, peak in peaks.items() if label.startswith('akış')}
+    passed = all(peak <= max_peak_mb for peak in streaming.values())
+    print(f"{'✅' if passed else '❌'} akış tepe belleği en fazla {max(streaming.values()):.1f} MB (sınır {max_peak_mb:.0f} MB)")
+    return passed
+
+if __name__ == "__main__":
+    # python signal_export.py [satır sayısı] - akış sınırı aşarsa çıkış kodu 1
+    import sys
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    sys.exit(0 if _benchmark(rows, min(rows, 200_000)) else 1)
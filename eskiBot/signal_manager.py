@@ -3,45 +3,151 @@ Sinyal yönetimi ve mantığı
 """
 
 import time
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta, timezone
-from dataclasses import dataclass
 from config import Config
 from gateio_api import GateioAPI
 from telegram_bot import TelegramBot
-
-@dataclass
-class CoinTracker:
-    """Takip edilen coin bilgileri"""
-    symbol: str
-    currency_pair: str
-    base_price: float  # İlk tespit edilen fiyat
-    current_price: float
-    initial_percentage: float  # İlk sinyal yüzdesi
-    current_percentage: float
-    previous_signal_percentage: float  # Bir önceki sinyalin yüzdesi
-    signal_count: int  # Kaç sinyal verildi
-    last_signal_time: datetime
-    last_scan_time: datetime
-    is_following: bool  # 45 saniye takip modunda mı
-    volume_24h: float
+from database import get_db_session, TrackedCoin
+from leader_election import create_leader_election
+from clock import SystemClock
+from tracker_store import CoinTracker, TrackerStore
+from followup_scheduler import FollowupScheduler
+from scan_cadence import ScanCadence
+from signal_enricher import SignalEnricher
+from momentum import MomentumDetector
+from cluster import ClusterDetector
+from ticker_diff import TickerDiff
+from pusu import PusuDetector
+from watchlist import WatchlistEngine
+from liquidity import LiquidityGate
+from alerts import AlertEngine
+from signal_rules import SignalRules
+from settings_service import SettingsService
+from signal_stats import SignalStats
+from web_snapshot import EMPTY_SNAPSHOT, SnapshotPublisher
+from price_index import PriceIndex, CANDLE_INTERVALS
+from candle_cache import INTERVAL_SECONDS
 
 class SignalManager:
-    def __init__(self, gateio_api=None):
+    def __init__(self, gateio_api=None, telegram_bot=None, clock=None, leader_election: bool = True):
         self.gateio_api = gateio_api or GateioAPI()
-        self.telegram_bot = TelegramBot()
-        self.tracked_coins: Dict[str, CoinTracker] = {}
-        self.base_scan_interval = Config.SCAN_INTERVAL
-        self.followup_interval = Config.FOLLOWUP_INTERVAL
+        self.telegram_bot = telegram_bot or TelegramBot()
+        self.clock = clock or SystemClock()  # Replay'de simüle saat
+        self.base_scan_interval = Config.RUNTIME.scan_interval
+        self.scan_cadence = ScanCadence() if Config.SCAN_ADAPTIVE else None  # None ise sabit aralık
+        self.followup_interval = Config.RUNTIME.followup_interval
+        self.settings = SettingsService()  # Panelden değişen ayarlar yeniden başlatmadan uygulanır
+        self.settings.subscribe(self._on_settings_changed)
+        self.signal_rules = SignalRules(self.settings)  # Giriş koşulu ve sinyal merdiveni (BotSetting DSL'i)
+        self.tracked_coins = TrackerStore(self.followup_interval)
+        self.followups = FollowupScheduler(
+            lambda tracker: self._calculate_next_signal_threshold(tracker.initial_percentage, tracker.signal_count))
         self.turkey_timezone = timezone(timedelta(hours=3))  # Türkiye saati +3
         self.web_signal_callback = None  # Web arayüzü için callback
+        self.web_alert_callback = None  # (kullanıcı adı, alarmlar) - kullanıcıya özel web kanalı
+        self.signal_stats = SignalStats(self.clock)  # Artımlı sayaçlar ve dakika/saat/gün kovaları
+        self._snapshots = SnapshotPublisher(self._mono_to_datetime)
+        self.web_snapshot = EMPTY_SNAPSHOT  # Web thread'leri sadece bu referansı okur
+        self.web_snapshot_callback = None  # Ayrı süreç modunda görüntüyü paylaşımlı belleğe yazar
+        self._stop = threading.Event()  # Her çalıştırmada yenisi - durdurulan döngü tekrar canlanmaz; set ise çalışmıyor
+        self._stop.set()
+        self._run_lock = threading.Lock()  # Aynı anda tek tarama döngüsü
+        self._start_lock = threading.Lock()
+        self.enricher = SignalEnricher(self._build_initial_signal_data,
+                                       on_error=lambda coin: self.ticker_diff.mark_dirty(coin['currency_pair']))
+        self.momentum = MomentumDetector() if Config.MOMENTUM_ENABLED else None
+        self._momentum_cooldowns: Dict[str, float] = {}
+        # Küme tespiti momentum ring buffer'ını paylaşır
+        self.cluster = ClusterDetector(self.momentum.buffer) if Config.CLUSTER_ENABLED and self.momentum else None
+        self._cluster_cooldowns: Dict[str, float] = {}
+        self.pusu = PusuDetector(self.gateio_api, self.clock) if Config.PUSU_ENABLED else None
+        self._pusu_cooldowns: Dict[str, float] = {}
+        self.watchlist = WatchlistEngine() if Config.SPECIAL_ENABLED else None
+        self.liquidity = LiquidityGate(self.gateio_api, self.clock) if Config.LIQUIDITY_ENABLED else None
+        self._liquidity_rejections: Dict[str, float] = {}  # suppress modunda elenen parite -> monotonic zaman
+        self.alerts = AlertEngine() if Config.ALERT_ENABLED else None
+        self._alert_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='alert')  # Tarama beklemez
+        self.ticker_diff = TickerDiff()  # Sadece değişen pariteler değerlendirilir
+        self._coin_categories: Dict[str, Dict] = {}  # Dashboard için parite -> hacim kategorisi verisi
+        self.leader = create_leader_election() if leader_election else None  # None ise tek instance modu
+        self._last_lease_check = None  # Monotonic saniye
+        self._was_leader = False  # Son kontrolde lider miydik - geçişleri yazdırmak için
+        self._last_tracker_sync = None  # Monotonic saniye
+        self._last_main_scan = None  # Monotonic saniye
         
+    def _now(self) -> datetime:
+        """Türkiye saatinde şu anki zaman"""
+        return datetime.fromtimestamp(self.clock.time(), tz=self.turkey_timezone)
+    
+    def _mono_to_datetime(self, monotonic_time: float) -> datetime:
+        """Monotonic zamanı Türkiye saatine çevirir - sadece gösterim ve kayıt için"""
+        epoch = self.clock.time() - (self.clock.monotonic() - monotonic_time)
+        return datetime.fromtimestamp(epoch, tz=self.turkey_timezone)
+    
+    def _datetime_to_mono(self, value: datetime) -> float:
+        """Duvar saatini bu sürecin monotonic saatine çevirir"""
+        return self.clock.monotonic() - (self.clock.time() - value.timestamp())
+    
     def set_web_callback(self, callback):
         """Web arayüzü için callback fonksiyonu ayarla"""
         self.web_signal_callback = callback
+    
+    def set_alert_callback(self, callback):
+        """Kullanıcı alarmları için web callback fonksiyonu ayarla"""
+        self.web_alert_callback = callback
+    
+    def _notify_signal(self, signal_data: Dict):
+        """Gönderilen sinyali sayar ve web arayüzüne bildirir"""
+        self.signal_stats.record(signal_data)
+        if self.web_signal_callback:
+            self.web_signal_callback(signal_data)
+    
+    def set_snapshot_callback(self, callback):
+        """Her yayınlanan web görüntüsü için callback ayarla"""
+        self.web_snapshot_callback = callback
+    
+    def _send_signal(self, signal_data: Dict) -> bool:
+        """Telegram'a gönderir ve DB'ye yazar - lease geçerli değilse göndermez (eski lider yeni liderle çakışmasın)"""
+        if self.leader is not None and not self.leader.holds_lease():
+            print(f"⚠️ {signal_data['symbol']} sinyali gönderilmedi: lease geçerli değil")
+            return False
+        return self.telegram_bot.send_signal(signal_data)
+    
+    def stop(self):
+        """Tarama döngüsünü mevcut turun sonunda durdurur"""
+        self._stop.set()
+    
+    @property
+    def is_running(self) -> bool:
+        """Döngü çalışıyor veya durdurulmuş ama turunu henüz bitirmemiş"""
+        return self._run_lock.locked()
+    
+    @property
+    def stop_requested(self) -> bool:
+        return self._stop.is_set()
         
     def start_monitoring(self):
-        """Ana tarama döngüsünü başlatır"""
+        """Ana tarama döngüsünü başlatır - durdurulan önceki döngü turunu bitirene kadar bekler"""
+        with self._start_lock:
+            if not self._stop.is_set():
+                print("⚠️ Tarama döngüsü zaten çalışıyor")
+                return
+            stop_event = threading.Event()
+            self._stop = stop_event
+        
+        # İki döngü aynı takip listesini işleyip aynı sinyali iki kez göndermesin
+        try:
+            with self._run_lock:
+                if not stop_event.is_set():
+                    self._monitor(stop_event)
+        finally:
+            stop_event.set()
+    
+    def _monitor(self, stop_event: threading.Event):
         print("🚀 Gate.io Sinyal Botu başlatılıyor...")
         
         # Test mesajı gönder
@@ -54,47 +160,230 @@ class SignalManager:
         print(f"📊 {self.base_scan_interval} saniyede bir tarama başlatılıyor...")
         print("⏰ Bot 24/7 kesintisiz çalışacak!")
         
-        while True:
+        # Pusu mumları arka planda sınırlı hızla yenilenir
+        if self.pusu is not None:
+            self.pusu.start()
+        
+        # Lider iken lease ayrı thread'de yenilenir - tur TTL'den uzun sürse de düşmez
+        if self.leader is not None:
+            self.leader.start_renewal()
+        
+        while not stop_event.is_set():
             try:
-                current_time = datetime.now(self.turkey_timezone)  # Türkiye saati kullan
+                # Panel ayarları - lider olmasa da güncel tutulur
+                if self.settings is not None:
+                    self.settings.poll(self.clock.monotonic())
+                
+                # Sadece lider tarar ve sinyal gönderir
+                if not self._check_leadership():
+                    self.clock.sleep(1)
+                    continue
+                
+                # Zamanlama monotonic saatle - duvar saati atlamalarından etkilenmez
+                now = self.clock.monotonic()
                 
                 # Ana tarama (15 saniye)
-                self._perform_main_scan(current_time)
+                self._perform_main_scan(now)
                 
                 # Takip edilen coinleri kontrol et (45 saniye)
-                self._check_followed_coins(current_time)
+                self._check_followed_coins(self.clock.monotonic())
                 
                 # Temizlik: düşen coinleri takipten çıkar
                 self._cleanup_dropped_coins()
                 
-                time.sleep(1)  # CPU yükünü azaltmak için
+                # Takip durumunu DB'ye yaz (failover için)
+                self._sync_tracker_state()
+                
+                # Sinyal sayaçlarını özet tabloya yaz
+                self.signal_stats.flush(self.clock.monotonic())
+                
+                # Web katmanı için değişmez görüntü
+                self._publish_web_snapshot()
+                
+                self.clock.sleep(1)  # CPU yükünü azaltmak için
                 
             except KeyboardInterrupt:
                 print("\n🛑 Bot durduruldu")
                 break
             except Exception as e:
                 print(f"❌ Beklenmeyen hata: {e}")
-                time.sleep(5)
+                self.clock.sleep(5)
+        
+        if self.pusu is not None:
+            self.pusu.stop()
+        if self.watchlist is not None:
+            self.watchlist.flush(self.clock.monotonic(), force=True)
+        self.signal_stats.flush(self.clock.monotonic(), force=True)
+        self._step_down()
+    
+    def _on_settings_changed(self, changed: Dict):
+        """Yeni ayarları çalışan bileşenlere uygular - tarama döngüsünün thread'inde çağrılır"""
+        settings = Config.RUNTIME
+        if 'scan_interval' in changed:
+            self.base_scan_interval = settings.scan_interval
+            if self.scan_cadence:
+                self.scan_cadence.base_interval = settings.scan_interval
+        if 'followup_interval' in changed:
+            self.followup_interval = settings.followup_interval
+            self.tracked_coins.followup_interval = settings.followup_interval
+        
+        # Eşikler veya DSL metinleri değiştiyse tüm pariteler yeni kurallarla yeniden değerlendirilir
+        if self.signal_rules.refresh() or changed:
+            self.ticker_diff.invalidate()
+    
+    def _check_leadership(self) -> bool:
+        """Lease'i yeniler, lider değilse takip durumunu DB'den okuyarak sıcak tutar"""
+        if self.leader is None:
+            return True
+        
+        now = self.clock.monotonic()
+        if self._last_lease_check is not None and now - self._last_lease_check < Config.LEADER_RENEW_INTERVAL:
+            return self.leader.holds_lease()
+        self._last_lease_check = now
+        
+        # Lider iken yenileme thread'i lease'i uzatır; burada sadece devralma denenir
+        was_leader = self._was_leader
+        is_leader = self.leader.holds_lease() or self.leader.try_acquire()
+        self._was_leader = is_leader
+        
+        if is_leader and not was_leader:
+            print(f"👑 Liderlik alındı ({self.leader.instance_id}, term {self.leader.term})")
+            # Önceki liderin takip durumunu devral
+            self.load_tracker_state()
+        elif was_leader and not is_leader:
+            print(f"⚠️ Liderlik kaybedildi ({self.leader.instance_id}), standby moduna geçiliyor")
+        elif not is_leader and (self._last_tracker_sync is None or now - self._last_tracker_sync >= Config.TRACKER_SYNC_INTERVAL):
+            # Standby: cache'i sıcak tut
+            self._last_tracker_sync = now
+            self.load_tracker_state()
+        
+        return is_leader
+    
+    def _sync_tracker_state(self):
+        """Lider periyodik olarak takip durumunu DB'ye yazar"""
+        if self.leader is None or not self.leader.holds_lease():
+            return
+        
+        now = self.clock.monotonic()
+        if self._last_tracker_sync is not None and now - self._last_tracker_sync < Config.TRACKER_SYNC_INTERVAL:
+            return
+        self._last_tracker_sync = now
+        self.save_tracker_state()
+    
+    def _step_down(self):
+        """Kapanışta durumu yazar ve lease'i bırakır"""
+        if self.leader is None:
+            return
+        
+        holds_lease = self.leader.holds_lease()
+        if holds_lease:
+            self.save_tracker_state()
+        self.leader.release()  # Yenileme thread'ini de durdurur
+        self._was_leader = False
+        if holds_lease:
+            print("👋 Liderlik bırakıldı")
+    
+    def save_tracker_state(self):
+        """Takip edilen coinleri tracked_coins tablosuna yazar"""
+        db = get_db_session()
+        try:
+            existing = {row.symbol: row for row in db.query(TrackedCoin).all()}
+            
+            for symbol, tracker in list(self.tracked_coins.items()):
+                row = existing.pop(symbol, None) or TrackedCoin(symbol=symbol)
+                row.currency_pair = tracker.currency_pair
+                row.base_price = tracker.base_price
+                row.current_price = tracker.current_price
+                row.initial_percentage = tracker.initial_percentage
+                row.current_percentage = tracker.current_percentage
+                row.previous_signal_percentage = tracker.previous_signal_percentage
+                row.signal_count = tracker.signal_count
+                row.last_signal_time = self._to_db_time(self._mono_to_datetime(tracker.last_signal_at))
+                row.last_scan_time = self._to_db_time(self._mono_to_datetime(tracker.last_scan_at))
+                row.is_following = tracker.is_following
+                row.volume_24h = tracker.volume_24h
+                db.add(row)
+            
+            # Artık takip edilmeyenleri sil
+            for row in existing.values():
+                db.delete(row)
+            
+            db.commit()
+            
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Takip durumu kaydetme hatası: {e}")
+        finally:
+            db.close()
+    
+    def load_tracker_state(self):
+        """tracked_coins tablosundan takip durumunu yükler"""
+        db = get_db_session()
+        try:
+            tracked_coins = TrackerStore(self.followup_interval)
+            for row in db.query(TrackedCoin).all():
+                tracked_coins[row.symbol] = CoinTracker(
+                    symbol=row.symbol,
+                    currency_pair=row.currency_pair,
+                    base_price=row.base_price,
+                    current_price=row.current_price,
+                    initial_percentage=row.initial_percentage,
+                    current_percentage=row.current_percentage,
+                    previous_signal_percentage=row.previous_signal_percentage,
+                    signal_count=row.signal_count,
+                    last_signal_at=self._datetime_to_mono(self._from_db_time(row.last_signal_time)),
+                    last_scan_at=self._datetime_to_mono(self._from_db_time(row.last_scan_time)),
+                    is_following=row.is_following,
+                    volume_24h=row.volume_24h
+                )
+            
+            self.tracked_coins = tracked_coins
+            self.ticker_diff.invalidate()
+            
+        except Exception as e:
+            print(f"❌ Takip durumu yükleme hatası: {e}")
+        finally:
+            db.close()
+    
+    def _to_db_time(self, value: datetime) -> datetime:
+        """Türkiye saatini DB için naive UTC'ye çevirir"""
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
     
-    def _perform_main_scan(self, current_time: datetime):
+    def _from_db_time(self, value: datetime) -> datetime:
+        """DB'deki naive UTC'yi Türkiye saatine çevirir"""
+        return value.replace(tzinfo=timezone.utc).astimezone(self.turkey_timezone)
+    
+    def _perform_main_scan(self, now: float):
         """Ana tarama - 15 saniyede bir"""
-        # Son taramadan 15 saniye geçti mi?
-        if hasattr(self, '_last_main_scan'):
-            if (current_time - self._last_main_scan).total_seconds() < self.base_scan_interval:
-                return
+        # Son taramadan 15 saniye (uyarlanır modda güncel aralık) geçti mi?
+        scan_interval = self.scan_cadence.interval if self.scan_cadence else self.base_scan_interval
+        if self._last_main_scan is not None and now - self._last_main_scan < scan_interval:
+            return
         
-        print(f"🔍 Ana tarama başlatılıyor... ({current_time.strftime('%H:%M:%S')})")
+        print(f"🔍 Ana tarama başlatılıyor... ({self._now().strftime('%H:%M:%S')})")
         
         # Tüm tickers'ı çek
+        request_started = time.perf_counter()
         tickers = self.gateio_api.get_all_tickers()
+        request_latency = time.perf_counter() - request_started
         if not tickers:
             print("❌ Ticker verisi alınamadı")
+            if self.scan_cadence:
+                # Hata durumunda her saniye denemek yerine geri çekil
+                self.scan_cadence.record_error()
+                self._last_main_scan = now
             return
         
         pump_coins = []
         
-        # Her coin için %35+ artış kontrol et
-        for ticker in tickers:
+        entry = self.signal_rules.current.entry
+        
+        # Sadece son taramadan beri alanları değişen pariteler değerlendirilir
+        changed_tickers = self.ticker_diff.changed(tickers)
+        eval_started = time.perf_counter()
+        
+        # Her coin için giriş koşulu (varsayılan %35+ artış) kontrol et
+        for ticker in changed_tickers:
             try:
                 currency_pair = ticker['currency_pair']
                 symbol = currency_pair.replace('_USDT', '')
@@ -103,10 +392,9 @@ class SignalManager:
                 if symbol in self.tracked_coins and self.tracked_coins[symbol].is_following:
                     continue
                 
-                change_percentage = float(ticker.get('change_percentage', 0))
-                
-                # %35+ artış kontrolü
-                if change_percentage >= Config.INITIAL_PUMP_THRESHOLD:
+                # Giriş koşulu kontrolü
+                if entry(ticker):
+                    change_percentage = float(ticker.get('change_percentage', 0))
                     last_price = float(ticker.get('last', 0))
                     volume_24h = float(ticker.get('quote_volume', 0))
                     
@@ -134,27 +422,318 @@ class SignalManager:
                 print(f"❌ Ticker işleme hatası: {e}")
                 continue
         
-        # Pump coinler için sinyal gönder
-        for coin_data in pump_coins:
-            self._send_initial_signal(coin_data, current_time)
+        # Dashboard hacim kategorileri de sadece değişenler için güncellenir
+        self._update_coin_categories(changed_tickers)
+        if self.pusu is not None:
+            self.pusu.update_volumes(changed_tickers)
+        self.ticker_diff.record_pass(len(tickers), len(changed_tickers), time.perf_counter() - eval_started)
+        
+        # Kısa vadeli momentum - tüm pariteler için tek vektörel adım
+        momentum_coins = self._detect_momentum(tickers, pump_coins)
+        
+        # Kullanıcı alarm kuralları - eşik indeksleriyle, momentum sonuçları güncellendikten sonra
+        self._evaluate_alerts(tickers, now)
         
-        self._last_main_scan = current_time
+        # Birlikte yükselen pariteler tek küme sinyalinde - üyelerin ayrı momentum sinyalleri gönderilmez
+        cluster_coins = self._detect_clusters(tickers)
+        if cluster_coins:
+            cluster_symbols = {member['symbol'] for coin in cluster_coins for member in coin['cluster']['members']}
+            momentum_coins = [coin for coin in momentum_coins if coin['symbol'] not in cluster_symbols]
+        
+        # Pusu - mum verisi arka planda yenilenir, burada sadece vektörel değerlendirme yapılır
+        pusu_coins = self._detect_pusu(tickers, pump_coins + momentum_coins)
+        
+        # Özel takip listesi - sadece değişen ticker'lar, ek istek yok
+        special_coins = self._detect_special(changed_tickers, now)
+        
+        # Pump coinler için sinyal gönder - detaylar paralel hazırlanır, en yüksek artış önce gönderilir
+        pump_coins.sort(key=lambda coin: coin['percentage'], reverse=True)
+        burst = pump_coins + cluster_coins + momentum_coins + pusu_coins + special_coins
+        if self.liquidity is not None and burst:
+            # Yakın zamanda elenenler tekrar denenmez, kalanların derinlikleri aynı anda istenir
+            burst = [coin for coin in burst if not self._recently_rejected(coin, now)]
+            self.liquidity.prefetch([coin['currency_pair'] for coin in burst])
+        for coin_data, signal_data in self.enricher.enrich_burst(burst):
+            if self._suppressed_by_liquidity(signal_data, now):
+                continue
+            if signal_data['signal_type'] == 'momentum':
+                self._send_momentum_signal(signal_data)
+            elif signal_data['signal_type'] == 'cluster':
+                self._send_cluster_signal(signal_data)
+            elif signal_data['signal_type'] == 'pusu':
+                self._send_pusu_signal(signal_data)
+            elif signal_data['signal_type'] in ('special_up', 'special_down'):
+                self._send_special_signal(signal_data)
+            else:
+                self._send_initial_signal(coin_data, self.clock.monotonic(), signal_data)
+        
+        self._last_main_scan = now
+        
+        if self.scan_cadence:
+            self.scan_cadence.record_scan(self._count_hot_pairs(), self.ticker_diff.last_dispersion, request_latency)
         
         if pump_coins:
             print(f"🎯 {len(pump_coins)} adet pump coin tespit edildi")
         else:
             print("📊 Pump coin bulunamadı")
     
-    def _check_followed_coins(self, current_time: datetime):
-        """Takip edilen coinleri kontrol et - 45 saniyede bir"""
-        coins_to_remove = []
+    def _recently_rejected(self, coin: Dict, now: float) -> bool:
+        rejected_at = self._liquidity_rejections.get(coin['currency_pair'])
+        return rejected_at is not None and now - rejected_at < Config.LIQUIDITY_REJECT_COOLDOWN
+    
+    def _suppressed_by_liquidity(self, signal_data: Dict, now: float) -> bool:
+        """suppress modunda sığ tahtalı sinyalleri eler - özel takip listesi her zaman gönderilir"""
+        liquidity = signal_data.get('liquidity')
+        if (self.liquidity is None or not self.liquidity.suppress or not liquidity or liquidity['tradeable']
+                or signal_data['signal_type'] in ('special_up', 'special_down')):
+            return False
+        self._liquidity_rejections[signal_data['currency_pair']] = now
+        print(f"💧 {signal_data['symbol']} likidite yetersiz, sinyal gönderilmedi: {', '.join(liquidity['reasons'])}")
+        return True
+    
+    def _detect_momentum(self, tickers: List[Dict], pump_coins: List[Dict]) -> List[Dict]:
+        """Ring buffer'ı günceller, pump coinlere momentum ekler ve momentum sinyali adaylarını döndürür"""
+        if self.momentum is None:
+            return []
+        
+        try:
+            hot_pairs = self.momentum.update(tickers, self.clock.time())
+        except Exception as e:
+            print(f"❌ Momentum hesaplama hatası: {e}")
+            return []
+        
+        for coin_data in pump_coins:
+            coin_data['momentum'] = self.momentum.momentum_for(coin_data['currency_pair'])
+        
+        if not hot_pairs:
+            return []
+        
+        now = self.clock.monotonic()
+        pump_symbols = {coin_data['symbol'] for coin_data in pump_coins}
+        tickers_by_pair = {ticker['currency_pair']: ticker for ticker in tickers}
+        momentum_coins = []
+        
+        for currency_pair in hot_pairs:
+            symbol = currency_pair.replace('_USDT', '')
+            
+            # Zaten sinyal verilen veya takip edilen coinleri atla
+            if symbol in pump_symbols:
+                continue
+            if symbol in self.tracked_coins and self.tracked_coins[symbol].is_following:
+                continue
+            last_sent = self._momentum_cooldowns.get(symbol)
+            if last_sent is not None and now - last_sent < Config.MOMENTUM_COOLDOWN:
+                continue
+            
+            ticker = tickers_by_pair.get(currency_pair) or self.gateio_api.get_ticker_detail(currency_pair)
+            if not ticker:
+                continue
+            
+            momentum_coins.append({
+                'symbol': symbol,
+                'currency_pair': currency_pair,
+                'price': float(ticker.get('last', 0)),
+                'percentage': float(ticker.get('change_percentage', 0)),
+                'volume_24h': float(ticker.get('quote_volume', 0)),
+                'signal_type': 'momentum',
+                'momentum': self.momentum.momentum_for(currency_pair)
+            })
+        
+        # En güçlü kısa vadeli hareket önce
+        momentum_coins.sort(key=lambda coin: max(coin['momentum'].get(name, 0) for name in ('1m', '5m', '15m', '1h')), reverse=True)
+        return momentum_coins
+    
+    def _send_momentum_signal(self, signal_data: Dict):
+        """Momentum sinyali gönderir - takibe alınmaz, cooldown süresince tekrarlanmaz"""
+        symbol = signal_data['symbol']
+        if self._send_signal(signal_data):
+            self._notify_signal(signal_data)
+            self._momentum_cooldowns[symbol] = self.clock.monotonic()
+            print(f"⚡ {symbol} momentum sinyali gönderildi")
+        else:
+            print(f"❌ {symbol} momentum sinyali gönderilemedi")
+    
+    def _detect_clusters(self, tickers: List[Dict]) -> List[Dict]:
+        """Korele yükselen parite kümelerini, üyelerinin çoğu cooldown'da değilse sinyal adayı yapar"""
+        if self.cluster is None:
+            return []
+        
+        try:
+            clusters = self.cluster.detect()
+        except Exception as e:
+            print(f"❌ Küme hesaplama hatası: {e}")
+            return []
+        
+        if not clusters:
+            return []
+        
+        now = self.clock.monotonic()
+        tickers_by_pair = {ticker['currency_pair']: ticker for ticker in tickers}
+        cluster_coins = []
+        
+        for cluster in clusters:
+            members = [{'symbol': member['currency_pair'].replace('_USDT', ''), 'return': member['return']}
+                       for member in cluster['members']]
+            
+            # Aynı küme her taramada tekrar bildirilmesin
+            cooling = sum(1 for member in members
+                          if now - self._cluster_cooldowns.get(member['symbol'], -Config.CLUSTER_COOLDOWN) < Config.CLUSTER_COOLDOWN)
+            if cooling * 2 >= len(members):
+                continue
+            
+            # En çok yükselen üye sinyalin ana coin'i
+            lead_pair = cluster['members'][0]['currency_pair']
+            ticker = tickers_by_pair.get(lead_pair) or self.gateio_api.get_ticker_detail(lead_pair)
+            if not ticker:
+                continue
+            
+            cluster_coins.append({
+                'symbol': members[0]['symbol'],
+                'currency_pair': lead_pair,
+                'price': float(ticker.get('last', 0)),
+                'percentage': float(ticker.get('change_percentage', 0)),
+                'volume_24h': float(ticker.get('quote_volume', 0)),
+                'signal_type': 'cluster',
+                'cluster': {
+                    'members': members,
+                    'mean_return': cluster['mean_return'],
+                    'mean_correlation': cluster['mean_correlation']
+                }
+            })
+        
+        return cluster_coins
+    
+    def _send_cluster_signal(self, signal_data: Dict):
+        """Küme sinyali gönderir - tüm üyeler cooldown'a girer"""
+        symbol = signal_data['symbol']
+        members = signal_data['cluster']['members']
+        if self._send_signal(signal_data):
+            self._notify_signal(signal_data)
+            now = self.clock.monotonic()
+            for member in members:
+                self._cluster_cooldowns[member['symbol']] = now
+            print(f"🧩 {symbol} küme sinyali gönderildi ({len(members)} coin)")
+        else:
+            print(f"❌ {symbol} küme sinyali gönderilemedi")
+    
+    def _detect_pusu(self, tickers: List[Dict], signaled_coins: List[Dict]) -> List[Dict]:
+        """Pusu şartlarını sağlayan ve cooldown'da olmayan coinleri sinyal adayı olarak döndürür"""
+        if self.pusu is None:
+            return []
+        
+        try:
+            candidates = self.pusu.evaluate()
+        except Exception as e:
+            print(f"❌ Pusu hesaplama hatası: {e}")
+            return []
+        
+        if not candidates:
+            return []
+        
+        now = self.clock.monotonic()
+        signaled_symbols = {coin_data['symbol'] for coin_data in signaled_coins}
+        tickers_by_pair = {ticker['currency_pair']: ticker for ticker in tickers}
+        pusu_coins = []
         
-        for symbol, tracker in self.tracked_coins.items():
-            if not tracker.is_following:
+        for candidate in candidates:
+            currency_pair = candidate['currency_pair']
+            symbol = currency_pair.replace('_USDT', '')
+            
+            if symbol in signaled_symbols:
+                continue
+            if symbol in self.tracked_coins and self.tracked_coins[symbol].is_following:
+                continue
+            last_sent = self._pusu_cooldowns.get(symbol)
+            if last_sent is not None and now - last_sent < Config.PUSU_COOLDOWN:
                 continue
             
-            # 45 saniye geçti mi?
-            if (current_time - tracker.last_scan_time).total_seconds() < self.followup_interval:
+            ticker = tickers_by_pair.get(currency_pair)
+            if not ticker:
+                continue
+            
+            pusu_coins.append({
+                'symbol': symbol,
+                'currency_pair': currency_pair,
+                'price': float(ticker.get('last', 0)),
+                'percentage': float(ticker.get('change_percentage', 0)),
+                'volume_24h': float(ticker.get('quote_volume', 0)),
+                'signal_type': 'pusu',
+                'volatility_24h': candidate['volatility_24h'],
+                'pusu': candidate
+            })
+        
+        return pusu_coins
+    
+    def _send_pusu_signal(self, signal_data: Dict):
+        """Pusu sinyali gönderir - takibe alınmaz, cooldown süresince tekrarlanmaz"""
+        symbol = signal_data['symbol']
+        if self._send_signal(signal_data):
+            self._notify_signal(signal_data)
+            self._pusu_cooldowns[symbol] = self.clock.monotonic()
+            print(f"🎯 {symbol} pusu sinyali gönderildi")
+        else:
+            print(f"❌ {symbol} pusu sinyali gönderilemedi")
+    
+    def _evaluate_alerts(self, tickers: List[Dict], now: float):
+        """Eşiği geçen kullanıcı kurallarını (kullanıcı, kanal) başına tek mesajla gönderir"""
+        if self.alerts is None:
+            return
+        
+        try:
+            self.alerts.sync(now)
+            fired = self.alerts.evaluate(tickers, now, self.momentum)
+        except Exception as e:
+            print(f"❌ Alarm değerlendirme hatası: {e}")
+            return
+        if not fired:
+            return
+        if self.leader is not None and not self.leader.holds_lease():
+            return
+        
+        print(f"🔔 {len(fired)} alarm tetiklendi")
+        for (username, channel), items in self.alerts.group_by_channel(fired).items():
+            if channel:
+                self._alert_executor.submit(self.telegram_bot.send_alerts, channel, items)
+            if self.web_alert_callback:
+                self.web_alert_callback(username, [dict(match, rule_id=rule.id, field=rule.field,
+                                                        operator=rule.operator, threshold=rule.threshold)
+                                                   for rule, match in items])
+    
+    def _detect_special(self, tickers: List[Dict], now: float) -> List[Dict]:
+        """Özel takip listesini tabloyla eşitler, eşiği aşan coinleri döndürür ve değişiklikleri toplu yazar"""
+        if self.watchlist is None:
+            return []
+        
+        try:
+            # Yeni eklenenler ticker'ı değişmese de bir sonraki taramada değerlendirilir
+            for currency_pair in self.watchlist.sync(now):
+                self.ticker_diff.mark_dirty(currency_pair)
+            
+            special_coins = self.watchlist.evaluate(tickers)
+            self.watchlist.flush(now)
+            return special_coins
+        except Exception as e:
+            print(f"❌ Özel takip hatası: {e}")
+            return []
+    
+    def _send_special_signal(self, signal_data: Dict):
+        """Özel takip sinyali gönderir - bir sonraki eşik gönderilen yüzdeden hesaplanır"""
+        symbol = signal_data['symbol']
+        if self._send_signal(signal_data):
+            self._notify_signal(signal_data)
+            self.watchlist.mark_signaled(signal_data['currency_pair'], signal_data['percentage'])
+            print(f"⭐ {symbol} özel takip sinyali gönderildi ({signal_data['signal_type']})")
+        else:
+            print(f"❌ {symbol} özel takip sinyali gönderilemedi")
+    
+    def _check_followed_coins(self, now: float):
+        """Takip edilen coinleri kontrol et - vadesi gelenler, tetiğe en yakın olan önce"""
+        for tracker in self.followups.order(self.tracked_coins.pop_due_followups(now)):
+            symbol = tracker.symbol
+            
+            # İstek bütçesi doldu - kalanlar bir sonraki saniyeye
+            if not self.followups.try_acquire(now):
+                self.tracked_coins.schedule_followup(tracker, now + 1)
                 continue
             
             print(f"🔄 {symbol} takip kontrolü yapılıyor...")
@@ -162,32 +741,34 @@ class SignalManager:
             # Güncel fiyat bilgisini çek
             ticker_data = self.gateio_api.get_ticker_detail(tracker.currency_pair)
             if not ticker_data:
+                # Bir sonraki döngüde tekrar dene
+                self.tracked_coins.schedule_followup(tracker, now + 1)
                 continue
             
             try:
                 current_price = float(ticker_data.get('last', 0))
                 change_percentage = float(ticker_data.get('change_percentage', 0))
+                self.followups.observe(tracker, change_percentage, now)
                 
                 # Fiyat %25'in altına düştü mü?
-                if change_percentage < Config.DROP_THRESHOLD:
+                if change_percentage < Config.RUNTIME.drop_threshold:
                     print(f"📉 {symbol} %25'in altına düştü, takipten çıkarılıyor")
-                    coins_to_remove.append(symbol)
+                    del self.tracked_coins[symbol]
+                    self.ticker_diff.mark_dirty(tracker.currency_pair)
                     continue
                 
                 # Yeni sinyal kontrolü
-                self._check_for_additional_signals(tracker, current_price, change_percentage, current_time)
+                self._check_for_additional_signals(tracker, current_price, change_percentage, now)
                 
-                # Scan time güncelle
-                tracker.last_scan_time = current_time
+                # Scan time güncelle - bir sonraki kontrol tetiğe uzaklık ve hıza göre
+                tracker.last_scan_at = now
+                self.tracked_coins.schedule_followup(tracker, now + self.followups.next_delay(tracker, change_percentage))
                 
             except Exception as e:
                 print(f"❌ {symbol} takip hatası: {e}")
-        
-        # Düşen coinleri kaldır
-        for symbol in coins_to_remove:
-            del self.tracked_coins[symbol]
+                self.tracked_coins.schedule_followup(tracker, now + 1)
     
-    def _check_for_additional_signals(self, tracker: CoinTracker, current_price: float, current_percentage: float, current_time: datetime):
+    def _check_for_additional_signals(self, tracker: CoinTracker, current_price: float, current_percentage: float, now: float):
         """Ek sinyal kontrolü yapar - Yeni frekans sistemi"""
         symbol = tracker.symbol
         
@@ -200,75 +781,77 @@ class SignalManager:
             # Sinyal gönder
             signal_data = self._prepare_signal_data(tracker, current_price, current_percentage, tracker.signal_count + 1)
             
-            if self.telegram_bot.send_signal(signal_data):
+            if self._send_signal(signal_data):
                 # Web arayüzüne bildir
-                if self.web_signal_callback:
-                    self.web_signal_callback(signal_data)
+                self._notify_signal(signal_data)
                     
                 # Bir önceki sinyal yüzdesini güncelle
                 tracker.previous_signal_percentage = tracker.current_percentage
                 tracker.signal_count += 1
                 tracker.current_price = current_price
                 tracker.current_percentage = current_percentage
-                tracker.last_signal_time = current_time
+                tracker.last_signal_at = now
+                tracker.telegram_message_id = signal_data.get('telegram_message_id')
+                self.tracked_coins.touch_signal(tracker)
                 print(f"✅ {symbol} {tracker.signal_count}. sinyal gönderildi")
     
     def _calculate_next_signal_threshold(self, initial_percentage: float, current_signal_count: int) -> float:
-        """Yeni sinyal frekans sistemine göre bir sonraki sinyal eşiğini hesaplar"""
-        
-        if current_signal_count == 1:
-            # 2. sinyal için %20 ek artış
-            return initial_percentage + Config.SECOND_SIGNAL_THRESHOLD
-        
-        # Şu anki seviyeyi hesapla
-        if current_signal_count == 2:
-            current_level = initial_percentage + Config.SECOND_SIGNAL_THRESHOLD
-        else:
-            # 3. ve sonraki sinyaller için şu anki seviyeyi hesapla
-            additional_increases = (current_signal_count - 2) * Config.NEXT_SIGNAL_THRESHOLD
-            current_level = initial_percentage + Config.SECOND_SIGNAL_THRESHOLD + additional_increases
-        
-        # Bir sonraki sinyal için gerekli artışı belirle
-        if current_level < 100:
-            # %100'den az: %10'luk artışlar (eski sistem)
-            return current_level + Config.NEXT_SIGNAL_THRESHOLD
-        elif current_level < 200:
-            # %100-200 arası: %25'lik artışlar
-            next_threshold = ((current_level // 25) + 1) * 25
-            return max(next_threshold, current_level + 25)
-        else:
-            # %200+: %50'lik artışlar
-            next_threshold = ((current_level // 50) + 1) * 50
-            return max(next_threshold, current_level + 50)
+        """Derlenmiş sinyal merdivenine göre bir sonraki sinyal eşiğini hesaplar
+
+        Varsayılan: 2. sinyal +%20, %100'e kadar +%10, %100-200 arası %25'lik, %200+ %50'lik adımlar.
+        """
+        return self.signal_rules.current.next_threshold(initial_percentage, current_signal_count)
     
-    def _send_initial_signal(self, coin_data: Dict, current_time: datetime):
-        """İlk sinyal gönderir ve takip listesine ekler"""
+    def _build_initial_signal_data(self, coin_data: Dict) -> Dict:
+        """İlk sinyal verisini hazırlar - enricher worker thread'lerinde çalışır"""
         symbol = coin_data['symbol']
         currency_pair = coin_data['currency_pair']
-        price = coin_data['price']
         percentage = coin_data['percentage']
         volume_24h = coin_data['volume_24h']
         
         print(f"🎯 {symbol} için ilk sinyal hazırlanıyor...")
         
-        # Trade history ve diğer detayları çek
-        signal_data = {
+        # Trade history tek istekle çekilir, hem geçmiş hem 5dk nakit için kullanılır
+        trades = self.gateio_api.get_trades_history(currency_pair, limit=100)
+        
+        # Trade satırlarındaki değişimler 24s açılışa göre - özel takipte percentage baz fiyata göredir
+        open_24h = self._open_24h(coin_data['price'], coin_data.get('change_24h', percentage))
+        
+        return {
             'symbol': symbol,
-            'signal_type': 'new',
-            'price': price,
+            'currency_pair': currency_pair,
+            'signal_type': coin_data.get('signal_type', 'new'),
+            'price': coin_data['price'],
             'percentage': percentage,
             'initial_percentage': percentage,
             'volume_24h': volume_24h,
             'volume_category': self.gateio_api.get_volume_category(volume_24h),
-            'trades_history': self._get_formatted_trade_history(currency_pair),
-            'cash_5min': self._calculate_5min_cash(currency_pair)
+            'trades_history': self._get_formatted_trade_history(currency_pair, trades, open_24h),
+            'cash_5min': self._calculate_5min_cash(currency_pair, trades),
+            'momentum': coin_data.get('momentum'),
+            'volatility_24h': coin_data.get('volatility_24h', 0),
+            'pusu': coin_data.get('pusu'),
+            'cluster': coin_data.get('cluster'),
+            'liquidity': self.liquidity.assess(currency_pair) if self.liquidity is not None else None,
+            'base_price': coin_data.get('base_price'),
+            'previous_percentage': coin_data.get('previous_percentage', percentage)
         }
+    
+    def _send_initial_signal(self, coin_data: Dict, now: float, signal_data: Dict = None):
+        """İlk sinyal gönderir ve takip listesine ekler"""
+        symbol = coin_data['symbol']
+        currency_pair = coin_data['currency_pair']
+        price = coin_data['price']
+        percentage = coin_data['percentage']
+        volume_24h = coin_data['volume_24h']
+        
+        if signal_data is None:
+            signal_data = self._build_initial_signal_data(coin_data)
         
         # Sinyal gönder
-        if self.telegram_bot.send_signal(signal_data):
+        if self._send_signal(signal_data):
             # Web arayüzüne bildir
-            if self.web_signal_callback:
-                self.web_signal_callback(signal_data)
+            self._notify_signal(signal_data)
                 
             # Takip listesine ekle
             tracker = CoinTracker(
@@ -280,15 +863,18 @@ class SignalManager:
                 current_percentage=percentage,
                 previous_signal_percentage=percentage,  # İlk sinyalde kendisi
                 signal_count=1,
-                last_signal_time=current_time,
-                last_scan_time=current_time,
+                last_signal_at=now,
+                last_scan_at=now,
                 is_following=True,
-                volume_24h=volume_24h
+                volume_24h=volume_24h,
+                telegram_message_id=signal_data.get('telegram_message_id')
             )
             
             self.tracked_coins[symbol] = tracker
             print(f"✅ {symbol} ilk sinyal gönderildi ve takibe alındı")
         else:
+            # Bir sonraki taramada tekrar denensin
+            self.ticker_diff.mark_dirty(currency_pair)
             print(f"❌ {symbol} sinyal gönderilemedi")
     
     def _prepare_signal_data(self, tracker: CoinTracker, current_price: float, current_percentage: float, signal_number: int) -> Dict:
@@ -302,6 +888,8 @@ class SignalManager:
         else:
             previous_percentage = tracker.initial_percentage
         
+        trades = self.gateio_api.get_trades_history(tracker.currency_pair, limit=100)
+        
         return {
             'symbol': tracker.symbol,
             'signal_type': signal_type,
@@ -310,32 +898,39 @@ class SignalManager:
             'initial_percentage': tracker.initial_percentage,
             'previous_percentage': previous_percentage,  # Yeni eklenen alan
             'signal_number': signal_number,  # Sinyal numarası bilgisi
+            'telegram_message_id': tracker.telegram_message_id,  # edit/reply modunda bağlanılacak mesaj
             'volume_24h': tracker.volume_24h,
             'volume_category': self.gateio_api.get_volume_category(tracker.volume_24h),
-            'trades_history': self._get_formatted_trade_history(tracker.currency_pair),
-            'cash_5min': self._calculate_5min_cash(tracker.currency_pair)
+            'trades_history': self._get_formatted_trade_history(tracker.currency_pair, trades,
+                                                                self._open_24h(current_price, current_percentage)),
+            'cash_5min': self._calculate_5min_cash(tracker.currency_pair, trades)
         }
     
-    def _get_formatted_trade_history(self, currency_pair: str) -> List[str]:
-        """Formatlanmış trade history döndürür"""
+    def _open_24h(self, price: float, change_percentage: float) -> float:
+        """Ticker fiyatı ve 24s değişiminden 24s açılış fiyatı"""
+        if change_percentage <= -100:
+            return 0.0
+        return price / (1 + change_percentage / 100)
+    
+    def _get_formatted_trade_history(self, currency_pair: str, trades: List[Dict] = None,
+                                     open_24h: float = 0.0) -> List[str]:
+        """Formatlanmış trade history döndürür - trades verilmezse API'den çeker"""
         try:
             # Gate.io'dan son 24 saatin trade history'sini çek
-            trades = self.gateio_api.get_trades_history(currency_pair, limit=100)
+            if trades is None:
+                trades = self.gateio_api.get_trades_history(currency_pair, limit=100)
             if not trades:
                 return self._get_sample_trade_history()
             
-            # Son 24 saatti filtrele ve $100+ işlemleri bul
-            current_time = datetime.now(self.turkey_timezone)
-            last_24h = current_time - timedelta(hours=24)
+            # Son 24 saatti filtrele ve $100+ işlemleri bul (epoch saniye ile)
+            last_24h = int(self.clock.time()) - 86400
             
+            min_trade_amount = Config.RUNTIME.min_trade_amount
             significant_trades = []
             for trade in trades:
                 try:
-                    # Trade zamanını parse et ve timezone ekle
-                    trade_timestamp = int(trade.get('create_time', 0))
-                    trade_time = datetime.fromtimestamp(trade_timestamp, tz=self.turkey_timezone)
-                    
-                    if trade_time < last_24h:
+                    trade_timestamp = float(trade.get('create_time_ms') or 0) / 1000 or int(trade.get('create_time', 0))
+                    if trade_timestamp < last_24h:
                         continue
                     
                     # Trade amount hesapla (price * amount)
@@ -344,30 +939,19 @@ class SignalManager:
                     trade_value = price * amount
                     
                     # $100+ işlemleri filtrele
-                    if trade_value >= Config.MIN_TRADE_AMOUNT:
-                        date_str = trade_time.strftime("%d.%m")
-                        time_str = trade_time.strftime("%H:%M")
-                        
-                        # Volume değişim hesaplaması (basitleştirilmiş)
-                        # Gerçek implementasyonda o anki fiyat değişimi hesaplanacak
-                        before_change = 0.0  # Trade öncesi değişim
-                        after_change = 3.2   # Trade sonrası değişim (örnek)
-                        volume_change = 0.4  # Volume artış oranı (örnek)
-                        
-                        line = f"{date_str} {time_str}    +{trade_value:,.2f}  {before_change:.1f}% => {after_change:.1f}% - V: % {volume_change:.1f}"
-                        significant_trades.append({
-                            'line': line,
-                            'time': trade_time,
-                            'value': trade_value
-                        })
+                    if trade_value >= min_trade_amount:
+                        significant_trades.append((trade_timestamp, trade_value))
                         
                 except Exception as e:
                     print(f"Trade parsing hatası: {e}")
                     continue
             
-            # En büyük işlemlerden 10 tanesini seç, zamana göre sırala
-            significant_trades.sort(key=lambda x: x['time'], reverse=True)
-            formatted_lines = [trade['line'] for trade in significant_trades[:10]]
+            # En yeni 10 işlemi seç, sadece bunları formatla
+            significant_trades.sort(reverse=True)
+            price_index = self._build_price_index(currency_pair, trades)
+            formatted_lines = [self._format_trade_line(trade_timestamp, trade_value,
+                                                       price_index.trade_changes(trade_timestamp, open_24h))
+                               for trade_timestamp, trade_value in significant_trades[:10]]
             
             # Eğer yeterli gerçek veri yoksa örnek verilerle tamamla
             if len(formatted_lines) < 3:
@@ -380,30 +964,50 @@ class SignalManager:
             print(f"Trade history hatası: {e}")
             return self._get_sample_trade_history()
     
+    def _build_price_index(self, currency_pair: str, trades: List[Dict]) -> PriceIndex:
+        """Trade'ler ve önbellekte varsa en ince aralıklı mumlardan fiyat indeksi kurar"""
+        symbol = currency_pair.replace('_USDT', '')
+        for interval in CANDLE_INTERVALS:
+            candles = self.gateio_api.get_cached_candle_arrays(symbol, interval)
+            if candles is not None:
+                return PriceIndex.build(trades, candles, INTERVAL_SECONDS[interval])
+        return PriceIndex.build(trades)
+    
+    def _format_trade_line(self, trade_timestamp: float, trade_value: float, changes: Dict[str, float]) -> str:
+        """Trade satırını Türkiye saatiyle formatlar"""
+        trade_time = datetime.fromtimestamp(trade_timestamp, tz=self.turkey_timezone)
+        date_str = trade_time.strftime("%d.%m")
+        time_str = trade_time.strftime("%H:%M")
+        
+        # 24s açılışa göre trade öncesi/sonrası değişim ve trade penceresindeki kümülatif hacim payı
+        before_change = changes['before_change']
+        after_change = changes['after_change']
+        volume_change = changes['volume_change']
+        
+        return f"{date_str} {time_str}    +{trade_value:,.2f}  {before_change:.1f}% => {after_change:.1f}% - V: % {volume_change:.1f}"
+    
     def _get_sample_trade_history(self) -> List[str]:
         """Örnek trade history döndürür - artık boş liste döndürür"""
         return []
     
-    def _calculate_5min_cash(self, currency_pair: str) -> float:
-        """5 dakikalık nakit hesaplaması"""
+    def _calculate_5min_cash(self, currency_pair: str, trades: List[Dict] = None) -> float:
+        """5 dakikalık nakit hesaplaması - trades verilmezse API'den çeker"""
         try:
             # Son 5 dakikanın trade history'sini çek
-            trades = self.gateio_api.get_trades_history(currency_pair, limit=50)
+            if trades is None:
+                trades = self.gateio_api.get_trades_history(currency_pair, limit=50)
             if not trades:
                 return 0.0  # Gerçek veri yoksa 0 döndür
             
-            current_time = datetime.now(self.turkey_timezone)
-            five_min_ago = current_time - timedelta(minutes=5)
+            five_min_ago = int(self.clock.time()) - 300
             
             total_cash = 0.0
             
             for trade in trades:
                 try:
-                    # Trade zamanını kontrol et ve timezone ekle
+                    # Trade zamanını epoch saniye olarak kontrol et
                     trade_timestamp = int(trade.get('create_time', 0))
-                    trade_time = datetime.fromtimestamp(trade_timestamp, tz=self.turkey_timezone)
-                    
-                    if trade_time < five_min_ago:
+                    if trade_timestamp < five_min_ago:
                         continue
                     
                     # Trade değerini hesapla
@@ -424,63 +1028,64 @@ class SignalManager:
             return 8396.0  # Örnek değer döndür
     
     def _cleanup_dropped_coins(self):
-        """Düşen coinleri temizler"""
-        current_time = datetime.now(self.turkey_timezone)  # Türkiye saati kullan
-        coins_to_remove = []
-        
-        for symbol, tracker in self.tracked_coins.items():
-            # 24 saatten fazla takip edilen coinleri temizle
-            if (current_time - tracker.last_signal_time).total_seconds() > 86400:  # 24 saat
-                coins_to_remove.append(symbol)
-        
-        for symbol in coins_to_remove:
+        """24 saattir sinyal almayan coinleri temizler"""
+        for symbol in self.tracked_coins.pop_expired(self.clock.monotonic()):
+            self.ticker_diff.mark_dirty(f"{symbol}_USDT")
             print(f"🧹 {symbol} 24 saat sonrası temizlendi")
-            del self.tracked_coins[symbol]
+    
+    def _count_hot_pairs(self) -> int:
+        """Giriş koşulunu sağlayan parite sayısı - tarama hızı özel DSL'de de sinyal kuralıyla aynı eşiği kullanır"""
+        coins = list(self._coin_categories.values())
+        if not coins:
+            return 0
+        columns = {field: np.fromiter((coin[key] for coin in coins), dtype=np.float64, count=len(coins))
+                   for field, key in (('percentage', 'change_percentage'), ('volume', 'volume'), ('price', 'price'))}
+        return int(np.count_nonzero(self.signal_rules.current.entry_mask(columns)))
+    
+    def _update_coin_categories(self, tickers: List[Dict]):
+        """Değişen pariteler için hacim kategorisi verisini günceller"""
+        for ticker in tickers:
+            try:
+                currency_pair = ticker['currency_pair']
+                volume_24h = float(ticker['quote_volume'])
+                
+                # Hacim kategorisine göre sınıflandır
+                if volume_24h < 300000:  # 300K altı
+                    category = 'low'
+                elif volume_24h < 1000000:  # 300K - 1M arası
+                    category = 'medium'
+                else:  # 1M üstü
+                    category = 'high'
+                
+                self._coin_categories[currency_pair] = {
+                    'symbol': currency_pair.replace('_USDT', ''),
+                    'price': float(ticker['last']),
+                    'change_percentage': float(ticker['change_percentage']),
+                    'volume': volume_24h,
+                    'volume_category': category,
+                    'currency_pair': currency_pair
+                }
+                
+            except Exception:
+                continue
     
     def get_coins_by_volume_category(self) -> Dict[str, List[Dict]]:
-        """Hacim kategorilerine göre coinleri döndürür"""
+        """Hacim kategorilerine göre coinleri döndürür - son taramanın verisini kullanır"""
         try:
-            tickers = self.gateio_api.get_all_tickers()
-            if not tickers:
-                return {'low': [], 'medium': [], 'high': []}
+            if not self._coin_categories:
+                # Henüz tarama yapılmadıysa ticker'ları doğrudan çek
+                tickers = self.gateio_api.get_all_tickers()
+                if not tickers:
+                    return {'low': [], 'medium': [], 'high': []}
+                self._update_coin_categories(tickers)
             
             categorized_coins = {'low': [], 'medium': [], 'high': []}
             
-            for ticker in tickers:
-                try:
-                    currency_pair = ticker['currency_pair']
-                    symbol = currency_pair.replace('_USDT', '')
-                    price = float(ticker['last'])
-                    change_percentage = float(ticker['change_percentage'])
-                    volume_24h = float(ticker['quote_volume'])
-                    
-                    # Hacim kategorisine göre sınıflandır
-                    if volume_24h < 300000:  # 300K altı
-                        category = 'low'
-                    elif volume_24h < 1000000:  # 300K - 1M arası
-                        category = 'medium'
-                    else:  # 1M üstü
-                        category = 'high'
-                    
-                    # Eğer coin takip ediliyorsa signal_count'u al
-                    signal_count = 1  # Varsayılan değer
-                    if symbol in self.tracked_coins:
-                        signal_count = self.tracked_coins[symbol].signal_count
-                    
-                    coin_data = {
-                        'symbol': symbol,
-                        'price': price,
-                        'change_percentage': change_percentage,
-                        'volume': volume_24h,
-                        'volume_category': category,
-                        'currency_pair': currency_pair,
-                        'signal_count': signal_count
-                    }
-                    
-                    categorized_coins[category].append(coin_data)
-                    
-                except Exception as e:
-                    continue
+            for coin in list(self._coin_categories.values()):
+                # Eğer coin takip ediliyorsa signal_count'u al
+                tracker = self.tracked_coins.get(coin['symbol'])
+                coin_data = dict(coin, signal_count=tracker.signal_count if tracker else 1)
+                categorized_coins[coin['volume_category']].append(coin_data)
             
             # Her kategoride en yüksek artış yüzdesine göre sırala
             for category in categorized_coins:
@@ -495,18 +1100,21 @@ class SignalManager:
     def get_web_stats(self) -> Dict:
         """Web arayüzü için istatistikleri döndürür"""
         try:
-            current_time = datetime.now(self.turkey_timezone)
-            
-            # Son sinyal zamanını bul
-            last_signal_time = None
-            if self.tracked_coins:
-                last_signal_time = max(tracker.last_signal_time for tracker in self.tracked_coins.values())
+            # Artımlı sayaçlar - takip listesi taranmaz
+            last_signal_at = self.signal_stats.last_signal_at
+            last_signal_time = datetime.fromtimestamp(last_signal_at, tz=self.turkey_timezone) if last_signal_at else None
             
+            diff_stats = self.ticker_diff.stats()
             stats = {
-                'total_signals': len(self.tracked_coins),
-                'active_tracking': len([t for t in self.tracked_coins.values() if t.is_following]),
-                'last_signal_time': last_signal_time.strftime('%H:%M:%S') if last_signal_time else 'Yok'
+                'total_signals': self.signal_stats.total_signals,
+                'active_tracking': self.tracked_coins.following_count,
+                'last_signal_time': last_signal_time.strftime('%H:%M:%S') if last_signal_time else 'Yok',
+                'scan_changed_ratio': round(diff_stats['changed_ratio'], 3),
+                'scan_cpu_saved_ms': round(diff_stats['saved_ms'], 1)
             }
+            if self.liquidity is not None:
+                stats['liquidity_fetches'] = self.liquidity.fetches
+                stats['liquidity_rejections'] = len(self._liquidity_rejections)
             
             return stats
             
@@ -515,16 +1123,25 @@ class SignalManager:
             return {'total_signals': 0, 'active_tracking': 0, 'last_signal_time': 'Hata'}
 
     
+    def _publish_web_snapshot(self):
+        """Takip durumunu kopyalayıp web katmanına tek referans atamasıyla yayınlar"""
+        try:
+            self.web_snapshot = self._snapshots.publish(self.tracked_coins.values(), self.get_web_stats(), self._now(),
+                                                        Config.RUNTIME.version)
+            if self.web_snapshot_callback:
+                self.web_snapshot_callback(self.web_snapshot)
+        except Exception as e:
+            print(f"Web görüntüsü hatası: {e}")
+    
     def get_latest_signals(self) -> List[Dict]:
         """Son sinyalleri döndürür"""
         try:
             signals = []
-            current_time = datetime.now(self.turkey_timezone)
             
             for symbol, tracker in self.tracked_coins.items():
                 signal = {
                     'symbol': symbol,
-                    'time': tracker.last_signal_time.strftime('%H:%M:%S'),
+                    'time': self._mono_to_datetime(tracker.last_signal_at).strftime('%H:%M:%S'),
                     'message': f"#{symbol} • 🆕 Sinyal - Artış: {tracker.initial_percentage:.1f}%"
                 }
                 signals.append(signal)
@@ -0,0 +1,285 @@
+"""
+Sinyal kuralları - BotSetting'te saklanan giriş koşulu ve sinyal merdiveni DSL'i
+
+Giriş koşulu:   percentage >= 35 and (volume >= 50000 or price < 0.01)
+Merdiven:       second +20; level +10; below 100 add 10; below 200 round 25; round 50
+
+Metinler bir kez Python closure'larına (ve giriş koşulu için numpy maskesine) derlenir. Yeni kurallar
+derlenip başarılı olursa tek atamayla devreye alınır; hatalı metin eski kuralları bozmaz.
+"""
+
+import re
+import math
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from config import Config
+
+ENTRY_SETTING = 'signal_entry_condition'
+LADDER_SETTING = 'signal_ladder'
+
+# DSL alanı -> ticker anahtarı
+CONDITION_FIELDS = {
+    'percentage': 'change_percentage',
+    'volume': 'quote_volume',
+    'price': 'last',
+}
+_COMPARISONS = ('>=', '<=', '==', '!=', '>', '<')
+_TOKEN = re.compile(r"\s*(?:(\d+(?:\.\d*)?|\.\d+)|(>=|<=|==|!=|>|<|\(|\)|-)|([A-Za-z_]+))")
+
+class RuleSyntaxError(ValueError):
+    """DSL metni derlenemedi"""
+
+def default_entry_condition() -> str:
+    return f"percentage >= {Config.RUNTIME.initial_pump_threshold}"
+
+def default_ladder() -> str:
+    settings = Config.RUNTIME
+    return (f"second +{settings.second_signal_threshold}; level +{settings.next_signal_threshold}; "
+            f"below 100 add {settings.next_signal_threshold}; below 200 round 25; round 50")
+
+def _tokenize(text: str) -> List[str]:
+    tokens, position = [], 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise RuleSyntaxError(f"Beklenmeyen karakter: {text[position:position + 10]!r}")
+        tokens.append(match.group(match.lastindex))
+        position = match.end()
+    return tokens
+
+class _ConditionParser:
+    """or > and > not > karşılaştırma önceliğiyle skaler ve vektörel Python ifadesi üretir"""
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def parse(self) -> Tuple[str, str]:
+        scalar, vector = self._or()
+        if self.position != len(self.tokens):
+            raise RuleSyntaxError(f"Fazla ifade: {' '.join(self.tokens[self.position:])}")
+        return scalar, vector
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise RuleSyntaxError("İfade eksik")
+        self.position += 1
+        return token
+
+    def _or(self) -> Tuple[str, str]:
+        scalar, vector = self._and()
+        while self._peek() == 'or':
+            self.position += 1
+            right_scalar, right_vector = self._and()
+            scalar, vector = f"({scalar} or {right_scalar})", f"({vector} | {right_vector})"
+        return scalar, vector
+
+    def _and(self) -> Tuple[str, str]:
+        scalar, vector = self._not()
+        while self._peek() == 'and':
+            self.position += 1
+            right_scalar, right_vector = self._not()
+            scalar, vector = f"({scalar} and {right_scalar})", f"({vector} & {right_vector})"
+        return scalar, vector
+
+    def _not(self) -> Tuple[str, str]:
+        if self._peek() == 'not':
+            self.position += 1
+            scalar, vector = self._not()
+            return f"(not {scalar})", f"(~{vector})"
+        if self._peek() == '(':
+            self.position += 1
+            result = self._or()
+            if self._take() != ')':
+                raise RuleSyntaxError("')' eksik")
+            return result
+        return self._comparison()
+
+    def _comparison(self) -> Tuple[str, str]:
+        field = self._take()
+        if field not in CONDITION_FIELDS:
+            raise RuleSyntaxError(f"Bilinmeyen alan: {field} ({', '.join(CONDITION_FIELDS)})")
+        operator = self._take()
+        if operator not in _COMPARISONS:
+            raise RuleSyntaxError(f"Karşılaştırma bekleniyordu: {operator}")
+        number = _number(self)
+        return f"({field} {operator} {number!r})", f"({field} {operator} {number!r})"
+
+def _number(parser: _ConditionParser) -> float:
+    sign = -1.0 if parser._peek() == '-' else 1.0
+    if sign < 0:
+        parser.position += 1
+    token = parser._take()
+    try:
+        return sign * float(token)
+    except ValueError:
+        raise RuleSyntaxError(f"Sayı bekleniyordu: {token}")
+
+def compile_condition(text: str) -> Tuple[Callable[[Dict], bool], Callable[[Dict[str, np.ndarray]], np.ndarray]]:
+    """Koşulu (ticker -> bool, {alan: dizi} -> maske) fonksiyonlarına derler"""
+    scalar, vector = _ConditionParser(text).parse()
+    fields = [field for field in CONDITION_FIELDS if re.search(rf"\b{field}\b", scalar)]
+
+    # Sadece kullanılan alanlar ticker'dan okunur - elle yazılmış kontrol kadar iş
+    reads = "".join(f"    {field} = float(ticker.get({CONDITION_FIELDS[field]!r}) or 0)\n" for field in fields)
+    source = (f"def entry(ticker):\n{reads}    return {scalar}\n\n"
+              f"def entry_mask(columns):\n"
+              + "".join(f"    {field} = columns[{field!r}]\n" for field in fields)
+              + f"    with np.errstate(invalid='ignore'):\n        return np.asarray({vector}, dtype=bool)\n")
+    namespace = {'np': np}
+    exec(compile(source, f"<{ENTRY_SETTING}>", 'exec'), namespace)
+    return namespace['entry'], namespace['entry_mask']
+
+def compile_ladder(text: str) -> Callable[[float, int], float]:
+    """Merdiveni (ilk yüzde, sinyal sayısı) -> bir sonraki eşik fonksiyonuna derler"""
+    second = level_step = None
+    bands: List[Tuple[float, bool, float]] = []  # (üst sınır, yuvarla, adım)
+
+    for statement in filter(None, (part.strip() for part in re.split(r"[;\n]", text))):
+        words = statement.split()
+        try:
+            if words[0] == 'second' and len(words) == 2:
+                second = float(words[1])
+            elif words[0] == 'level' and len(words) == 2:
+                level_step = float(words[1])
+            elif words[0] == 'below' and len(words) == 4 and words[2] in ('add', 'round'):
+                bands.append((float(words[1]), words[2] == 'round', float(words[3])))
+            elif words[0] in ('add', 'round') and len(words) == 2:
+                bands.append((math.inf, words[0] == 'round', float(words[1])))
+            else:
+                raise RuleSyntaxError(f"Anlaşılmayan satır: {statement}")
+        except ValueError as e:
+            if isinstance(e, RuleSyntaxError):
+                raise
+            raise RuleSyntaxError(f"Sayı bekleniyordu: {statement}")
+
+    if second is None or level_step is None:
+        raise RuleSyntaxError("'second' ve 'level' tanımlanmalı")
+    if not bands or bands[-1][0] != math.inf:
+        raise RuleSyntaxError("Son satır koşulsuz olmalı ('add N' veya 'round N')")
+    if any(step <= 0 for _, _, step in bands) or [limit for limit, _, _ in bands] != sorted(limit for limit, _, _ in bands):
+        raise RuleSyntaxError("Adımlar pozitif, 'below' sınırları artan sırada olmalı")
+
+    # Bantlar tek if/elif zincirine açılır - döngü yok
+    lines = ["def next_threshold(initial_percentage, signal_count):",
+             "    if signal_count == 1:",
+             f"        return initial_percentage + {second!r}",
+             f"    level = initial_percentage + {second!r} + (signal_count - 2) * {level_step!r}"]
+    for limit, rounding, step in bands:
+        indent = "    "
+        if limit != math.inf:
+            lines.append(f"    if level < {limit!r}:")
+            indent = "        "
+        if rounding:
+            lines.append(f"{indent}return max(((level // {step!r}) + 1) * {step!r}, level + {step!r})")
+        else:
+            lines.append(f"{indent}return level + {step!r}")
+    namespace = {}
+    exec(compile("\n".join(lines) + "\n", f"<{LADDER_SETTING}>", 'exec'), namespace)
+    return namespace['next_threshold']
+
+@dataclass(frozen=True, slots=True)
+class CompiledRules:
+    """Birlikte devreye alınan derlenmiş kurallar - değiştirilmez"""
+    entry_condition: str
+    ladder: str
+    entry: Callable[[Dict], bool]
+    entry_mask: Callable[[Dict[str, np.ndarray]], np.ndarray]
+    next_threshold: Callable[[float, int], float]
+
+def compile_rules(entry_condition: str, ladder: str) -> CompiledRules:
+    entry, entry_mask = compile_condition(entry_condition)
+    return CompiledRules(entry_condition, ladder, entry, entry_mask, compile_ladder(ladder))
+
+class SignalRules:
+    def __init__(self, settings=None):
+        self.settings = settings  # SettingsService, None ise sadece Config varsayılanları (replay)
+        self.current = compile_rules(default_entry_condition(), default_ladder())
+
+    def refresh(self) -> bool:
+        """Ayar metinleri veya varsayılanların dayandığı Config eşikleri değiştiyse derleyip devreye alır"""
+        settings = self.settings
+        entry_condition = ((settings.get(ENTRY_SETTING) if settings else None) or '').strip() or default_entry_condition()
+        ladder = ((settings.get(LADDER_SETTING) if settings else None) or '').strip() or default_ladder()
+        current = self.current
+        if entry_condition == current.entry_condition and ladder == current.ladder:
+            return False
+
+        try:
+            compiled = compile_rules(entry_condition, ladder)
+        except RuleSyntaxError as e:
+            print(f"❌ Sinyal kuralları derlenemedi, eskileri kullanılıyor: {e}")
+            return False
+
+        self.current = compiled  # Tek atama - okuyan thread'ler eski veya yeni setin tamamını görür
+        print(f"🧩 Sinyal kuralları güncellendi: {entry_condition} | {ladder}")
+        return True
+
+def _benchmark(calls: int = 200000):
+    """Derlenmiş kurallar vs elle yazılmış eşik kodu"""
+    import time
+
+    rules = compile_rules(default_entry_condition(), default_ladder())
+
+    settings = Config.RUNTIME
+
+    def hand_written_ladder(initial_percentage: float, current_signal_count: int) -> float:
+        if current_signal_count == 1:
+            return initial_percentage + settings.second_signal_threshold
+        if current_signal_count == 2:
+            current_level = initial_percentage + settings.second_signal_threshold
+        else:
+            current_level = (initial_percentage + settings.second_signal_threshold
+                             + (current_signal_count - 2) * settings.next_signal_threshold)
+        if current_level < 100:
+            return current_level + settings.next_signal_threshold
+        elif current_level < 200:
+            return max(((current_level // 25) + 1) * 25, current_level + 25)
+        return max(((current_level // 50) + 1) * 50, current_level + 50)
+
+    rng = np.random.default_rng(2)
+    cases = [(float(initial), int(count)) for initial, count in
+             zip(rng.uniform(35, 150, calls), rng.integers(1, 25, calls))]
+    assert all(rules.next_threshold(*case) == hand_written_ladder(*case) for case in cases[:20000])
+
+    started = time.perf_counter()
+    for case in cases:
+        hand_written_ladder(*case)
+    hand_ladder = time.perf_counter() - started
+    started = time.perf_counter()
+    for case in cases:
+        rules.next_threshold(*case)
+    compiled_ladder = time.perf_counter() - started
+
+    tickers = [{'currency_pair': f"C{i}_USDT", 'change_percentage': f"{value:.2f}", 'last': '1', 'quote_volume': '1'}
+               for i, value in enumerate(rng.uniform(-20, 60, calls))]
+    threshold = settings.initial_pump_threshold
+    started = time.perf_counter()
+    hand_count = sum(1 for ticker in tickers if float(ticker.get('change_percentage', 0)) >= threshold)
+    hand_entry = time.perf_counter() - started
+    entry = rules.entry
+    started = time.perf_counter()
+    compiled_count = sum(1 for ticker in tickers if entry(ticker))
+    compiled_entry = time.perf_counter() - started
+    assert hand_count == compiled_count
+
+    columns = {'percentage': np.array([float(t['change_percentage']) for t in tickers]),
+               'volume': np.ones(calls), 'price': np.ones(calls)}
+    started = time.perf_counter()
+    mask_count = int(rules.entry_mask(columns).sum())
+    mask_time = time.perf_counter() - started
+    assert mask_count == hand_count
+
+    print(f"🧩 {calls} çağrı")
+    print(f"   merdiven  elle: {hand_ladder / calls * 1e9:6.0f} ns  derlenmiş: {compiled_ladder / calls * 1e9:6.0f} ns")
+    print(f"   giriş     elle: {hand_entry / calls * 1e9:6.0f} ns  derlenmiş: {compiled_entry / calls * 1e9:6.0f} ns"
+          f"  maske: {mask_time / calls * 1e9:5.1f} ns")
+
+if __name__ == "__main__":
+    _benchmark()
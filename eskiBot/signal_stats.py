@@ -0,0 +1,190 @@
+"""
+Sinyal istatistikleri - Artımlı sayaçlar ve dakika/saat/gün kovaları
+
+Her sinyal sabit sayıda sözlük artırımıyla sayılır (tür, hacim kategorisi ve sembol boyutlarında); biriken farklar
+periyodik olarak signal_stat_buckets özet tablosuna eklenir. Panel kovaları bu tablodan okur, signals taranmaz.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func
+from config import Config
+from database import get_db_session, SignalStatBucket
+
+GRANULARITIES = {'minute': 60, 'hour': 3600, 'day': 86400}  # Kova genişliği (saniye)
+DIMENSIONS = ('total', 'type', 'category', 'symbol')
+DAY_OFFSET = 3 * 3600  # Gün kovaları Türkiye gece yarısından başlar
+
+def bucket_start(timestamp: float, granularity: str) -> float:
+    """Epoch saniyenin düştüğü kovanın başlangıcı"""
+    size = GRANULARITIES[granularity]
+    offset = DAY_OFFSET if granularity == 'day' else 0
+    return (timestamp + offset) // size * size - offset
+
+class SignalStats:
+    def __init__(self, clock):
+        self.clock = clock
+        self.total_signals = 0  # Kalıcı - yeniden başlatmada gün kovalarından yüklenir
+        self.last_signal_at: Optional[float] = None  # Epoch saniye
+        self.by_type: Dict[str, int] = {}  # Bu süreç başladığından beri
+        self._pending: Dict[Tuple[str, float, str, str], int] = {}  # (kova, başlangıç, boyut, anahtar) -> artış
+        self._loaded = False
+        self._last_flush = None  # Monotonic saniye
+        self._last_prune = None  # Monotonic saniye
+
+        # Sayaçlar
+        self.flushes = 0
+        self.flush_errors = 0
+
+    def record(self, signal_data: Dict):
+        """Gönderilen sinyali sayar - 3 kova x 4 boyut artırım, DB'ye dokunmaz"""
+        timestamp = self.clock.time()
+        signal_type = signal_data.get('signal_type', 'new')
+        self.total_signals += 1
+        self.last_signal_at = timestamp
+        self.by_type[signal_type] = self.by_type.get(signal_type, 0) + 1
+
+        keys = (
+            ('total', 'all'),
+            ('type', signal_type),
+            ('category', (signal_data.get('volume_category') or '-')[:50]),
+            ('symbol', signal_data['symbol'][:50]),
+        )
+        pending = self._pending
+        for granularity in GRANULARITIES:
+            start = bucket_start(timestamp, granularity)
+            for dimension, key in keys:
+                bucket = (granularity, start, dimension, key)
+                pending[bucket] = pending.get(bucket, 0) + 1
+
+    def flush(self, now: float, force: bool = False) -> bool:
+        """Biriken artışları özet tabloya ekler"""
+        if not force and self._last_flush is not None and now - self._last_flush < Config.STATS_FLUSH_INTERVAL:
+            return False
+        self._last_flush = now
+
+        # Yazmadan önce kalıcı toplam okunmalı - yoksa bu süreçte sayılanlar iki kez eklenir
+        if not self._loaded and not self._load():
+            return False
+
+        pending, self._pending = self._pending, {}
+        prune = self._last_prune is None or now - self._last_prune >= 3600
+        if not pending and not prune:
+            return True
+
+        groups = defaultdict(dict)
+        for (granularity, start, dimension, key), delta in pending.items():
+            groups[(granularity, start)][(dimension, key)] = delta
+
+        db = get_db_session()
+        try:
+            for (granularity, start), deltas in groups.items():
+                start_time = datetime.utcfromtimestamp(start)
+                rows = {(row.dimension, row.key): row for row in db.query(SignalStatBucket).filter(
+                    SignalStatBucket.granularity == granularity, SignalStatBucket.bucket_start == start_time)}
+                for (dimension, key), delta in deltas.items():
+                    row = rows.get((dimension, key))
+                    if row is None:
+                        db.add(SignalStatBucket(granularity=granularity, bucket_start=start_time,
+                                                dimension=dimension, key=key, count=delta))
+                    else:
+                        row.count = SignalStatBucket.count + delta
+
+            if prune:
+                self._last_prune = now
+                self._prune(db)
+
+            db.commit()
+            self.flushes += 1
+            return True
+
+        except Exception as e:
+            db.rollback()
+            self.flush_errors += 1
+            # Yazılamayanlar bir sonraki denemede tekrar eklenir
+            for bucket, delta in pending.items():
+                self._pending[bucket] = self._pending.get(bucket, 0) + delta
+            print(f"❌ İstatistik yazma hatası: {e}")
+            return False
+        finally:
+            db.close()
+
+    def _load(self) -> bool:
+        """Kalıcı toplamı ve son sinyal dakikasını okur"""
+        db = get_db_session()
+        try:
+            total = db.query(func.sum(SignalStatBucket.count)).filter(
+                SignalStatBucket.granularity == 'day', SignalStatBucket.dimension == 'total').scalar()
+            last_minute = db.query(func.max(SignalStatBucket.bucket_start)).filter(
+                SignalStatBucket.granularity == 'minute', SignalStatBucket.dimension == 'total').scalar()
+        except Exception as e:
+            print(f"❌ İstatistik okuma hatası: {e}")
+            return False
+        finally:
+            db.close()
+
+        self.total_signals += int(total or 0)
+        if last_minute is not None and self.last_signal_at is None:
+            self.last_signal_at = (last_minute - datetime(1970, 1, 1)).total_seconds()
+        self._loaded = True
+        return True
+
+    def _prune(self, db):
+        """Süresi dolan dakika ve saat kovalarını siler"""
+        now = datetime.utcfromtimestamp(self.clock.time())
+        for granularity, retention in (('minute', timedelta(hours=Config.STATS_MINUTE_RETENTION)),
+                                       ('hour', timedelta(days=Config.STATS_HOUR_RETENTION))):
+            db.query(SignalStatBucket).filter(
+                SignalStatBucket.granularity == granularity,
+                SignalStatBucket.bucket_start < now - retention,
+            ).delete(synchronize_session=False)
+
+def load_buckets(db, granularity: str, dimension: str, since: datetime, top: int = None) -> Dict:
+    """Özet tablodan kovalar - boyutun en çok sinyal alan `top` anahtarı, diğerleri 'other' altında"""
+    rows = db.query(SignalStatBucket.bucket_start, SignalStatBucket.key, SignalStatBucket.count).filter(
+        SignalStatBucket.granularity == granularity,
+        SignalStatBucket.dimension == dimension,
+        SignalStatBucket.bucket_start >= since,
+    ).order_by(SignalStatBucket.bucket_start).all()
+
+    totals: Dict[str, int] = defaultdict(int)
+    for _, key, count in rows:
+        totals[key] += count
+    keep = None
+    if top and len(totals) > top:
+        keep = set(sorted(totals, key=totals.get, reverse=True)[:top])
+
+    buckets: Dict[datetime, Dict[str, int]] = {}
+    for start, key, count in rows:
+        counts = buckets.setdefault(start, defaultdict(int))
+        counts[key if keep is None or key in keep else 'other'] += count
+
+    ordered = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return {
+        'granularity': granularity,
+        'dimension': dimension,
+        'since': since.isoformat(),
+        'totals': dict(ordered[:top] if top else ordered),
+        'buckets': [{'bucket_start': start.isoformat(), 'counts': dict(counts)} for start, counts in buckets.items()],
+    }
+
+def _benchmark(signals: int = 100_000):
+    """Sinyal başına kayıt maliyeti ve tek flush'ta yazılan satır sayısı"""
+    import time
+    from clock import SimulatedClock
+
+    clock = SimulatedClock(1_700_000_000.0)
+    stats = SignalStats(clock)
+    rng_types = ('new', 'second', 'third', 'momentum', 'pusu')
+    started = time.perf_counter()
+    for index in range(signals):
+        clock.set(1_700_000_000.0 + index * 0.5)
+        stats.record({'symbol': f"C{index % 300}", 'signal_type': rng_types[index % len(rng_types)],
+                      'volume_category': ('low', 'medium', 'high')[index % 3]})
+    elapsed = time.perf_counter() - started
+    print(f"📈 {signals} sinyal kaydı: {elapsed / signals * 1e6:.2f} µs / sinyal, "
+          f"{len(stats._pending)} bekleyen kova satırı ({signals * 0.5 / 3600:.1f} saatlik veri)")
+
+if __name__ == "__main__":
+    _benchmark()
@@ -4,7 +4,7 @@ Telegram Bot entegrasyonu
 
 import requests
 import json
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime, timezone, timedelta
 from config import Config
 
@@ -13,16 +13,46 @@ class TelegramBot:
         self.bot_token = Config.TELEGRAM_BOT_TOKEN
         self.group_id = Config.TELEGRAM_GROUP_ID
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
+        self.followup_mode = Config.TELEGRAM_FOLLOWUP_MODE
+        self.major_tiers = set(Config.TELEGRAM_MAJOR_TIERS)
+        
+        # Sayaçlar
+        self.messages_sent = 0
+        self.messages_edited = 0
     
     def send_signal(self, signal_data: Dict) -> bool:
-        """Formatlanmış sinyal mesajı gönderir"""
+        """Formatlanmış sinyal mesajı gönderir
+
+        edit/reply modunda ara sinyaller coinin son yeni mesajını günceller veya ona yanıt verir;
+        gönderilen yeni mesajın id'si signal_data['telegram_message_id'] alanına yazılır.
+        """
         try:
             message = self._format_signal_message(signal_data)
-            return self._send_message(message)
+            anchor = self._followup_anchor(signal_data)
+            if anchor and self.followup_mode == 'edit':
+                if self._edit_message(anchor, message):
+                    return True
+                # Mesaj silinmiş veya düzenlenemiyor - yeni mesaj gönderilir
+            
+            reply_to = anchor if self.followup_mode == 'reply' else None
+            message_id = self._send_message(message, reply_to=reply_to)
+            if message_id is None:
+                return False
+            if reply_to is None:
+                signal_data['telegram_message_id'] = message_id
+            return True
         except Exception as e:
             print(f"Sinyal gönderme hatası: {e}")
             return False
     
+    def _followup_anchor(self, data: Dict) -> Optional[int]:
+        """Ara sinyalin bağlanacağı mesaj - yeni mesaj gerekiyorsa None"""
+        if self.followup_mode == 'send':
+            return None
+        if data.get('signal_number', 1) in self.major_tiers:
+            return None
+        return data.get('telegram_message_id')
+    
     def _format_signal_message(self, data: Dict) -> str:
         """Sinyal mesajını formatlar"""
         symbol = data['symbol']
@@ -37,6 +67,16 @@ class TelegramBot:
         # Başlık ve sinyal türü
         if signal_type == 'new':
             header = f"#{symbol} • 🆕 Sinyal"
+        elif signal_type == 'momentum':
+            header = f"#{symbol} • ⚡ Momentum Sinyali"
+        elif signal_type == 'pusu':
+            header = f"#{symbol} • 🎯 Pusu Sinyali"
+        elif signal_type == 'cluster':
+            header = f"#{symbol} • 🧩 Küme Pompası ({len(data['cluster']['members'])} coin)"
+        elif signal_type == 'special_up':
+            header = f"#{symbol} • ⭐ Özel Takip ⬆️"
+        elif signal_type == 'special_down':
+            header = f"#{symbol} • ⭐ Özel Takip ⬇️"
         else:
             signal_num = data.get('signal_number', 2)  # Sinyal numarasını al
             signal_number_emoji = self._get_signal_number(signal_type, signal_num)
@@ -50,8 +90,12 @@ class TelegramBot:
         ]
         
         # Artış yüzdesi formatı - EN ÜSTTE
-        if signal_type == 'new':
+        if signal_type in ('new', 'momentum', 'pusu', 'cluster'):
             message_parts.append(f"Artış Yüzdesi: %+{percentage:.2f}")
+        elif signal_type in ('special_up', 'special_down'):
+            previous_percentage = data.get('previous_percentage', 0)
+            message_parts.append(f"Baz Fiyata Göre: %{previous_percentage:+.2f} --> %{percentage:+.2f}")
+            message_parts.append(f"Baz Fiyat: ${data.get('base_price') or 0:.8f}")
         else:
             # 3. sinyalden itibaren bir önceki sinyalin yüzdesini göster
             signal_number = data.get('signal_number', 2)
@@ -66,6 +110,35 @@ class TelegramBot:
             initial_percentage = data.get('initial_percentage', percentage)
             message_parts.append(f"İlk Sinyal: %{initial_percentage:.2f}")
         
+        # Kısa vadeli momentum satırı
+        momentum = data.get('momentum')
+        if momentum:
+            momentum_line = self._format_momentum(momentum)
+            if momentum_line:
+                message_parts.append(momentum_line)
+        
+        # Küme üyeleri ve pencere içi yükselişleri
+        cluster = data.get('cluster')
+        if cluster:
+            members = " • ".join(f"{member['symbol']} %{member['return']:+.1f}" for member in cluster['members'][:10])
+            message_parts.append(f"🧩 {members}")
+            message_parts.append(f"🧩 Ortalama: %{cluster['mean_return']:+.1f} • Korelasyon: {cluster['mean_correlation']:.2f}")
+        
+        # Pusu metrikleri
+        pusu = data.get('pusu')
+        if pusu:
+            message_parts.append(
+                f"🎯 24s Volatilite: %{pusu['volatility_24h']:.2f} • Sıkışma: %{pusu['compression'] * 100:.0f} "
+                f"• Hacim: x{pusu['volume_ratio']:.1f}"
+            )
+        
+        # Emir defteri likiditesi
+        liquidity = data.get('liquidity')
+        if liquidity:
+            message_parts.append(self._format_liquidity(liquidity))
+            if not liquidity['tradeable']:
+                message_parts.append(f"⚠️ Sığ tahta: {', '.join(liquidity['reasons'])}")
+        
         message_parts.extend([
             "",
             f"🎯 Fiyat: ${price:.8f}",
@@ -98,6 +171,24 @@ class TelegramBot:
         
         return "\n".join(message_parts)
     
+    def _format_liquidity(self, liquidity: Dict) -> str:
+        """Spread ve verilen emir büyüklüğü için alış/satış kayması"""
+        def slippage(value):
+            return "yetersiz" if value is None else f"%{value:.2f}"
+        return (f"💧 Spread: %{liquidity['spread']:.2f} • Kayma (${liquidity['notional']:,.0f}): "
+                f"Al {slippage(liquidity['buy_slippage'])} / Sat {slippage(liquidity['sell_slippage'])}")
+    
+    def _format_momentum(self, momentum: Dict) -> str:
+        """Momentum değerlerini tek satırda formatlar"""
+        labels = [('1m', '1dk'), ('5m', '5dk'), ('15m', '15dk'), ('1h', '1s')]
+        parts = [f"{label}: %{momentum[key]:+.1f}" for key, label in labels if key in momentum]
+        if not parts:
+            return ""
+        line = "⚡ " + " • ".join(parts)
+        if 'volume_accel' in momentum:
+            line += f" • Hacim İvmesi: x{momentum['volume_accel']:.1f}"
+        return line
+    
     def _get_signal_number(self, signal_type: str, signal_number: int = None) -> str:
         """Sinyal numarasını emoji formatında döndürür"""
         emoji_numbers = {
@@ -141,38 +232,89 @@ class TelegramBot:
         else:
             return f"{volume:.0f}"
     
-    def _send_message(self, message: str) -> bool:
-        """Telegram'a mesaj gönderir"""
+    def send_alerts(self, chat_id: str, alerts: List) -> bool:
+        """Bir kullanıcının tetiklenen alarmlarını kendi sohbetine tek mesajda gönderir"""
+        try:
+            return self._send_message(self._format_alert_message(alerts), chat_id=chat_id) is not None
+        except Exception as e:
+            print(f"Alarm gönderme hatası: {e}")
+            return False
+    
+    def _format_alert_message(self, alerts: List) -> str:
+        """(kural, eşleşme) listesini formatlar"""
+        message_parts = [f"🔔 Alarm ({len(alerts)})", ""]
+        for rule, match in alerts[:30]:
+            message_parts.append(
+                f"#{match['symbol']} {rule.field} {rule.operator} {rule.threshold:g} "
+                f"({match['previous']:g} → {match['value']:g})"
+            )
+        if len(alerts) > 30:
+            message_parts.append(f"... +{len(alerts) - 30}")
+        return "\n".join(message_parts)
+    
+    def _post(self, method: str, data: Dict) -> Dict:
+        """Bot API çağrısı - hata yanıtları da JSON döner"""
+        response = requests.post(f"{self.base_url}/{method}", data=data, timeout=10)
+        if response.status_code >= 500:
+            response.raise_for_status()
+        return response.json()
+    
+    def _send_message(self, message: str, chat_id: str = None, reply_to: int = None) -> Optional[int]:
+        """Telegram'a mesaj gönderir - chat_id verilmezse grup; gönderilen mesajın id'si, başarısızsa None"""
         try:
-            url = f"{self.base_url}/sendMessage"
             data = {
-                'chat_id': self.group_id,
+                'chat_id': chat_id or self.group_id,
                 'text': message,
                 'parse_mode': 'HTML'
             }
+            if reply_to:
+                data['reply_to_message_id'] = reply_to
+                data['allow_sending_without_reply'] = 'true'
             
-            response = requests.post(url, data=data, timeout=10)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._post('sendMessage', data)
             if result.get('ok'):
+                self.messages_sent += 1
                 print(f"Sinyal başarıyla gönderildi: {message[:50]}...")
-                return True
+                return result['result']['message_id']
             else:
                 print(f"Telegram API hatası: {result}")
-                return False
+                return None
                 
         except requests.exceptions.RequestException as e:
             print(f"Telegram bağlantı hatası: {e}")
-            return False
+            return None
         except Exception as e:
             print(f"Mesaj gönderme hatası: {e}")
+            return None
+    
+    def _edit_message(self, message_id: int, message: str, chat_id: str = None) -> bool:
+        """Gönderilmiş mesajın metnini günceller"""
+        try:
+            result = self._post('editMessageText', {
+                'chat_id': chat_id or self.group_id,
+                'message_id': message_id,
+                'text': message,
+                'parse_mode': 'HTML'
+            })
+            # Aynı metin tekrar gönderildiyse mesaj zaten güncel
+            if result.get('ok') or 'message is not modified' in result.get('description', ''):
+                self.messages_edited += 1
+                print(f"Sinyal mesajı güncellendi: {message[:50]}...")
+                return True
+            print(f"Telegram düzenleme hatası: {result}")
+            return False
+            
+        except requests.exceptions.RequestException as e:
+            print(f"Telegram bağlantı hatası: {e}")
+            return False
+        except Exception as e:
+            print(f"Mesaj düzenleme hatası: {e}")
             return False
     
     def send_test_message(self) -> bool:
         """Test mesajı gönderir"""
         test_message = "🤖 Gate.io Sinyal Botu aktif edildi!"
-        return self._send_message(test_message)
+        return self._send_message(test_message) is not None
     
     def format_trade_history_line(self, trade_data: Dict) -> str:
         """Trade history satırını formatlar"""
@@ -185,3 +327,50 @@ class TelegramBot:
         volume_change = trade_data.get('volume_change', 0)
         
         return f"{date_str} {time_str}    +{amount:,.2f}  {before_change:.1f}% => {after_change:.1f}% - V: % {volume_change:.1f}"
+
+def _benchmark(record_path: str = None):
+    """Pompa fırtınasında mod başına giden yeni mesaj ve düzenleme sayısı
+
+    Kayıt verilirse backtest sinyalleri, verilmezse 30 coinin 15'er sinyallik sentetik pompası kullanılır.
+    """
+    import contextlib
+    import io
+    
+    if record_path:
+        from backtest import BacktestEngine, MarketRecording
+        signals = BacktestEngine(MarketRecording.load(record_path)).run()
+    else:
+        signals = [{'symbol': f"C{coin}", 'signal_number': number} for coin in range(30) for number in range(1, 16)]
+    
+    class CountingTelegramBot(TelegramBot):
+        def __init__(self, mode: str):
+            super().__init__()
+            self.followup_mode = mode
+            self._next_id = 0
+        
+        def _format_signal_message(self, data: Dict) -> str:
+            return f"{data['symbol']} {data.get('signal_number', 1)}"
+        
+        def _post(self, method: str, data: Dict) -> Dict:
+            self._next_id += 1
+            return {'ok': True, 'result': {'message_id': self._next_id}}
+    
+    print(f"📨 {len(signals)} sinyal, yeni mesaj gereken kademeler: {sorted(Config.TELEGRAM_MAJOR_TIERS)}")
+    print(f"{'mod':>6} {'yeni mesaj':>11} {'düzenleme':>10} {'azalma':>7}")
+    baseline = None
+    for mode in ('send', 'reply', 'edit'):
+        bot = CountingTelegramBot(mode)
+        anchors = {}  # SignalManager'daki tracker.telegram_message_id yerine
+        with contextlib.redirect_stdout(io.StringIO()):
+            for signal in signals:
+                data = dict(signal)
+                if data.get('signal_number', 1) >= 2:
+                    data['telegram_message_id'] = anchors.get(data['symbol'])
+                if bot.send_signal(data) and data.get('telegram_message_id'):
+                    anchors[data['symbol']] = data['telegram_message_id']
+        baseline = baseline or bot.messages_sent
+        print(f"{mode:>6} {bot.messages_sent:>11} {bot.messages_edited:>10} {baseline / bot.messages_sent:>6.1f}x")
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
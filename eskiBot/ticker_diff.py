@@ -0,0 +1,79 @@
+"""
+Artımlı ticker karşılaştırma - Taramalar arasında alanları değişmeyen pariteleri ayıklar
+"""
+
+import math
+from typing import Dict, List, Set
+
+class TickerDiff:
+    FIELDS = ('last', 'change_percentage', 'quote_volume')
+
+    def __init__(self):
+        self._previous: Dict[str, tuple] = {}
+        self._dirty: Set[str] = set()  # Değişmese de yeniden değerlendirilecek pariteler
+
+        # Sayaçlar
+        self.scans = 0
+        self.pairs_seen = 0
+        self.pairs_changed = 0
+        self.eval_seconds = 0.0
+        self.saved_seconds = 0.0
+        self.last_dispersion = 0.0  # Son taramada paritelerin fiyat getirisi standart sapması (%)
+
+    def changed(self, tickers: List[Dict]) -> List[Dict]:
+        """Bir önceki snapshot'a göre ham alanları değişen (veya kirli işaretlenen) ticker'ları döndürür"""
+        previous = self._previous
+        dirty = self._dirty
+        current: Dict[str, tuple] = {}
+        changed_tickers = []
+        return_sum = 0.0
+        return_square_sum = 0.0
+
+        for ticker in tickers:
+            currency_pair = ticker['currency_pair']
+            values = (ticker.get('last'), ticker.get('change_percentage'), ticker.get('quote_volume'))
+            current[currency_pair] = values
+            old_values = previous.get(currency_pair)
+            if old_values != values or currency_pair in dirty:
+                changed_tickers.append(ticker)
+                # Taramadan taramaya fiyat getirisi - değişmeyenlerin getirisi 0
+                if old_values is not None and old_values[0] != values[0]:
+                    try:
+                        change = float(values[0]) / float(old_values[0]) - 1
+                        return_sum += change
+                        return_square_sum += change * change
+                    except (TypeError, ValueError, ZeroDivisionError):
+                        pass
+
+        if previous and tickers:
+            mean = return_sum / len(tickers)
+            self.last_dispersion = math.sqrt(max(return_square_sum / len(tickers) - mean * mean, 0.0)) * 100
+
+        self._previous = current
+        self._dirty = set()
+        return changed_tickers
+
+    def mark_dirty(self, currency_pair: str):
+        """Takip durumu değişen pariteyi bir sonraki taramada değerlendirmeye zorlar"""
+        self._dirty.add(currency_pair)
+
+    def invalidate(self):
+        """Eşikler veya takip tablosu topluca değiştiğinde tüm pariteleri yeniden değerlendirir"""
+        self._previous = {}
+
+    def record_pass(self, seen: int, evaluated: int, seconds: float):
+        """Tarama sayaçlarını günceller - atlanan pariteler için tasarrufu ortalama maliyetle tahmin eder"""
+        self.scans += 1
+        self.pairs_seen += seen
+        self.pairs_changed += evaluated
+        self.eval_seconds += seconds
+        if evaluated:
+            self.saved_seconds += (seen - evaluated) * seconds / evaluated
+
+    def stats(self) -> Dict:
+        return {
+            'scans': self.scans,
+            'changed_ratio': self.pairs_changed / self.pairs_seen if self.pairs_seen else 0.0,
+            'eval_ms': self.eval_seconds * 1000,
+            'saved_ms': self.saved_seconds * 1000,
+        }
@@ -0,0 +1,214 @@
+"""
+Takip tablosu - Slotted tracker kayıtları ve vade (due) indeksi
+
+Takip ve temizlik geçişleri tüm coinleri dolaşmak yerine sadece vadesi gelen kovaları okur.
+Zaman alanları time.monotonic() saniyesidir.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+@dataclass(slots=True)
+class CoinTracker:
+    """Takip edilen coin bilgileri"""
+    symbol: str
+    currency_pair: str
+    base_price: float  # İlk tespit edilen fiyat
+    current_price: float
+    initial_percentage: float  # İlk sinyal yüzdesi
+    current_percentage: float
+    previous_signal_percentage: float  # Bir önceki sinyalin yüzdesi
+    signal_count: int  # Kaç sinyal verildi
+    last_signal_at: float  # Monotonic saniye
+    last_scan_at: float  # Monotonic saniye
+    is_following: bool  # 45 saniye takip modunda mı
+    volume_24h: float
+    next_followup_at: float = 0.0  # Bir sonraki takip kontrolü (monotonic)
+    observed_percentage: float = 0.0  # Son takip kontrolündeki 24s değişim
+    observed_at: float = 0.0  # Son takip kontrolü (monotonic, 0 = henüz yok)
+    velocity: float = 0.0  # Değişim hızı (yüzde puan / saniye)
+    urgency: float = math.inf  # Tahmini tetiğe kalan süre - küçük olan önce kontrol edilir
+    telegram_message_id: Optional[int] = None  # Ara sinyallerin güncellediği/yanıtladığı mesaj (sadece bellekte)
+
+class _DueIndex:
+    """Vade zamanı -> sembol kovaları; kova anahtarı ceil(vade / çözünürlük)"""
+
+    def __init__(self, resolution: float):
+        self.resolution = resolution
+        self._buckets: Dict[int, List[str]] = {}
+        self._cursor = None  # İşlenmemiş en küçük kova
+
+    def add(self, symbol: str, due: float):
+        key = self.key(due)
+        if self._cursor is not None and key < self._cursor:
+            key = self._cursor
+        self._buckets.setdefault(key, []).append(symbol)
+
+    def key(self, due: float) -> int:
+        return math.ceil(due / self.resolution)
+
+    def pop(self, now: float):
+        """Vadesi gelmiş kovalardaki (kova anahtarı, sembol) çiftlerini döndürür"""
+        limit = math.floor(now / self.resolution)
+        if not self._buckets:
+            self._cursor = limit + 1
+            return
+        if self._cursor is None:
+            # İmleç gelecekteki bir kovaya atlamaz - sonradan eklenen daha erken vadeler ileri itilmesin
+            self._cursor = min(min(self._buckets), limit + 1)
+
+        while self._cursor <= limit:
+            key = self._cursor
+            self._cursor += 1
+            for symbol in self._buckets.pop(key, ()):
+                yield key, symbol
+
+    def clear(self):
+        self._buckets.clear()
+        self._cursor = None
+
+class TrackerStore:
+    """Dict arayüzlü tracker tablosu - takip ve 24 saat temizlik vadelerini kovalarda tutar"""
+
+    def __init__(self, followup_interval: float, max_age: float = 86400):
+        self.followup_interval = followup_interval
+        self.max_age = max_age
+        self._trackers: Dict[str, CoinTracker] = {}
+        self.following_count = 0  # is_following eklendikten sonra değişmez - sayaç ekleme/silmede güncellenir
+        self._followups = _DueIndex(resolution=1)
+        self._expiries = _DueIndex(resolution=60)
+
+    # Dict arayüzü
+    def __len__(self) -> int:
+        return len(self._trackers)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._trackers
+
+    def __getitem__(self, symbol: str) -> CoinTracker:
+        return self._trackers[symbol]
+
+    def __setitem__(self, symbol: str, tracker: CoinTracker):
+        previous = self._trackers.get(symbol)
+        self.following_count += tracker.is_following - (previous.is_following if previous else 0)
+        self._trackers[symbol] = tracker
+        self.schedule_followup(tracker, tracker.last_scan_at + self.followup_interval)
+        self.touch_signal(tracker)
+
+    def __delitem__(self, symbol: str):
+        self.following_count -= self._trackers.pop(symbol).is_following
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._trackers)
+
+    def get(self, symbol: str, default=None):
+        return self._trackers.get(symbol, default)
+
+    def items(self):
+        return self._trackers.items()
+
+    def values(self):
+        return self._trackers.values()
+
+    def keys(self):
+        return self._trackers.keys()
+
+    def clear(self):
+        self._trackers.clear()
+        self.following_count = 0
+        self._followups.clear()
+        self._expiries.clear()
+
+    # Vade indeksi
+    def schedule_followup(self, tracker: CoinTracker, due: float):
+        """Coin'in bir sonraki takip kontrolü zamanını ayarlar"""
+        tracker.next_followup_at = due
+        self._followups.add(tracker.symbol, due)
+
+    def touch_signal(self, tracker: CoinTracker):
+        """Yeni sinyal sonrası 24 saatlik temizlik vadesini ekler"""
+        self._expiries.add(tracker.symbol, tracker.last_signal_at + self.max_age)
+
+    def pop_due_followups(self, now: float) -> List[CoinTracker]:
+        """Takip vadesi gelmiş coinleri döndürür - çağıran yeniden schedule_followup yapmalıdır"""
+        due_trackers = []
+        for _, symbol in self._followups.pop(now):
+            tracker = self._trackers.get(symbol)
+            # Silinmiş, daha ileriye planlanmış veya bu geçişte zaten alınmış coinleri atla
+            if tracker is None or not tracker.is_following or tracker.next_followup_at > now:
+                continue
+            tracker.next_followup_at = math.inf
+            due_trackers.append(tracker)
+        return due_trackers
+
+    def pop_expired(self, now: float) -> List[str]:
+        """Son sinyalinden max_age geçmiş coinleri tablodan çıkarır ve sembollerini döndürür"""
+        expired = []
+        for _, symbol in self._expiries.pop(now):
+            tracker = self._trackers.get(symbol)
+            # Sonradan sinyal aldıysa daha yeni bir vade kaydı vardır
+            if tracker is None or tracker.last_signal_at + self.max_age > now:
+                continue
+            del self[symbol]
+            expired.append(symbol)
+        return expired
+
+def _benchmark(count: int = 10000, passes: int = 100):
+    """10k tracker için bellek ve geçiş süresi: eski dict+datetime yöntemi vs TrackerStore"""
+    import time
+    import tracemalloc
+    from datetime import datetime, timedelta, timezone
+    from dataclasses import make_dataclass
+
+    turkey_timezone = timezone(timedelta(hours=3))
+    LegacyTracker = make_dataclass('LegacyTracker', [
+        'symbol', 'currency_pair', 'base_price', 'current_price', 'initial_percentage', 'current_percentage',
+        'previous_signal_percentage', 'signal_count', 'last_signal_time', 'last_scan_time', 'is_following',
+        'volume_24h'])
+
+    # Eski yapı
+    tracemalloc.start()
+    now_dt = datetime.now(turkey_timezone)
+    legacy = {}
+    for i in range(count):
+        signal_time = now_dt - timedelta(seconds=i % 45, microseconds=i)
+        scan_time = now_dt - timedelta(seconds=i % 45, microseconds=i + 1)
+        legacy[f"C{i}"] = LegacyTracker(f"C{i}", f"C{i}_USDT", 1.0, 1.0, 35.0, 35.0, 35.0, 1,
+                                        signal_time, scan_time, True, 1e5)
+    legacy_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(passes):
+        current_time = datetime.now(turkey_timezone)
+        due = [s for s, t in legacy.items() if t.is_following and (current_time - t.last_scan_time).total_seconds() >= 45]
+        expired = [s for s, t in legacy.items() if (current_time - t.last_signal_time).total_seconds() > 86400]
+    legacy_pass = (time.perf_counter() - started) / passes
+
+    # TrackerStore
+    tracemalloc.start()
+    now = time.monotonic()
+    store = TrackerStore(followup_interval=45)
+    for i in range(count):
+        seen = now - (i % 45) - i * 1e-6
+        store[f"C{i}"] = CoinTracker(f"C{i}", f"C{i}_USDT", 1.0, 1.0, 35.0, 35.0, 35.0, 1, seen, seen, True, 1e5)
+    store_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Her saniye ~count/45 coin vadesine gelir
+    started = time.perf_counter()
+    for step in range(passes):
+        tick = now + step
+        for tracker in store.pop_due_followups(tick):
+            tracker.last_scan_at = tick
+            store.schedule_followup(tracker, tick + 45)
+        store.pop_expired(tick)
+    store_pass = (time.perf_counter() - started) / passes
+
+    print(f"📦 {count} tracker")
+    print(f"   dict + datetime : {legacy_memory / 1024:8.0f} KB, {legacy_pass * 1000:7.3f} ms/geçiş")
+    print(f"   TrackerStore    : {store_memory / 1024:8.0f} KB, {store_pass * 1000:7.3f} ms/geçiş")
+
+if __name__ == "__main__":
+    _benchmark()
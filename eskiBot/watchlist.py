@@ -0,0 +1,155 @@
+"""
+Özel takip listesi - special_watchlist tablosunun bellek içi indeksi
+
+Her ticker snapshot'ında listedeki pariteler base_price'a göre değerlendirilir; ek REST isteği
+yapılmaz. Fiyat ve yüzde değişiklikleri toplu olarak tabloya geri yazılır.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+from config import Config
+from database import get_db_session, SpecialWatchlist
+
+@dataclass(slots=True)
+class WatchEntry:
+    """Takip listesindeki bir parite"""
+    id: int
+    symbol: str
+    currency_pair: str
+    base_price: Optional[float]  # İlk görülen fiyat, NULL ise bir sonraki ticker'da atanır
+    last_price: Optional[float]
+    last_percentage: float  # Son sinyaldeki base_price'a göre değişim
+
+class WatchlistEngine:
+    def __init__(self):
+        self.entries: Dict[str, WatchEntry] = {}  # currency_pair -> kayıt
+        self._dirty: Set[str] = set()  # Tabloya yazılmayı bekleyen pariteler
+        self._new_bases: Set[str] = set()  # base_price'ı motor tarafından atanan pariteler
+        self._last_sync = None  # Monotonic saniye
+        self._last_flush = None  # Monotonic saniye
+
+    def sync(self, now: float) -> List[str]:
+        """Tablo değişikliklerini indekse alır; yeni eklenen pariteleri döndürür"""
+        if self._last_sync is not None and now - self._last_sync < Config.SPECIAL_SYNC_INTERVAL:
+            return []
+        self._last_sync = now
+
+        # Bekleyen yazmalar önce gitmeli, yoksa eski değerler tablodan geri okunur
+        self.flush(now, force=True)
+
+        db = get_db_session()
+        try:
+            rows = db.query(SpecialWatchlist.id, SpecialWatchlist.symbol, SpecialWatchlist.currency_pair,
+                            SpecialWatchlist.base_price, SpecialWatchlist.last_price,
+                            SpecialWatchlist.last_percentage).all()
+        except Exception as e:
+            print(f"❌ Özel takip listesi okuma hatası: {e}")
+            return []
+        finally:
+            db.close()
+
+        entries = {}
+        added = []
+        for row in rows:
+            entry = self.entries.get(row.currency_pair)
+            if entry is None or entry.id != row.id:
+                added.append(row.currency_pair)
+                entry = WatchEntry(row.id, row.symbol, row.currency_pair, row.base_price, row.last_price,
+                                   row.last_percentage or 0)
+            elif entry.base_price != row.base_price:
+                # Baz fiyat panelden sıfırlandı veya değiştirildi
+                entry.base_price = row.base_price
+                entry.last_percentage = row.last_percentage or 0
+            entries[row.currency_pair] = entry
+
+        self.entries = entries
+        if added:
+            print(f"⭐ Özel takip listesi: {len(entries)} parite ({len(added)} yeni)")
+        return added
+
+    def evaluate(self, tickers: List[Dict]) -> List[Dict]:
+        """Listedeki pariteler için son sinyalden beri eşiği aşan hareketleri döndürür"""
+        if not self.entries:
+            return []
+
+        entries = self.entries
+        step = Config.SPECIAL_STEP_PERCENTAGE
+        candidates = []
+
+        for ticker in tickers:
+            entry = entries.get(ticker['currency_pair'])
+            if entry is None:
+                continue
+            try:
+                price = float(ticker.get('last') or 0)
+            except ValueError:
+                continue
+            if price <= 0 or (price == entry.last_price and entry.base_price):
+                continue
+
+            entry.last_price = price
+            self._dirty.add(entry.currency_pair)
+
+            if not entry.base_price:
+                entry.base_price = price
+                entry.last_percentage = 0
+                self._new_bases.add(entry.currency_pair)
+                continue
+
+            percentage = (price / entry.base_price - 1) * 100
+            move = percentage - entry.last_percentage
+            if abs(move) < step:
+                continue
+
+            candidates.append({
+                'symbol': entry.symbol,
+                'currency_pair': entry.currency_pair,
+                'price': price,
+                'percentage': percentage,
+                'volume_24h': float(ticker.get('quote_volume') or 0),
+                'change_24h': float(ticker.get('change_percentage') or 0),
+                'signal_type': 'special_up' if move > 0 else 'special_down',
+                'base_price': entry.base_price,
+                'previous_percentage': entry.last_percentage
+            })
+
+        return candidates
+
+    def mark_signaled(self, currency_pair: str, percentage: float):
+        """Gönderilen sinyalin yüzdesini bir sonraki eşik için referans alır"""
+        entry = self.entries.get(currency_pair)
+        if entry is None:
+            return
+        entry.last_percentage = percentage
+        self._dirty.add(currency_pair)
+
+    def flush(self, now: float, force: bool = False):
+        """Değişen kayıtları tek toplu UPDATE ile tabloya yazar"""
+        if not self._dirty:
+            return
+        if not force and self._last_flush is not None and now - self._last_flush < Config.SPECIAL_FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+
+        updates = []
+        for currency_pair in self._dirty:
+            entry = self.entries.get(currency_pair)
+            if entry is None:
+                continue
+            update = {'id': entry.id, 'last_price': entry.last_price, 'last_percentage': entry.last_percentage}
+            # Panelden yapılan baz fiyat değişikliğinin üzerine yazmamak için sadece atanan bazlar yazılır
+            if currency_pair in self._new_bases:
+                update['base_price'] = entry.base_price
+            updates.append(update)
+
+        db = get_db_session()
+        try:
+            db.bulk_update_mappings(SpecialWatchlist, updates)
+            db.commit()
+            self._dirty.clear()
+            self._new_bases.clear()
+        except Exception as e:
+            db.rollback()
+            print(f"❌ Özel takip listesi yazma hatası: {e}")
+        finally:
+            db.close()
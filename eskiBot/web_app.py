@@ -2,40 +2,63 @@
 Flask Web Uygulaması - Signal Bot Dashboard
 """
 
-from flask import Flask, render_template, jsonify, request, session, redirect, url_for
-from flask_socketio import SocketIO, emit
+from config import Config
+
+# eventlet modunda bot thread'inin requests ve time.sleep çağrıları da yeşillendirilir - diğer importlardan önce.
+# Sadece doğrudan çalıştırılınca; spawn edilen bot süreci bu dosyayı __mp_main__ olarak import eder ve düz thread'lerle kalır
+if __name__ == '__main__' and Config.WEB_ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
+from flask import Flask, Response, render_template, jsonify, request, session, redirect, url_for
+from flask_socketio import SocketIO, emit, join_room
 import threading
 import time
 import os
 import json
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timedelta, timezone
 from signal_manager import SignalManager
 from gateio_api import GateioAPI
-from config import Config
-from database import get_db_session, init_database, Signal, TrackedCoin, BotSetting, User
+from database import get_db_session, init_database, Signal, TrackedCoin, BotSetting, User, SpecialWatchlist, AlertRule
+from alerts import FIELDS as ALERT_FIELDS, OPERATORS as ALERT_OPERATORS
+from settings_service import RUNTIME_SETTINGS, VERSION_KEY, parse_runtime_value, bump_version
+from signal_rules import ENTRY_SETTING, LADDER_SETTING, RuleSyntaxError, compile_condition, compile_ladder
+from web_snapshot import EMPTY_SNAPSHOT
+from signal_export import build_query as build_export_query, iter_csv, iter_parquet, parquet_available
+from signal_stats import DIMENSIONS as STAT_DIMENSIONS, GRANULARITIES as STAT_GRANULARITIES, load_buckets
+from bot_process import BotProcess
+from emit_bridge import EmitBridge
 import hashlib
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'signal-bot-secret-key-2024')
-socketio = SocketIO(app, cors_allowed_origins="*")
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=Config.WEB_ASYNC_MODE)
+emit_bridge = EmitBridge(socketio)  # Bot thread'lerinden gelen emit'ler sunucunun kendi görevinden gönderilir
 
 # Initialize database
 init_database()
 
 # Global değişkenler
 signal_manager = None
+bot_process = None  # process modunda ayrı bot sürecinin istemcisi
 web_data = {
     'signals': [],
-    'tracked_coins': [],
-    'bot_status': 'stopped',
-    'last_update': None,
-    'stats': {
-        'total_signals': 0,
-        'active_tracking': 0,
-        'last_signal_time': 'Yok'
-    }
+    'bot_status': 'stopped'
 }
 
+def current_snapshot():
+    """Botun son yayınladığı değişmez görüntü - kilit gerekmez"""
+    if bot_process is not None:
+        return bot_process.snapshot()
+    manager = signal_manager
+    return manager.web_snapshot if manager is not None else EMPTY_SNAPSHOT
+
+def applied_settings_version():
+    """Botun uyguladığı ayar sürümü - ayrı süreç modunda botun yayınladığı görüntüden"""
+    if signal_manager is not None:
+        return Config.RUNTIME.version
+    return current_snapshot().settings_version
+
 def create_signal_manager():
     """Signal manager oluşturur"""
     global signal_manager
@@ -44,8 +67,27 @@ def create_signal_manager():
         signal_manager = SignalManager(gateio_api)
         # Web callback'i ayarla
         signal_manager.set_web_callback(web_signal_callback)
+        signal_manager.set_alert_callback(web_alert_callback)
     return signal_manager
 
+def launch_bot_process():
+    """Botu ayrı süreçte başlatır - olayları bu süreçteki web callback'lerine aktarılır"""
+    global bot_process
+    if bot_process is None:
+        bot_process = BotProcess(handle_bot_event)
+        bot_process.launch()
+    return bot_process
+
+def handle_bot_event(name, args):
+    """Bot sürecinden gelen olay - dinleyici thread'inde"""
+    if name == 'signal':
+        web_signal_callback(*args)
+    elif name == 'alert':
+        web_alert_callback(*args)
+    elif name == 'status':
+        web_data['bot_status'] = args[0]
+        emit_bridge.emit('status', {'status': args[0]})
+
 def web_signal_callback(signal_data):
     """Web arayüzüne sinyal bildirimi"""
     try:
@@ -76,23 +118,17 @@ def web_signal_callback(signal_data):
             web_data['signals'] = web_data['signals'][:100]
         
         # Web socket ile real-time bildirim
-        socketio.emit('new_signal', signal_data)
-        
-        # İstatistikleri güncelle
-        update_web_stats()
+        emit_bridge.emit('new_signal', signal_data)
         
     except Exception as e:
         print(f"Web callback hatası: {e}")
 
-def update_web_stats():
-    """Web istatistiklerini güncelle"""
+def web_alert_callback(username, alerts):
+    """Kullanıcı alarmlarını sadece o kullanıcının socket odasına gönderir"""
     try:
-        if signal_manager:
-            web_data['stats'] = signal_manager.get_web_stats()
-            web_data['tracked_coins'] = list(signal_manager.tracked_coins.values())
-            web_data['last_update'] = datetime.now(timezone(timedelta(hours=3))).strftime('%H:%M:%S')
+        emit_bridge.emit('alert', {'alerts': alerts}, to=f"user:{username}")
     except Exception as e:
-        print(f"Stats güncelleme hatası: {e}")
+        print(f"Alarm callback hatası: {e}")
 
 @app.route('/')
 def index():
@@ -136,8 +172,12 @@ def api_signals():
     
     db = get_db_session()
     try:
-        # Son 100 sinyali çek
-        signals = db.query(Signal).order_by(Signal.created_at.desc()).limit(100).all()
+        # Son 100 sinyali çek - ?type=pusu gibi sinyal türüne göre filtrelenebilir
+        query = db.query(Signal)
+        signal_type = request.args.get('type')
+        if signal_type:
+            query = query.filter(Signal.signal_type == signal_type)
+        signals = query.order_by(Signal.created_at.desc()).limit(100).all()
         
         signals_data = []
         for signal in signals:
@@ -157,24 +197,260 @@ def api_signals():
                 'timestamp': signal.created_at.isoformat()
             })
         
+        snapshot = current_snapshot()
         return jsonify({
             'signals': signals_data,
-            'stats': web_data['stats'],
-            'last_update': web_data['last_update']
+            'stats': snapshot.stats,
+            'last_update': snapshot.last_update
         })
     finally:
         db.close()
 
+def _parse_export_time(value, end: bool = False):
+    """ISO tarih/zaman (UTC) - sadece tarih verilen bitiş o günü de kapsar"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        # created_at naive UTC - ofsetli zaman karşılaştırmadan önce çevrilir
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+@app.route('/api/signals/export')
+def api_signals_export():
+    """Sinyal geçmişi dışa aktarma - ?format=csv|parquet&start=2024-01-01&end=2024-01-31&symbol=BTC&type=new"""
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    export_format = request.args.get('format', 'csv')
+    if export_format not in ('csv', 'parquet'):
+        return jsonify({'error': 'format csv veya parquet olmalı'}), 400
+    if export_format == 'parquet' and not parquet_available():
+        return jsonify({'error': 'Parquet export için sunucuya pyarrow kurulmalı'}), 501
+    try:
+        start = _parse_export_time(request.args.get('start'))
+        end = _parse_export_time(request.args.get('end'), end=True)
+    except ValueError:
+        return jsonify({'error': 'start ve end ISO tarih olmalı (YYYY-MM-DD)'}), 400
+    symbol = request.args.get('symbol')
+    signal_type = request.args.get('type')
+    
+    def generate():
+        # Oturum yanıt akışı bitene kadar açık kalır
+        db = get_db_session()
+        try:
+            query = build_export_query(db, start, end, symbol, signal_type)
+            yield from (iter_csv(query) if export_format == 'csv' else iter_parquet(query))
+        finally:
+            db.close()
+    
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/vnd.apache.parquet'
+    filename = f"signals_{datetime.utcnow():%Y%m%d_%H%M%S}.{export_format}"
+    return Response(generate(), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}'})
+
+# Varsayılan pencere (saat) - kova türüne göre
+STATS_DEFAULT_WINDOW = {'minute': 1, 'hour': 24, 'day': 24 * 30}
+
+@app.route('/api/stats')
+def api_stats():
+    """Sinyal istatistikleri API - ?granularity=hour&dimension=type&hours=24&top=10"""
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    granularity = request.args.get('granularity', 'hour')
+    dimension = request.args.get('dimension', 'type')
+    if granularity not in STAT_GRANULARITIES or dimension not in STAT_DIMENSIONS:
+        return jsonify({'error': f"granularity {list(STAT_GRANULARITIES)}, dimension {list(STAT_DIMENSIONS)} olmalı"}), 400
+    try:
+        hours = float(request.args.get('hours', STATS_DEFAULT_WINDOW[granularity]))
+        top = int(request.args.get('top', 10))
+    except ValueError:
+        return jsonify({'error': 'hours ve top sayı olmalı'}), 400
+    
+    db = get_db_session()
+    try:
+        # Özet tablodan okunur - signals tablosu taranmaz
+        since = datetime.utcnow() - timedelta(hours=hours)
+        result = load_buckets(db, granularity, dimension, since, top=top if dimension == 'symbol' else None)
+        result['counters'] = current_snapshot().stats
+        return jsonify(result)
+    finally:
+        db.close()
+
 @app.route('/api/tracked')
 def api_tracked():
     """Takip edilen coinler API"""
     if 'username' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
     
-    return jsonify({
-        'tracked_coins': web_data['tracked_coins'],
-        'stats': web_data['stats']
-    })
+    # Gövde bot thread'inde serileştirildi
+    return Response(current_snapshot().tracked_json, mimetype='application/json')
+
+@app.route('/api/special', methods=['GET', 'POST'])
+def api_special():
+    """Özel takip listesi API - listeleme ve coin ekleme"""
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    db = get_db_session()
+    try:
+        if request.method == 'POST':
+            symbol = (request.get_json(silent=True) or {}).get('symbol', '').strip().upper()
+            if not symbol:
+                return jsonify({'error': 'Sembol gerekli'}), 400
+            if db.query(SpecialWatchlist).filter(SpecialWatchlist.symbol == symbol).first():
+                return jsonify({'error': 'Zaten listede'}), 409
+            
+            # base_price bot tarafından bir sonraki taramada atanır
+            db.add(SpecialWatchlist(symbol=symbol, currency_pair=f"{symbol}_USDT"))
+            db.commit()
+            return jsonify({'status': 'added', 'symbol': symbol})
+        
+        items = db.query(SpecialWatchlist).order_by(SpecialWatchlist.symbol).all()
+        return jsonify({
+            'watchlist': [{
+                'symbol': item.symbol,
+                'currency_pair': item.currency_pair,
+                'base_price': item.base_price,
+                'last_price': item.last_price,
+                'last_percentage': item.last_percentage,
+                'updated_at': item.updated_at.isoformat() if item.updated_at else None
+            } for item in items]
+        })
+    finally:
+        db.close()
+
+@app.route('/api/special/<symbol>', methods=['DELETE'])
+def api_special_delete(symbol):
+    """Özel takip listesinden coin çıkarır"""
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    db = get_db_session()
+    try:
+        deleted = db.query(SpecialWatchlist).filter(SpecialWatchlist.symbol == symbol.upper()).delete()
+        db.commit()
+        return jsonify({'status': 'deleted' if deleted else 'not_found'})
+    finally:
+        db.close()
+
+@app.route('/api/alerts', methods=['GET', 'POST'])
+def api_alerts():
+    """Kullanıcının alarm kuralları - listeleme ve ekleme"""
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    db = get_db_session()
+    try:
+        user = db.query(User).filter(User.username == session['username']).first()
+        if user is None:
+            return jsonify({'error': 'Unauthorized'}), 401
+        
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            field = data.get('field')
+            operator = data.get('operator')
+            if field not in ALERT_FIELDS or operator not in ALERT_OPERATORS:
+                return jsonify({'error': f"Alan {ALERT_FIELDS}, yön {ALERT_OPERATORS} olmalı"}), 400
+            try:
+                threshold = float(data.get('threshold'))
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Eşik sayı olmalı'}), 400
+            
+            symbol = (data.get('symbol') or '').strip().upper() or None
+            rule = AlertRule(user_id=user.id, symbol=symbol, field=field, operator=operator, threshold=threshold,
+                             channel=(str(data.get('channel') or '').strip() or None))
+            db.add(rule)
+            db.commit()
+            return jsonify({'status': 'added', 'id': rule.id})
+        
+        rules = db.query(AlertRule).filter(AlertRule.user_id == user.id).order_by(AlertRule.id).all()
+        return jsonify({
+            'rules': [{
+                'id': rule.id,
+                'symbol': rule.symbol,
+                'field': rule.field,
+                'operator': rule.operator,
+                'threshold': rule.threshold,
+                'channel': rule.channel,
+                'is_active': rule.is_active
+            } for rule in rules]
+        })
+    finally:
+        db.close()
+
+@app.route('/api/alerts/<int:rule_id>', methods=['DELETE'])
+def api_alerts_delete(rule_id):
+    """Kullanıcının alarm kuralını siler"""
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    db = get_db_session()
+    try:
+        user = db.query(User).filter(User.username == session['username']).first()
+        deleted = 0
+        if user is not None:
+            deleted = db.query(AlertRule).filter(AlertRule.id == rule_id, AlertRule.user_id == user.id).delete()
+            db.commit()
+        return jsonify({'status': 'deleted' if deleted else 'not_found'})
+    finally:
+        db.close()
+
+@app.route('/api/settings', methods=['GET', 'POST'])
+def api_settings():
+    """Bot ayarları - POST değerleri doğrular, kaydeder ve sürümü artırır (bot bir sonraki yoklamada uygular)"""
+    if 'username' not in session:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    db = get_db_session()
+    try:
+        if request.method == 'POST':
+            values = (request.get_json(silent=True) or {}).get('settings') or {}
+            errors = {}
+            for key, value in values.items():
+                value = str(value).strip()
+                try:
+                    if key in RUNTIME_SETTINGS:
+                        parse_runtime_value(key, value)
+                    elif key == ENTRY_SETTING and value:
+                        compile_condition(value)
+                    elif key == LADDER_SETTING and value:
+                        compile_ladder(value)
+                    elif key == VERSION_KEY or 'token' in key:
+                        raise ValueError('Panelden değiştirilemez')
+                except (ValueError, RuleSyntaxError) as e:
+                    errors[key] = str(e)
+            if errors:
+                return jsonify({'error': 'Geçersiz ayar', 'fields': errors}), 400
+            
+            for key, value in values.items():
+                setting = db.query(BotSetting).filter(BotSetting.setting_key == key).first()
+                if setting is None:
+                    setting = BotSetting(setting_key=key)
+                    db.add(setting)
+                setting.setting_value = str(value).strip()
+                setting.updated_at = datetime.utcnow()
+            version = bump_version(db)
+            db.commit()
+            return jsonify({'status': 'saved', 'version': version})
+        
+        settings = db.query(BotSetting).order_by(BotSetting.setting_key).all()
+        version = next((int(setting.setting_value) for setting in settings if setting.setting_key == VERSION_KEY), 0)
+        return jsonify({
+            'version': version,
+            'applied_version': applied_settings_version(),
+            'settings': [{
+                'key': setting.setting_key,
+                'value': setting.setting_value,
+                'description': setting.description,
+                'runtime': setting.setting_key in RUNTIME_SETTINGS or setting.setting_key in (ENTRY_SETTING, LADDER_SETTING)
+            } for setting in settings if setting.setting_key != VERSION_KEY and 'token' not in setting.setting_key]
+        })
+    finally:
+        db.close()
 
 @app.route('/api/bot/start', methods=['POST'])
 def api_bot_start():
@@ -186,6 +462,16 @@ def api_bot_start():
         if web_data['bot_status'] == 'running':
             return jsonify({'status': 'already_running'})
         
+        # Durdurulan döngü turunu bitirmeden yenisi başlatılmaz
+        if bot_process is None and signal_manager is not None and signal_manager.is_running:
+            return jsonify({'status': 'stopping', 'error': 'Bot durduruluyor, birazdan tekrar deneyin'}), 409
+        
+        # Ayrı süreç modunda durum, süreç 'status' olayı gönderince değişir
+        if bot_process is not None:
+            if not bot_process.command('start'):
+                return jsonify({'error': 'Bot süreci çalışmıyor'}), 503
+            return jsonify({'status': 'starting'})
+        
         # Bot'u ayrı thread'de başlat
         def start_bot():
             global signal_manager
@@ -208,8 +494,14 @@ def api_bot_stop():
         return jsonify({'error': 'Unauthorized'}), 401
     
     try:
+        if bot_process is not None:
+            if not bot_process.command('stop'):
+                return jsonify({'error': 'Bot süreci çalışmıyor'}), 503
+            return jsonify({'status': 'stopping'})
+        
         web_data['bot_status'] = 'stopped'
-        # Bot'u durdurma mantığı burada olacak
+        if signal_manager is not None:
+            signal_manager.stop()
         return jsonify({'status': 'stopped'})
         
     except Exception as e:
@@ -221,10 +513,12 @@ def api_bot_status():
     if 'username' not in session:
         return jsonify({'error': 'Unauthorized'}), 401
     
+    snapshot = current_snapshot()
     return jsonify({
         'status': web_data['bot_status'],
-        'stats': web_data['stats'],
-        'last_update': web_data['last_update']
+        'stats': snapshot.stats,
+        'last_update': snapshot.last_update,
+        'emit': emit_bridge.stats()
     })
 
 @app.route('/signals')
@@ -266,6 +560,9 @@ def settings_page():
 def handle_connect():
     """WebSocket bağlantısı"""
     print('Client connected')
+    # Kullanıcı alarmları sadece kendi odasına gönderilir
+    if 'username' in session:
+        join_room(f"user:{session['username']}")
     emit('status', {'status': web_data['bot_status']})
 
 @socketio.on('disconnect')
@@ -277,7 +574,12 @@ def start_web_server():
     """Web sunucusunu başlatır"""
     print("🌐 Web sunucusu başlatılıyor...")
     print("📱 Dashboard: http://localhost:5000")
-    socketio.run(app, host='0.0.0.0', port=5000, debug=False)
+    if Config.BOT_PROCESS_MODE == 'process':
+        launch_bot_process()
+    emit_bridge.start()
+    # threading modunda Werkzeug sunucusu kullanılır
+    socketio.run(app, host='0.0.0.0', port=5000, debug=False,
+                 allow_unsafe_werkzeug=Config.WEB_ASYNC_MODE == 'threading')
 
 if __name__ == '__main__':
     start_web_server()
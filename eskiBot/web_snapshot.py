@@ -0,0 +1,139 @@
+"""
+Web anlık görüntüsü - Takip durumunun web katmanına kilitsiz yayınlanması
+
+Bot her tur sonunda takip listesini ve istatistikleri değişmez bir görüntüye kopyalar, JSON'a bir kez çevirir
+ve tek referans atamasıyla yayınlar. Flask thread'leri sadece o anki referansı okur: kilit yok, istek yolunda
+serileştirme yok. Değişmeyen coin satırlarının baytları bir önceki görüntüden aynen alınır (copy-on-write).
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from tracker_store import CoinTracker
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+@dataclass(frozen=True, slots=True)
+class WebSnapshot:
+    """Yayınlandıktan sonra değişmez - okuyucular alanlarını değiştirmemeli"""
+    version: int
+    last_update: str  # Türkiye saati, yayın zamanı
+    stats: Dict
+    tracked_count: int
+    tracked_json: bytes  # /api/tracked yanıt gövdesi
+    settings_version: Optional[int] = None  # Botun uyguladığı son ayar sürümü
+
+_EMPTY_STATS = {'total_signals': 0, 'active_tracking': 0, 'last_signal_time': 'Yok'}
+EMPTY_SNAPSHOT = WebSnapshot(
+    version=0,
+    last_update=None,
+    stats=_EMPTY_STATS,
+    tracked_count=0,
+    tracked_json=_dumps({'tracked_coins': [], 'stats': _EMPTY_STATS, 'last_update': None}),
+)
+
+class SnapshotPublisher:
+    def __init__(self, to_datetime: Callable[[float], datetime]):
+        self.to_datetime = to_datetime  # Monotonic saniye -> Türkiye saati
+        self._rows: Dict[str, Tuple[Tuple, bytes]] = {}  # sembol -> (satır anahtarı, JSON baytları)
+        self._version = 0
+
+        # Sayaçlar
+        self.rows_serialized = 0
+        self.rows_reused = 0
+
+    @staticmethod
+    def _row_key(tracker: CoinTracker) -> Tuple:
+        """Satırı etkileyen alanlar - biri değişmedikçe önceki baytlar kullanılır"""
+        return (tracker.currency_pair, tracker.base_price, tracker.current_price, tracker.initial_percentage,
+                tracker.current_percentage, tracker.signal_count, tracker.is_following, tracker.volume_24h,
+                tracker.last_signal_at, tracker.last_scan_at)
+
+    def _row(self, tracker: CoinTracker) -> Dict:
+        return {
+            'symbol': tracker.symbol,
+            'currency_pair': tracker.currency_pair,
+            'base_price': tracker.base_price,
+            'current_price': tracker.current_price,
+            'initial_percentage': tracker.initial_percentage,
+            'current_percentage': tracker.current_percentage,
+            'signal_count': tracker.signal_count,
+            'is_following': tracker.is_following,
+            'volume_24h': tracker.volume_24h,
+            'last_signal_time': self.to_datetime(tracker.last_signal_at).strftime('%H:%M:%S'),
+            'last_scan_time': self.to_datetime(tracker.last_scan_at).strftime('%H:%M:%S'),
+        }
+
+    def publish(self, trackers: Iterable[CoinTracker], stats: Dict, now: datetime,
+                settings_version: Optional[int] = None) -> WebSnapshot:
+        """Bot thread'inde çağrılır; yeni görüntüyü döndürür, eskisine dokunmaz"""
+        previous = self._rows
+        rows = {}
+        ordered = sorted(trackers, key=lambda tracker: tracker.last_signal_at, reverse=True)
+        for tracker in ordered:
+            key = self._row_key(tracker)
+            cached = previous.get(tracker.symbol)
+            if cached is not None and cached[0] == key:
+                rows[tracker.symbol] = cached
+                self.rows_reused += 1
+            else:
+                rows[tracker.symbol] = (key, _dumps(self._row(tracker)))
+                self.rows_serialized += 1
+        self._rows = rows  # Takipten çıkanlar böylece düşer
+
+        stats = dict(stats)
+        last_update = now.strftime('%H:%M:%S')
+        self._version += 1
+        body = b''.join((
+            b'{"tracked_coins":[', b','.join(entry[1] for entry in rows.values()),
+            b'],"stats":', _dumps(stats),
+            b',"last_update":', _dumps(last_update), b'}',
+        ))
+        return WebSnapshot(
+            version=self._version,
+            last_update=last_update,
+            stats=stats,
+            tracked_count=len(rows),
+            tracked_json=body,
+            settings_version=settings_version,
+        )
+
+def _benchmark(sizes=(10, 100, 1000), rounds: int = 200):
+    """Her istekte jsonify vs yayınlanmış baytlar; tur başına yayın maliyeti"""
+    import time
+    from datetime import timezone
+
+    publisher = SnapshotPublisher(lambda value: datetime.fromtimestamp(value, tz=timezone.utc))
+    print(f"{'coin':>6} {'istekte serileştirme (µs)':>26} {'yayın (µs)':>11} {'okuma (µs)':>11}")
+    for size in sizes:
+        trackers = [CoinTracker(symbol=f"C{i}", currency_pair=f"C{i}_USDT", base_price=1.0, current_price=1.1,
+                                initial_percentage=20.0, current_percentage=25.0, previous_signal_percentage=20.0,
+                                signal_count=1, last_signal_at=1_700_000_000.0 + i,
+                                last_scan_at=1_700_000_000.0 + i, is_following=False, volume_24h=5e5)
+                    for i in range(size)]
+        stats = {'total_signals': size, 'active_tracking': 0, 'last_signal_time': '12:00:00'}
+        now = datetime.now(tz=timezone.utc)
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            _dumps({'tracked_coins': [publisher._row(tracker) for tracker in trackers], 'stats': stats})
+        per_request = (time.perf_counter() - started) / rounds * 1e6
+
+        started = time.perf_counter()
+        for round_index in range(rounds):
+            trackers[round_index % size].current_price += 0.001  # Her turda tek coin değişir
+            snapshot = publisher.publish(trackers, stats, now)
+        per_publish = (time.perf_counter() - started) / rounds * 1e6
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            body = snapshot.tracked_json
+        per_read = (time.perf_counter() - started) / rounds * 1e6
+
+        print(f"{size:>6} {per_request:>26.1f} {per_publish:>11.1f} {per_read:>11.3f}")
+    print(f"   satır: {publisher.rows_serialized} serileştirildi, {publisher.rows_reused} yeniden kullanıldı")
+
+if __name__ == "__main__":
+    _benchmark()